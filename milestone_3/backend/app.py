@@ -1,7 +1,7 @@
 """
 Main Flask application with modular architecture
 """
-from flask import Flask, jsonify, request
+from flask import Flask, g, jsonify, request
 from flask_cors import CORS
 import os
 import sys
@@ -22,6 +22,7 @@ from routes.file_routes import file_bp
 # Import services for application context
 from services.auth_service import AuthService
 from services.analysis_service import AnalysisService
+from services.skill_service import taxonomy_registry
 
 def create_app(config_name=None):
     """Application factory pattern"""
@@ -162,6 +163,17 @@ def create_app(config_name=None):
         # Log request info in debug mode
         if app.debug:
             app.logger.debug(f"Request {request.request_id}: {request.method} {request.path}")
+        
+        # Finish the request on the taxonomy version it started with, even if a reload swaps in another
+        if taxonomy_registry is not None:
+            g.taxonomy_token = taxonomy_registry.pin()
+    
+    @app.teardown_request
+    def release_taxonomy(error=None):
+        """Drop the request's taxonomy pin"""
+        token = g.pop('taxonomy_token', None)
+        if token is not None:
+            taxonomy_registry.release(token)
     
     # After request handlers
     @app.after_request
@@ -31,8 +31,56 @@ class Config:
     # Pagination settings
     ANALYSES_PER_PAGE = 20
     
+    # Files the application writes at runtime (reload marker, discovery checkpoint), kept out of the source tree
+    INSTANCE_DIR = os.environ.get('INSTANCE_DIR') or \
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance')
+    
     # Custom AI settings
     CUSTOM_AI_MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'custom_ai.py')
+    
+    # Extraction result cache (SQLite tier is disabled unless a path is given)
+    EXTRACTION_CACHE_SIZE = int(os.environ.get('EXTRACTION_CACHE_SIZE', 512))
+    EXTRACTION_CACHE_PATH = os.environ.get('EXTRACTION_CACHE_PATH')
+    
+    # Precompiled taxonomy from build_taxonomy.py (compiled at startup when unset or stale)
+    TAXONOMY_ARTIFACT_PATH = os.environ.get('TAXONOMY_ARTIFACT_PATH')
+    
+    # Memory-mapped skill table compiled from an external JSON/CSV taxonomy (built-in taxonomy when unset)
+    TAXONOMY_TABLE_PATH = os.environ.get('TAXONOMY_TABLE_PATH')
+    
+    # Re-read by every taxonomy reload: an external JSON/CSV taxonomy (compiled to a skill table beside it)
+    # and a JSON file of service category keyword lists replacing SkillService.SKILL_CATEGORIES
+    TAXONOMY_SOURCE_PATH = os.environ.get('TAXONOMY_SOURCE_PATH')
+    SKILL_CATEGORIES_PATH = os.environ.get('SKILL_CATEGORIES_PATH')
+    # Skill relationship graph (JSON or CSV edges) for weak matches, also re-read by every reload
+    SKILL_GRAPH_PATH = os.environ.get('SKILL_GRAPH_PATH')
+    # File through which a reload in one worker reaches the others; each worker checks it on a request
+    # at most every TAXONOMY_POLL_SECONDS (set TAXONOMY_RELOAD_MARKER empty to keep reloads per process)
+    TAXONOMY_RELOAD_MARKER = os.environ.get('TAXONOMY_RELOAD_MARKER', os.path.join(INSTANCE_DIR, 'taxonomy_reload.json'))
+    TAXONOMY_POLL_SECONDS = float(os.environ.get('TAXONOMY_POLL_SECONDS', 2))
+    
+    # Comma-separated emails of users allowed on admin endpoints
+    ADMIN_EMAILS = {email.strip().lower() for email in os.environ.get('ADMIN_EMAILS', '').split(',') if email.strip()}
+    
+    # Resume revision families (per user) whose last analyzed text is kept for incremental re-extraction
+    INCREMENTAL_SESSIONS = int(os.environ.get('INCREMENTAL_SESSIONS', 256))
+    
+    # Print per-stage timings and counters of every custom AI extraction
+    EXTRACTION_PROFILE_LOG = os.environ.get('EXTRACTION_PROFILE_LOG', 'False').lower() == 'true'
+    
+    # MinHash/LSH near-duplicate detection of uploads; at or above the threshold an earlier result is reused
+    MINHASH_PERMUTATIONS = int(os.environ.get('MINHASH_PERMUTATIONS', 128))
+    LSH_BANDS = int(os.environ.get('LSH_BANDS', 16))
+    NEAR_DUPLICATE_THRESHOLD = float(os.environ.get('NEAR_DUPLICATE_THRESHOLD', 0.9))
+    
+    # Background discovery of terms missing from the skill taxonomy, resumable from its checkpoint
+    SKILL_DISCOVERY_CHECKPOINT = os.environ.get('SKILL_DISCOVERY_CHECKPOINT') or \
+        os.path.join(INSTANCE_DIR, 'skill_discovery.json')
+    SKILL_DISCOVERY_BATCH_SIZE = int(os.environ.get('SKILL_DISCOVERY_BATCH_SIZE', 200))
+    SKILL_DISCOVERY_CAPACITY = int(os.environ.get('SKILL_DISCOVERY_CAPACITY', 500))
+    # Candidates must occur in at least this many documents, so terms from a single resume (names,
+    # addresses) are never listed; requests may raise it but not lower it
+    SKILL_DISCOVERY_MIN_DOCUMENTS = int(os.environ.get('SKILL_DISCOVERY_MIN_DOCUMENTS', 2))
 
 class DevelopmentConfig(Config):
     """Development configuration"""
@@ -2,6 +2,7 @@
 Database initialization and configuration
 """
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import inspect, text
 from flask_migrate import Migrate
 from flask_login import LoginManager
 
@@ -36,6 +37,7 @@ def create_tables(app):
         from models.analysis import AnalysisResult
         
         db.create_all()
+        add_missing_columns()
         print("Database tables created successfully!")
 
 def init_database():
@@ -45,4 +47,24 @@ def init_database():
     from models.analysis import AnalysisResult
     
     db.create_all()
-    print("Database initialized successfully!")
\ No newline at end of file
+    add_missing_columns()
+    print("Database initialized successfully!")
+
+def add_missing_columns():
+    """Add nullable model columns that an existing table predates
+    
+    create_all() only creates missing tables, so databases from earlier versions (such as the
+    shipped skill_matcher.db) would otherwise fail on queries touching newer columns.
+    """
+    inspector = inspect(db.engine)
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing or not column.nullable:
+                continue
+            column_type = column.type.compile(dialect=db.engine.dialect)
+            with db.engine.begin() as connection:
+                connection.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'))
+            print(f"Added column {table.name}.{column.name}")
\ No newline at end of file
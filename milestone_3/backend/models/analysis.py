@@ -30,6 +30,7 @@ class AnalysisResult(db.Model):
     resume_file_name = db.Column(db.String(255))
     job_file_name = db.Column(db.String(255))
     processing_time = db.Column(db.Float)  # Time taken to process in seconds
+    minhash_signature = db.Column(db.Text)  # JSON list, see services/near_duplicate.py
     
     def __init__(self, user_id, resume_content, job_description, match_score, 
                  detailed_analysis, strength_assessments=None, **kwargs):
@@ -45,6 +46,7 @@ class AnalysisResult(db.Model):
         self.resume_file_name = kwargs.get('resume_file_name')
         self.job_file_name = kwargs.get('job_file_name')
         self.processing_time = kwargs.get('processing_time')
+        self.minhash_signature = json.dumps(kwargs['minhash_signature']) if kwargs.get('minhash_signature') else None
     
     def get_detailed_analysis(self):
         """Get detailed analysis as dictionary"""
@@ -60,6 +62,13 @@ class AnalysisResult(db.Model):
         except json.JSONDecodeError:
             return {}
     
+    def get_minhash_signature(self):
+        """Get MinHash signature of the resume text as a list"""
+        try:
+            return json.loads(self.minhash_signature) if self.minhash_signature else None
+        except json.JSONDecodeError:
+            return None
+    
     def get_preview_data(self):
         """Get preview data for listing views"""
         return {
@@ -4,6 +4,7 @@ User model and authentication functionality
 from datetime import datetime
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
+from config.config import Config
 from config.database import db
 
 class User(UserMixin, db.Model):
@@ -34,6 +35,11 @@ class User(UserMixin, db.Model):
         """Check if provided password matches hash"""
         return check_password_hash(self.password_hash, password)
     
+    @property
+    def is_admin(self):
+        """Whether the user may call admin endpoints (see Config.ADMIN_EMAILS)"""
+        return self.email in Config.ADMIN_EMAILS
+    
     def update_last_login(self):
         """Update last login timestamp"""
         self.last_login = datetime.utcnow()
@@ -1,12 +1,15 @@
 """
 Analysis routes for skill analysis and result management
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_login import login_required, current_user
 from datetime import datetime
 from services.analysis_service import AnalysisService
 from services.skill_service import SkillService
 from services.file_service import FileService
+from services.skill_discovery import skill_discovery
+from config.config import Config
+from utils.decorators import admin_required
 
 analysis_bp = Blueprint('analysis', __name__, url_prefix='/api/analysis')
 
@@ -23,6 +26,12 @@ def analyze_resume():
         job_description = request.form.get('job_description', '').strip()
         use_ollama = request.form.get('use_ollama', 'true').lower() == 'true'
         analysis_type = request.form.get('analysis_type', 'standard')  # standard, comprehensive
+        # Optional comma-separated resume sections to analyze, e.g. "skills,experience"
+        sections = [name.strip().lower() for name in request.form.get('sections', '').split(',') if name.strip()]
+        # Return per-stage timings and counters of the custom AI extraction
+        profile = request.form.get('profile', 'false').lower() == 'true'
+        # Return the text around each skill's first mention
+        include_context = request.form.get('include_context', 'false').lower() == 'true'
         
         # Process the uploaded file
         file_result = FileService.process_uploaded_file(file)
@@ -30,6 +39,11 @@ def analyze_resume():
         if not file_result['success']:
             return jsonify(file_result), 400
         
+        # Look for an earlier analysis of a near-identical resume by this user
+        near_duplicate = AnalysisService.find_near_duplicate(current_user.id, file_result['minhash_signature'])
+        if not near_duplicate['success']:
+            near_duplicate = {'analysis_id': None, 'similarity': 0.0, 'family': None, 'reusable': False}
+        
         # Choose analysis method
         if analysis_type == 'comprehensive' and use_ollama:
             # Use comprehensive Ollama analysis
@@ -77,12 +91,32 @@ def analyze_resume():
                 analysis_type = 'standard'
         
         if analysis_type == 'standard' or not use_ollama:
-            # Extract skills from the text
-            skill_result = SkillService.extract_skills_from_text(
-                file_result['text'], 
-                job_description if job_description else None,
-                use_ollama=use_ollama
-            )
+            skill_result = None
+            reused = False
+            # A near-duplicate answers the same request with the results already computed
+            if near_duplicate['reusable'] and not sections and not profile:
+                skill_result = AnalysisService.get_reusable_skill_result(
+                    near_duplicate['analysis_id'],
+                    current_user.id,
+                    job_description,
+                    use_ollama,
+                    include_context=include_context
+                )
+                reused = skill_result is not None
+            
+            if skill_result is None:
+                # Extract skills from the text; the session of the resume's revision family
+                # re-extracts only the lines that changed since its previous upload (a new
+                # resume has no family yet)
+                skill_result = SkillService.extract_skills_from_text(
+                    file_result['text'], 
+                    job_description if job_description else None,
+                    use_ollama=use_ollama,
+                    sections=sections or None,
+                    session_key=(current_user.id, near_duplicate['family']) if near_duplicate['family'] is not None else None,
+                    profile=profile,
+                    include_context=include_context
+                )
             
             if not skill_result['success']:
                 return jsonify(skill_result), 500
@@ -103,7 +137,8 @@ def analyze_resume():
                     'extraction_method': skill_result.get('analysis_method', 'custom_ai'),
                     'confidence_level': 'high',
                     'processing_time': 'real-time',
-                    'analysis_type': 'standard'
+                    'analysis_type': 'standard',
+                    'reused_analysis_id': near_duplicate['analysis_id'] if reused else None
                 }
             }
             
@@ -133,13 +168,29 @@ def analyze_resume():
             
             if 'quality_analysis' in skill_result:
                 response_data['quality_analysis'] = skill_result['quality_analysis']
+            
+            if 'skill_contexts' in skill_result:
+                response_data['skill_contexts'] = skill_result['skill_contexts']
+            
+            # Timings describe this request only, so they are returned but not stored
+            if 'profile' in skill_result:
+                response_data['profile'] = skill_result.pop('profile')
+        
+        if near_duplicate['analysis_id'] is not None:
+            response_data['near_duplicate'] = {
+                'analysis_id': near_duplicate['analysis_id'],
+                'similarity': near_duplicate['similarity'],
+                'reused': analysis_data['processing_metadata'].get('reused_analysis_id') is not None
+            }
         
         # Save analysis result
         save_result = AnalysisService.save_analysis_result(
             user_id=current_user.id,
             analysis_data=analysis_data,
             filename=file_result['filename'],
-            file_type=file_result['file_type']
+            file_type=file_result['file_type'],
+            signature=file_result['minhash_signature'],
+            family=near_duplicate['family']
         )
         
         if save_result['success']:
@@ -150,6 +201,81 @@ def analyze_resume():
     except Exception as e:
         return jsonify({'success': False, 'error': f'Analysis failed: {str(e)}'}), 500
 
+@analysis_bp.route('/import-structured', methods=['POST'])
+@login_required
+def import_structured_resume():
+    """Analyze a structured profile (JSON Resume or key-value skills/work data) without text extraction"""
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({'success': False, 'error': 'No data provided'}), 400
+        
+        if not isinstance(data, dict):
+            return jsonify({'success': False, 'error': 'Structured profile must be a JSON object'}), 400
+        
+        # Either the profile itself or {"resume": {...}, "job_description": "..."}
+        payload = data.get('resume', data)
+        job_description = data.get('job_description') or ''
+        if not isinstance(job_description, str):
+            return jsonify({'success': False, 'error': 'job_description must be a string'}), 400
+        job_description = job_description.strip()
+        include_context = bool(data.get('include_context', False))
+        
+        skill_result = SkillService.extract_skills_from_structured(
+            payload,
+            job_description if job_description else None,
+            include_context=include_context
+        )
+        
+        if not skill_result['success']:
+            return jsonify(skill_result), 400
+        
+        analysis_data = {
+            'structured_profile': payload,
+            'skills_analysis': skill_result,
+            'job_description': job_description,
+            'processing_metadata': {
+                'extraction_method': 'structured_import',
+                'confidence_level': 'high',
+                'processing_time': 'real-time',
+                'analysis_type': 'structured'
+            }
+        }
+        
+        response_data = {
+            'success': True,
+            'analysis_type': 'structured',
+            'skills': skill_result['skills'],
+            'declared_skills': skill_result['declared_skills'],
+            'categorized_skills': skill_result['categorized_skills'],
+            'insights': skill_result['insights'],
+            'experience': skill_result['experience'],
+            'total_skills': skill_result['total_skills'],
+            'message': 'Structured profile analyzed successfully'
+        }
+        
+        if 'job_matching' in skill_result:
+            response_data['job_matching'] = skill_result['job_matching']
+        
+        if 'skill_contexts' in skill_result:
+            response_data['skill_contexts'] = skill_result['skill_contexts']
+        
+        save_result = AnalysisService.save_analysis_result(
+            user_id=current_user.id,
+            analysis_data=analysis_data,
+            filename=payload.get('basics', {}).get('name') if isinstance(payload.get('basics'), dict) else None,
+            file_type='json'
+        )
+        
+        if save_result['success']:
+            response_data['analysis_id'] = save_result['analysis']['id']
+        
+        return jsonify(response_data), 201
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': f'Structured import failed: {str(e)}'}), 500
+
 @analysis_bp.route('/match-job', methods=['POST'])
 @login_required
 def match_job():
@@ -179,8 +305,8 @@ def match_job():
         
         # Extract skills from the analysis
         skills = []
-        if 'skills_analysis' in analysis['analysis_data']:
-            skills = analysis['analysis_data']['skills_analysis'].get('skills', [])
+        if 'skills_analysis' in analysis['detailed_analysis']:
+            skills = analysis['detailed_analysis']['skills_analysis'].get('skills', [])
         
         if not skills:
             return jsonify({'success': False, 'error': 'No skills found in analysis'}), 400
@@ -368,7 +494,7 @@ def reanalyze_with_job(analysis_id):
         analysis = analysis_result['analysis']
         
         # Extract original text and skills
-        analysis_data = analysis['analysis_data']
+        analysis_data = analysis['detailed_analysis']
         original_text = analysis_data.get('extracted_text', '')
         original_skills = []
         
@@ -394,8 +520,8 @@ def reanalyze_with_job(analysis_id):
         save_result = AnalysisService.save_analysis_result(
             user_id=current_user.id,
             analysis_data=updated_analysis_data,
-            filename=f"Reanalyzed - {analysis['filename']}",
-            file_type=analysis['file_type']
+            filename=f"Reanalyzed - {analysis['resume_file_name']}",
+            file_type=analysis_data.get('file_type')
         )
         
         if save_result['success']:
@@ -511,6 +637,73 @@ def get_ollama_status():
             'ollama_available': False
         }), 200
 
+@analysis_bp.route('/cache-stats', methods=['GET'])
+@admin_required
+def get_cache_stats():
+    """Report hit/miss/eviction counters of the extraction cache"""
+    try:
+        return jsonify(SkillService.get_cache_stats()), 200
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': f'Failed to get cache statistics: {str(e)}'}), 500
+
+@analysis_bp.route('/skill-candidates', methods=['GET'])
+@admin_required
+def get_skill_candidates():
+    """Most frequent terms in stored resumes and job descriptions that the skill taxonomy misses"""
+    try:
+        limit = min(request.args.get('limit', 50, type=int), 500)
+        min_documents = max(request.args.get('min_documents', Config.SKILL_DISCOVERY_MIN_DOCUMENTS, type=int),
+                            Config.SKILL_DISCOVERY_MIN_DOCUMENTS)
+        
+        return jsonify({
+            'success': True,
+            'candidates': skill_discovery.candidates(limit, min_documents),
+            'progress': skill_discovery.progress()
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': f'Failed to get skill candidates: {str(e)}'}), 500
+
+@analysis_bp.route('/skill-candidates/refresh', methods=['POST'])
+@admin_required
+def refresh_skill_candidates():
+    """Continue the skill discovery job over analyses stored since its checkpoint"""
+    try:
+        started = skill_discovery.start(current_app._get_current_object())
+        
+        return jsonify({
+            'success': True,
+            'started': started,
+            'message': 'Skill discovery started' if started else 'Skill discovery is already running',
+            'progress': skill_discovery.progress()
+        }), 202
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': f'Failed to start skill discovery: {str(e)}'}), 500
+
+@analysis_bp.route('/taxonomy', methods=['GET'])
+@admin_required
+def get_taxonomy_status():
+    """Report this worker's active skill taxonomy version, when it was built and the version requested"""
+    try:
+        result = SkillService.get_taxonomy_status()
+        return jsonify(result), 200 if result['success'] else 503
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': f'Failed to get taxonomy status: {str(e)}'}), 500
+
+@analysis_bp.route('/taxonomy/reload', methods=['POST'])
+@admin_required
+def reload_taxonomy():
+    """Compile the next taxonomy version from its configured sources and swap it in when ready"""
+    try:
+        result = SkillService.reload_taxonomy()
+        return jsonify(result), 202 if result['success'] else 409
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': f'Failed to reload taxonomy: {str(e)}'}), 500
+
 @analysis_bp.route('/quality-check', methods=['POST'])
 @login_required
 def analyze_resume_quality():
@@ -6,27 +6,48 @@ from models.analysis import AnalysisResult
 from models.user import User
 from config.database import db
 from sqlalchemy import func, desc
+from config.config import Config
+from services.near_duplicate import NearDuplicateIndex
+from services.skill_service import SkillService
+
+def _stored_signatures(user_id):
+    """(id, signature) of every analysis of the user that has a MinHash signature"""
+    rows = AnalysisResult.query.filter(
+        AnalysisResult.user_id == user_id,
+        AnalysisResult.minhash_signature.isnot(None)
+    ).all()
+    return [(row.id, row.get_minhash_signature()) for row in rows]
+
+# LSH index over the MinHash signatures of stored analyses, filled per user on first lookup
+near_duplicate_index = NearDuplicateIndex(Config.MINHASH_PERMUTATIONS, Config.LSH_BANDS, loader=_stored_signatures)
 
 class AnalysisService:
     """Service class for analysis operations"""
     
     @staticmethod
-    def save_analysis_result(user_id, analysis_data, filename=None, file_type=None):
+    def save_analysis_result(user_id, analysis_data, filename=None, file_type=None, signature=None, family=None):
         """Save analysis result to database"""
         try:
+            job_matching = (analysis_data.get('skills_analysis') or {}).get('job_matching') or {}
             analysis = AnalysisResult(
                 user_id=user_id,
-                filename=filename,
-                file_type=file_type,
-                analysis_data=analysis_data
+                resume_content=analysis_data.get('extracted_text') or '',
+                job_description=analysis_data.get('job_description') or '',
+                match_score=job_matching.get('match_percentage') or 0.0,
+                detailed_analysis={**analysis_data, 'file_type': file_type},
+                resume_file_name=filename,
+                minhash_signature=signature
             )
             
             db.session.add(analysis)
             db.session.commit()
             
+            # Later uploads of a near-identical resume can now find this analysis
+            near_duplicate_index.add(user_id, analysis.id, signature, family)
+            
             return {
                 'success': True,
-                'analysis': analysis.to_dict(),
+                'analysis': analysis.get_full_data(),
                 'message': 'Analysis saved successfully'
             }
             
@@ -37,6 +58,56 @@ class AnalysisService:
                 'error': f'Failed to save analysis: {str(e)}'
             }
     
+    @staticmethod
+    def find_near_duplicate(user_id, signature):
+        """Find the user's earlier analysis of a near-identical resume via the LSH index
+        
+        'reusable' is set when the estimated similarity reaches NEAR_DUPLICATE_THRESHOLD. 'family'
+        identifies the chain of revisions the upload belongs to (None for a new resume) and is
+        passed back on save.
+        """
+        try:
+            match = near_duplicate_index.query(user_id, signature)
+            return {
+                'success': True,
+                **match,
+                'reusable': match['analysis_id'] is not None and match['similarity'] >= Config.NEAR_DUPLICATE_THRESHOLD
+            }
+            
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'Near-duplicate lookup failed: {str(e)}'
+            }
+    
+    @staticmethod
+    def get_reusable_skill_result(analysis_id, user_id, job_description, use_ollama, include_context=False):
+        """Stored skill result of an earlier analysis if it answers the same request, else None"""
+        result = AnalysisService.get_analysis_by_id(analysis_id, user_id)
+        if not result['success']:
+            return None
+        
+        analysis_data = result['analysis'].get('detailed_analysis') or {}
+        skill_result = analysis_data.get('skills_analysis')
+        if not skill_result or not skill_result.get('success'):
+            return None
+        
+        # Job matching, Ollama output and contexts depend on the request, not just the resume
+        if (analysis_data.get('job_description') or '') != (job_description or ''):
+            return None
+        if (skill_result.get('analysis_method') == 'ollama_enhanced') != use_ollama:
+            return None
+        if include_context and 'skill_contexts' not in skill_result:
+            return None
+        # Custom AI results go stale when the taxonomy is reloaded with different content
+        if (skill_result.get('analysis_method') != 'ollama_enhanced'
+                and skill_result.get('taxonomy_fingerprint') != SkillService.current_taxonomy_fingerprint()):
+            return None
+        if not include_context:
+            skill_result.pop('skill_contexts', None)
+        
+        return skill_result
+    
     @staticmethod
     def get_user_analyses(user_id, page=1, per_page=10, search=None, sort_by='created_at', sort_order='desc'):
         """Get paginated analyses for a user with search and sorting"""
@@ -116,7 +187,7 @@ class AnalysisService:
             
             return {
                 'success': True,
-                'analysis': analysis.to_dict()
+                'analysis': analysis.get_full_data()
             }
             
         except Exception as e:
@@ -142,6 +213,7 @@ class AnalysisService:
             
             db.session.delete(analysis)
             db.session.commit()
+            near_duplicate_index.remove(analysis_id)
             
             return {
                 'success': True,
@@ -0,0 +1,136 @@
+"""
+Content-addressed cache for rule-based skill extraction results
+"""
+import copy
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+class ExtractionCache:
+    """Two-tier (in-process LRU + optional SQLite) store for CustomSkillExtractor results
+    
+    Entries are addressed by the extractor version (engine + taxonomy fingerprint + settings)
+    and the SHA-256 of the document text. Seeing a new version drops every entry stored
+    under an older one, so a changed skill database never serves stale results. The older
+    version is retired: requests still running on it (during a taxonomy reload) bypass the
+    cache instead of evicting the new version's entries.
+    """
+    
+    def __init__(self, max_entries=512, db_path=None):
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.version = None
+        self._retired = set()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'invalidations': 0
+        }
+        
+        self._connection = None
+        if db_path:
+            self._connection = sqlite3.connect(db_path, check_same_thread=False)
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS extraction_cache ('
+                'version TEXT NOT NULL, digest TEXT NOT NULL, result TEXT NOT NULL, created_at REAL NOT NULL, '
+                'PRIMARY KEY (version, digest))'
+            )
+            self._connection.commit()
+    
+    def get(self, version, digest):
+        """Return a copy of the cached result, or None on a miss"""
+        with self._lock:
+            if not self._check_version(version):
+                self._stats['misses'] += 1
+                return None
+            
+            result = self._entries.get(digest)
+            if result is not None:
+                self._entries.move_to_end(digest)
+                self._stats['memory_hits'] += 1
+                return copy.deepcopy(result)
+            
+            if self._connection is not None:
+                row = self._connection.execute(
+                    'SELECT result FROM extraction_cache WHERE version = ? AND digest = ?',
+                    (version, digest)
+                ).fetchone()
+                if row is not None:
+                    result = json.loads(row[0])
+                    self._remember(digest, result)
+                    self._stats['disk_hits'] += 1
+                    return copy.deepcopy(result)
+            
+            self._stats['misses'] += 1
+            return None
+    
+    def put(self, version, digest, result):
+        """Store a freshly computed result in both tiers"""
+        with self._lock:
+            if not self._check_version(version):
+                return
+            self._remember(digest, copy.deepcopy(result))
+            
+            if self._connection is not None:
+                self._connection.execute(
+                    'INSERT OR REPLACE INTO extraction_cache (version, digest, result, created_at) VALUES (?, ?, ?, ?)',
+                    (version, digest, json.dumps(result), time.time())
+                )
+                self._connection.commit()
+    
+    def activate(self, version):
+        """Make version current ahead of its first lookup, retiring the previous one"""
+        with self._lock:
+            self._check_version(version)
+    
+    def clear(self):
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._entries.clear()
+            if self._connection is not None:
+                self._connection.execute('DELETE FROM extraction_cache')
+                self._connection.commit()
+    
+    def stats(self):
+        """Hit/miss/eviction counters and current sizes"""
+        with self._lock:
+            lookups = self._stats['memory_hits'] + self._stats['disk_hits'] + self._stats['misses']
+            hits = self._stats['memory_hits'] + self._stats['disk_hits']
+            return {
+                **self._stats,
+                'hit_rate': round(hits / lookups, 3) if lookups else 0.0,
+                'memory_entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'disk_enabled': self._connection is not None,
+                'version': self.version
+            }
+    
+    def _remember(self, digest, result):
+        """Insert into the LRU tier, evicting the least recently used entries"""
+        self._entries[digest] = result
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats['evictions'] += 1
+    
+    def _check_version(self, version):
+        """Invalidate everything cached under a different extractor version; False for a retired one"""
+        if version == self.version:
+            return True
+        if version in self._retired:
+            return False
+        if self.version is not None:
+            self._retired.add(self.version)
+            self._stats['invalidations'] += len(self._entries)
+        self._entries.clear()
+        if self._connection is not None:
+            self._connection.execute('DELETE FROM extraction_cache WHERE version != ?', (version,))
+            self._connection.commit()
+        self.version = version
+        return True
@@ -7,6 +7,11 @@ import pdfplumber
 from werkzeug.utils import secure_filename
 from werkzeug.datastructures import FileStorage
 import tempfile
+from config.config import Config
+from services.near_duplicate import MinHasher
+
+# Signatures of uploaded text, compared against earlier analyses to spot near-duplicates
+minhasher = MinHasher(Config.MINHASH_PERMUTATIONS)
 
 class FileService:
     """Service class for file processing operations"""
@@ -170,7 +175,8 @@ class FileService:
                 'text': extraction_result['text'],
                 'word_count': extraction_result['word_count'],
                 'char_count': extraction_result['char_count'],
-                'file_size': len(file.read()) if hasattr(file, 'read') else 0
+                'file_size': len(file.read()) if hasattr(file, 'read') else 0,
+                'minhash_signature': minhasher.signature(extraction_result['text'])
             }
             
         except Exception as e:
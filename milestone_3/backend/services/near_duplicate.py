@@ -0,0 +1,168 @@
+"""
+MinHash signatures and an LSH index for spotting near-identical resume uploads
+"""
+import random
+import re
+import threading
+import zlib
+
+class MinHasher:
+    """Word-shingle MinHash signatures whose matching slots estimate Jaccard similarity
+    
+    Shingles are hashed with CRC-32 and permuted with fixed-seed universal hashes, so
+    signatures stay comparable across processes and can be stored with each analysis.
+    """
+    
+    PRIME = (1 << 61) - 1
+    SEED = 0x5eed
+    TOKEN = re.compile(r'\w+')
+    
+    def __init__(self, num_perm=128, shingle_size=4):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = random.Random(self.SEED)
+        self.permutations = [
+            (rng.randrange(1, self.PRIME), rng.randrange(0, self.PRIME))
+            for _ in range(num_perm)
+        ]
+    
+    def shingles(self, text):
+        """Distinct CRC-32 hashes of the overlapping word k-grams of the text"""
+        tokens = self.TOKEN.findall(text.lower())
+        if not tokens:
+            return set()
+        size = min(self.shingle_size, len(tokens))
+        return {
+            zlib.crc32(' '.join(tokens[index:index + size]).encode('utf-8'))
+            for index in range(len(tokens) - size + 1)
+        }
+    
+    def signature(self, text):
+        """MinHash signature of the text, or None when it has no words"""
+        hashes = self.shingles(text)
+        if not hashes:
+            return None
+        prime = self.PRIME
+        return [min((a * value + b) % prime for value in hashes) for a, b in self.permutations]
+    
+    @staticmethod
+    def similarity(first, second):
+        """Estimated Jaccard similarity of the texts behind two signatures"""
+        if not first or not second or len(first) != len(second):
+            return 0.0
+        return sum(1 for a, b in zip(first, second) if a == b) / len(first)
+
+class NearDuplicateIndex:
+    """Banded LSH over MinHash signatures, partitioned by user
+    
+    A signature is split into bands of rows; two resumes share a bucket when any band matches,
+    which happens mostly for pairs above (1 / bands) ** (1 / rows) similarity. Candidates are then
+    ranked by their full-signature estimate. Each entry also belongs to a family (the chain of
+    revisions of one resume) so callers can keep per-family state; a family is identified by the
+    id of its first analysis, so every process derives the same ids from the stored signatures.
+    A user's stored signatures are loaded on their first lookup.
+    """
+    
+    def __init__(self, num_perm=128, bands=16, loader=None):
+        if num_perm % bands:
+            raise ValueError('num_perm must be a multiple of bands')
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.loader = loader
+        self._signatures = {}
+        self._owners = {}
+        self._families = {}
+        self._buckets = {}
+        self._loaded_users = set()
+        self._lock = threading.Lock()
+    
+    def query(self, user_id, signature):
+        """Most similar indexed analysis of this user: analysis_id (None if no candidate), similarity, family
+        
+        With no candidate the family is None: the new analysis will start its own family on add().
+        """
+        with self._lock:
+            self._ensure_loaded(user_id)
+            analysis_id, similarity = self._nearest(user_id, signature)
+            if analysis_id is None:
+                return {'analysis_id': None, 'similarity': 0.0, 'family': None}
+            return {
+                'analysis_id': analysis_id,
+                'similarity': round(similarity, 3),
+                'family': self._families[analysis_id]
+            }
+    
+    def add(self, user_id, analysis_id, signature, family=None):
+        """Index a stored analysis; joins the family given, else the nearest one, else starts its own"""
+        if not signature or len(signature) != self.num_perm:
+            return None
+        with self._lock:
+            self._ensure_loaded(user_id)
+            return self._insert(user_id, analysis_id, signature, family)
+    
+    def remove(self, analysis_id):
+        """Forget a deleted analysis"""
+        with self._lock:
+            signature = self._signatures.pop(analysis_id, None)
+            if signature is None:
+                return
+            user_id = self._owners.pop(analysis_id)
+            del self._families[analysis_id]
+            for key in self._band_keys(user_id, signature):
+                bucket = self._buckets.get(key)
+                if bucket is not None:
+                    bucket.discard(analysis_id)
+                    if not bucket:
+                        del self._buckets[key]
+    
+    def stats(self):
+        """Sizes of the index"""
+        with self._lock:
+            return {
+                'signatures': len(self._signatures),
+                'buckets': len(self._buckets),
+                'loaded_users': len(self._loaded_users),
+                'bands': self.bands,
+                'rows': self.rows
+            }
+    
+    def _insert(self, user_id, analysis_id, signature, family):
+        """Add to the buckets; caller holds the lock"""
+        if family is None:
+            nearest, _ = self._nearest(user_id, signature)
+            family = self._families[nearest] if nearest is not None else analysis_id
+        self._signatures[analysis_id] = signature
+        self._owners[analysis_id] = user_id
+        self._families[analysis_id] = family
+        for key in self._band_keys(user_id, signature):
+            self._buckets.setdefault(key, set()).add(analysis_id)
+        return family
+    
+    def _nearest(self, user_id, signature):
+        """(analysis_id, similarity) of the best bucket candidate, or (None, 0.0)"""
+        if not signature or len(signature) != self.num_perm:
+            return None, 0.0
+        candidates = set()
+        for key in self._band_keys(user_id, signature):
+            candidates.update(self._buckets.get(key, ()))
+        if not candidates:
+            return None, 0.0
+        # Ties go to the latest analysis
+        similarity, best_id = max((MinHasher.similarity(signature, self._signatures[candidate]), candidate)
+                                  for candidate in candidates)
+        return best_id, similarity
+    
+    def _band_keys(self, user_id, signature):
+        """One bucket key per band, scoped to the user"""
+        rows = self.rows
+        return [(user_id, band, tuple(signature[band * rows:(band + 1) * rows])) for band in range(self.bands)]
+    
+    def _ensure_loaded(self, user_id):
+        """Index the user's stored signatures once, in analysis id order"""
+        if user_id in self._loaded_users or self.loader is None:
+            return
+        for analysis_id, signature in sorted(self.loader(user_id)):
+            if signature and len(signature) == self.num_perm and analysis_id not in self._signatures:
+                self._insert(user_id, analysis_id, signature, None)
+        self._loaded_users.add(user_id)
@@ -0,0 +1,332 @@
+"""
+Streaming discovery of technology terms the skill taxonomy does not cover yet
+"""
+import base64
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import zlib
+from array import array
+from config.config import Config
+from config.database import db
+from models.analysis import AnalysisResult
+from services.skill_service import taxonomy_registry
+
+class CountMinSketch:
+    """Fixed-size frequency sketch; estimates never undercount and overcount by at most ~e/width of the total"""
+    
+    def __init__(self, width=16384, depth=4):
+        self.width = width
+        self.depth = depth
+        self.rows = [array('I', bytes(4 * width)) for _ in range(depth)]
+    
+    def _columns(self, key):
+        """One column per row, from CRC-32 seeded with the row number"""
+        data = key.encode('utf-8')
+        return [zlib.crc32(data, row * 0x9e3779b1 & 0xffffffff) % self.width for row in range(self.depth)]
+    
+    def add(self, key, count=1):
+        """Count key with conservative update and return its new estimate"""
+        columns = self._columns(key)
+        estimate = min(row[column] for row, column in zip(self.rows, columns)) + count
+        for row, column in zip(self.rows, columns):
+            if row[column] < estimate:
+                row[column] = estimate
+        return estimate
+    
+    def estimate(self, key):
+        """Upper bound on how often key was counted"""
+        return min(row[column] for row, column in zip(self.rows, self._columns(key)))
+    
+    def to_dict(self):
+        """JSON-serializable state, rows as base64"""
+        return {
+            'width': self.width,
+            'depth': self.depth,
+            'rows': [base64.b64encode(row.tobytes()).decode('ascii') for row in self.rows]
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a sketch saved with to_dict"""
+        sketch = cls(data['width'], data['depth'])
+        for row, encoded in zip(sketch.rows, data['rows']):
+            row[:] = array('I', base64.b64decode(encoded))
+        return sketch
+
+class HeavyHitters:
+    """The `capacity` keys with the highest sketch estimates seen so far"""
+    
+    def __init__(self, capacity=500):
+        self.capacity = capacity
+        self.counts = {}
+        self.labels = {}
+        self._floor = 0
+    
+    def offer(self, key, label, estimate):
+        """Track key if its estimate beats the smallest tracked one"""
+        if key in self.counts:
+            self.counts[key] = estimate
+            return
+        if len(self.counts) >= self.capacity:
+            if estimate <= self._floor:
+                return
+            smallest = min(self.counts, key=self.counts.get)
+            del self.counts[smallest]
+            del self.labels[smallest]
+        self.counts[key] = estimate
+        self.labels[key] = label
+        if len(self.counts) >= self.capacity:
+            self._floor = min(self.counts.values())
+    
+    def ranked(self):
+        """(key, estimate) pairs, highest first"""
+        return sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))
+
+class SkillDiscoveryJob:
+    """Stream stored resumes and job descriptions in id order, counting terms outside the taxonomy
+    
+    Terms are capitalized phrases of two or three words ("Apache Airflow") and tech-like tokens
+    (versions, dotted or camel-cased names, acronyms: "Next.js", "GPT-4", "LangChain"), counted
+    once per document. Memory is bounded by the sketch size and the heavy-hitter capacity, and
+    the state is checkpointed to JSON after every batch so a restarted job resumes where it stopped.
+    Readers reload the checkpoint when another worker has written a newer one.
+    """
+    
+    CHECKPOINT_VERSION = 1
+    TOKEN = re.compile(r'[A-Za-z][\w.+#-]*[\w+#]|[A-Za-z]')
+    # Single-word tokens that look technical: digits, inner punctuation, inner capitals or short acronyms
+    TECH_TOKEN = re.compile(r'^(?:.*\d.*|.+[.+#].*|[A-Za-z]*[a-z][A-Z]\w*|[A-Z]{2,6}s?)$')
+    CAPITALIZED = re.compile(r'^[A-Z][a-z]')
+    BOUNDARY = re.compile(r'[,;:()|/•]+|[.!?](?:\s|$)|\s[-–—]\s')
+    CONTACT = re.compile(r'\S+@\S+|https?://\S+|www\.\S+')
+    # Words common in resumes and job descriptions that make up most capitalized phrases
+    STOPWORDS = frozenset("""
+        a an and the of for in on at to with by from as or is are be our your we you i my
+        experience education skills summary profile objective projects project certifications
+        responsibilities requirements qualifications work history employment professional
+        senior junior lead principal staff software engineer engineering developer development
+        manager management team data analyst intern university college school institute bachelor
+        master degree science technology technologies computer information systems present
+        january february march april may june july august september october november december
+        jan feb mar apr jun jul aug sep sept oct nov dec inc ltd llc corp company
+        e.g i.e etc gpa ceo cto usa phd mba
+        """.split())
+    
+    def __init__(self, checkpoint_path, known_skills=(), batch_size=200, capacity=500, width=16384, depth=4):
+        self.checkpoint_path = checkpoint_path
+        self.known_skills = {skill.lower() for skill in known_skills}
+        self.batch_size = batch_size
+        self.capacity = capacity
+        self.width = width
+        self.depth = depth
+        self.running = False
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        # Modification time (ns) of the checkpoint the state was loaded from or saved to
+        self._checkpoint_mtime = None
+        self._reset()
+        self._load_checkpoint()
+    
+    def _reset(self):
+        """Empty counts, starting from the first analysis"""
+        self.sketch = CountMinSketch(self.width, self.depth)
+        self.hitters = HeavyHitters(self.capacity)
+        self.last_id = 0
+        self.documents = 0
+        self.updated_at = None
+    
+    def terms(self, text):
+        """Distinct (key, label) candidate terms of one document that the taxonomy does not know"""
+        found = {}
+        for line in self.CONTACT.sub(' ', text).splitlines():
+            # Phrases stop at punctuation, so only runs of adjacent words are joined
+            for fragment in self.BOUNDARY.split(line):
+                tokens = self.TOKEN.findall(fragment)
+                for index, token in enumerate(tokens):
+                    if self.TECH_TOKEN.match(token):
+                        self._collect(found, [token])
+                    for size in (2, 3):
+                        phrase = tokens[index:index + size]
+                        if len(phrase) == size and all(self.CAPITALIZED.match(word) or self.TECH_TOKEN.match(word)
+                                                       for word in phrase):
+                            self._collect(found, phrase)
+        return found.items()
+    
+    def _collect(self, found, words):
+        """Add a term unless it is a known skill or made only of known skills and common words"""
+        key = ' '.join(words).lower()
+        if key in found or key in self.known_skills:
+            return
+        if all(word.lower() in self.STOPWORDS or word.lower() in self.known_skills for word in words):
+            return
+        found[key] = ' '.join(words)
+    
+    def add_document(self, text):
+        """Count the candidate terms of one document"""
+        for key, label in self.terms(text or ''):
+            self.hitters.offer(key, label, self.sketch.add(key))
+        self.documents += 1
+    
+    def run(self, max_batches=None):
+        """Process stored analyses after the checkpoint, one batch at a time; needs an app context"""
+        batches = 0
+        while not self._stop.is_set() and (max_batches is None or batches < max_batches):
+            rows = db.session.query(
+                AnalysisResult.id, AnalysisResult.resume_content, AnalysisResult.job_description
+            ).filter(AnalysisResult.id > self.last_id).order_by(AnalysisResult.id).limit(self.batch_size).all()
+            if not rows:
+                break
+            with self._lock:
+                for analysis_id, resume_content, job_description in rows:
+                    self.add_document(resume_content)
+                    self.add_document(job_description)
+                    self.last_id = analysis_id
+                self.updated_at = time.time()
+                self.save_checkpoint()
+            batches += 1
+        return batches
+    
+    def start(self, app):
+        """Run in a daemon thread inside the app context; False if a run is already going"""
+        with self._lock:
+            if self.running:
+                return False
+            self.running = True
+            self._stop.clear()
+        
+        def target():
+            try:
+                with app.app_context():
+                    batches = self.run()
+                print(f"Skill discovery processed {batches} batches up to analysis {self.last_id}")
+            except Exception as e:
+                print(f"Skill discovery failed: {str(e)}")
+            finally:
+                self.running = False
+        
+        self._thread = threading.Thread(target=target, name='skill-discovery', daemon=True)
+        self._thread.start()
+        return True
+    
+    def set_known_skills(self, known_skills):
+        """Replace the skills the taxonomy covers, e.g. after a taxonomy reload"""
+        with self._lock:
+            self.known_skills = {skill.lower() for skill in known_skills}
+    
+    def stop(self):
+        """Ask a background run to stop after its current batch"""
+        self._stop.set()
+    
+    def candidates(self, limit=50, min_documents=2):
+        """Ranked terms with their estimated document counts, skipping ones the taxonomy now covers"""
+        with self._lock:
+            self._refresh()
+            ranked = []
+            for key, count in self.hitters.ranked():
+                if count < min_documents or key in self.known_skills:
+                    continue
+                ranked.append({'term': self.hitters.labels[key], 'documents': count})
+                if len(ranked) >= limit:
+                    break
+            return ranked
+    
+    def progress(self):
+        """Position in the analysis table and size of the tracked state"""
+        with self._lock:
+            self._refresh()
+            return {
+                'running': self.running,
+                'last_analysis_id': self.last_id,
+                'documents': self.documents,
+                'tracked_terms': len(self.hitters.counts),
+                'updated_at': self.updated_at
+            }
+    
+    def save_checkpoint(self):
+        """Write the state atomically, so a crash mid-write keeps the previous checkpoint"""
+        if not self.checkpoint_path:
+            return
+        state = {
+            'version': self.CHECKPOINT_VERSION,
+            'last_id': self.last_id,
+            'documents': self.documents,
+            'updated_at': self.updated_at,
+            'sketch': self.sketch.to_dict(),
+            'hitters': {key: [self.hitters.labels[key], count] for key, count in self.hitters.counts.items()}
+        }
+        # A unique temporary file, so workers saving at the same time never write into one file
+        directory, name = os.path.split(os.path.abspath(self.checkpoint_path))
+        os.makedirs(directory, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(prefix=f'{name}.', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(handle, 'w') as checkpoint:
+                json.dump(state, checkpoint)
+            os.replace(temp_path, self.checkpoint_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self._checkpoint_mtime = self._stat_checkpoint()
+    
+    def _stat_checkpoint(self):
+        """Modification time of the checkpoint in ns, or None if there is none"""
+        try:
+            return os.stat(self.checkpoint_path).st_mtime_ns
+        except (OSError, TypeError):
+            return None
+    
+    def _refresh(self):
+        """Reload the checkpoint if another process replaced it; caller holds the lock"""
+        if self.running or not self.checkpoint_path:
+            return
+        mtime = self._stat_checkpoint()
+        if mtime is not None and mtime != self._checkpoint_mtime:
+            self._reset()
+            self._load_checkpoint()
+    
+    def _load_checkpoint(self):
+        """Resume from the checkpoint if it matches this job's sketch shape"""
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return
+        self._checkpoint_mtime = self._stat_checkpoint()
+        try:
+            with open(self.checkpoint_path) as checkpoint:
+                state = json.load(checkpoint)
+            sketch = state['sketch']
+            if (state.get('version') != self.CHECKPOINT_VERSION
+                    or (sketch['width'], sketch['depth']) != (self.width, self.depth)):
+                print("Skill discovery checkpoint does not match the current settings, starting over")
+                return
+            self.sketch = CountMinSketch.from_dict(sketch)
+            for key, (label, count) in state['hitters'].items():
+                self.hitters.offer(key, label, count)
+            self.last_id = state['last_id']
+            self.documents = state['documents']
+            self.updated_at = state.get('updated_at')
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Could not load skill discovery checkpoint: {str(e)}")
+            self._reset()
+
+def _known_skills(version):
+    """Every synonym of a taxonomy version plus its service category lists"""
+    if version is None:
+        return set()
+    known = set(version.taxonomy.all_skills)
+    for skills in version.skill_categories.values():
+        known.update(skills)
+    return known
+
+skill_discovery = SkillDiscoveryJob(
+    Config.SKILL_DISCOVERY_CHECKPOINT,
+    known_skills=_known_skills(taxonomy_registry.active if taxonomy_registry is not None else None),
+    batch_size=Config.SKILL_DISCOVERY_BATCH_SIZE,
+    capacity=Config.SKILL_DISCOVERY_CAPACITY
+)
+
+if taxonomy_registry is not None:
+    # Terms a reloaded taxonomy covers drop out of the candidates
+    taxonomy_registry.add_listener(lambda version, previous: skill_discovery.set_known_skills(_known_skills(version)))
@@ -4,64 +4,52 @@ Skill extraction and matching service
 import re
 import sys
 import os
+import threading
+from collections import OrderedDict
 
 # Add parent directory to path to import custom_ai
 # From /workspaces/infosys_6.0/milestone_3/backend/services/ go up to /workspaces/infosys_6.0/milestone_3/
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+from config.config import Config
+from services.extraction_cache import ExtractionCache
+
+# Shared by every extractor in this process, see ExtractionCache
+extraction_cache = ExtractionCache(Config.EXTRACTION_CACHE_SIZE, Config.EXTRACTION_CACHE_PATH)
+
+# Most recently used incremental extraction state per (taxonomy version, session key), e.g. a user id
+incremental_sessions = OrderedDict()
+incremental_sessions_lock = threading.Lock()
+
 try:
-    from custom_ai import CustomSkillExtractor, CustomJobMatcher
-    # Initialize the AI components
-    skill_extractor = CustomSkillExtractor()
-    job_matcher = CustomJobMatcher()
+    from custom_ai import DEFAULT_SKILL_VIEWS, Document, IncrementalExtraction, non_overlapping_spans
+    from services.taxonomy_registry import TaxonomyRegistry
 except ImportError:
     # Fallback implementation if custom_ai is not available
-    skill_extractor = None
-    job_matcher = None
+    TaxonomyRegistry = None
+    Document = None
+    DEFAULT_SKILL_VIEWS = {'service_categories': {}}
 from services.ollama_service import OllamaService
 
 class SkillService:
     """Service class for skill extraction and matching operations"""
     
-    # Common skills categories for better organization
-    SKILL_CATEGORIES = {
-        'programming': [
-            'python', 'java', 'javascript', 'c++', 'c#', 'php', 'ruby', 'go', 'rust',
-            'typescript', 'kotlin', 'swift', 'scala', 'r', 'matlab', 'perl', 'bash'
-        ],
-        'web_development': [
-            'html', 'css', 'react', 'angular', 'vue', 'node.js', 'express', 'django',
-            'flask', 'spring', 'laravel', 'bootstrap', 'jquery', 'webpack', 'sass'
-        ],
-        'databases': [
-            'sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch',
-            'oracle', 'sqlite', 'cassandra', 'dynamodb', 'neo4j'
-        ],
-        'cloud_devops': [
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'git',
-            'terraform', 'ansible', 'chef', 'puppet', 'gitlab', 'circleci'
-        ],
-        'data_science': [
-            'machine learning', 'deep learning', 'tensorflow', 'pytorch', 'scikit-learn',
-            'pandas', 'numpy', 'matplotlib', 'seaborn', 'jupyter', 'tableau', 'power bi'
-        ],
-        'mobile_development': [
-            'android', 'ios', 'react native', 'flutter', 'xamarin', 'cordova',
-            'ionic', 'swift', 'kotlin', 'objective-c'
-        ],
-        'cybersecurity': [
-            'penetration testing', 'vulnerability assessment', 'network security',
-            'cryptography', 'ethical hacking', 'incident response', 'compliance'
-        ],
-        'soft_skills': [
-            'leadership', 'communication', 'teamwork', 'problem solving',
-            'project management', 'agile', 'scrum', 'time management'
-        ]
-    }
+    # Common skills categories for better organization, the default 'service_categories' view of
+    # the skill registry; a request reads the version it runs on through _service_categories()
+    SKILL_CATEGORIES = DEFAULT_SKILL_VIEWS['service_categories']
     
     @staticmethod
-    def extract_skills_from_text(text, job_description=None, use_ollama=True):
-        """Extract skills from resume/CV text using Ollama or fallback to custom AI"""
+    def extract_skills_from_text(text, job_description=None, use_ollama=True, sections=None, session_key=None,
+                                 profile=False, include_context=False):
+        """Extract skills from resume/CV text using Ollama or fallback to custom AI
+        
+        `sections` (e.g. ['skills', 'experience']) limits the custom AI pass to those resume
+        sections; Ollama always reads the whole text, so it is skipped for scoped requests.
+        With a `session_key` (e.g. the user id) an edited resume only has its changed lines
+        rescanned, relative to the previous text analyzed under the same key. `profile` adds
+        the custom AI's per-stage timings and counters to the result, and `include_context`
+        the text around each skill's first mention (snippets are only cut when asked for).
+        """
         try:
             if not text or not text.strip():
                 return {
@@ -70,7 +58,7 @@ class SkillService:
                 }
             
             # Try Ollama first for enhanced analysis
-            if use_ollama:
+            if use_ollama and not sections:
                 ollama_result = SkillService._extract_with_ollama(text, job_description)
                 if ollama_result['success']:
                     return ollama_result
@@ -80,64 +68,126 @@ class SkillService:
             
             # Fallback to custom AI
             # Use custom AI to extract skills
-            if skill_extractor is None:
+            if taxonomy_registry is None:
                 return {
                     'success': False,
                     'error': 'Custom AI module not available'
                 }
             
-            ai_result = skill_extractor.extract_skills_from_text(text)
+            active = taxonomy_registry.current()
+            text = SkillService._normalize_text(text)
+            document = Document(text)
+            if session_key is not None and not sections:
+                ai_result = SkillService._incremental_session(active, session_key).extract(document, profile)
+            else:
+                ai_result = active.skill_extractor.extract(document, sections, profile)
             
             # The CustomSkillExtractor returns a different format
-            if not ai_result or 'skills' not in ai_result:
+            if ai_result is None:
                 return {
                     'success': False,
                     'error': 'Skill extraction failed - invalid result format'
                 }
             
-            # Extract skill names from the result
-            extracted_skills = list(ai_result['skills'].keys())
-            
-            # Categorize skills
-            categorized_skills = SkillService._categorize_skills(extracted_skills)
+            return SkillService._build_custom_ai_result(ai_result, document, job_description, include_context)
             
-            # Calculate skill confidence scores
-            skill_scores = SkillService._calculate_skill_scores(text, extracted_skills)
-            
-            # Generate skill insights
-            insights = SkillService._generate_skill_insights(categorized_skills, text)
-            
-            result = {
-                'success': True,
-                'skills': extracted_skills,
-                'categorized_skills': categorized_skills,
-                'skill_scores': skill_scores,
-                'insights': insights,
-                'total_skills': len(extracted_skills),
-                'text_analysis': {
-                    'word_count': len(text.split()),
-                    'char_count': len(text),
-                    'skill_density': len(extracted_skills) / max(len(text.split()), 1) * 100
-                },
-                'analysis_method': 'custom_ai'  # Indicate fallback method
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'Error in skill extraction: {str(e)}'
             }
+    
+    @staticmethod
+    def extract_skills_from_structured(payload, job_description=None, include_context=False):
+        """Extract skills from a structured profile such as a JSON Resume document
+        
+        Declared skills map straight onto the taxonomy and employment periods come from the work
+        entries' dates; only summary/description/highlights text is scanned (see
+        CustomSkillExtractor.extract_structured). Ollama is not involved.
+        """
+        try:
+            if not isinstance(payload, dict) or not payload:
+                return {
+                    'success': False,
+                    'error': 'No structured profile provided'
+                }
             
-            # If job description provided, include matching analysis
-            if job_description:
-                matching_result = SkillService.match_skills_to_job(
-                    extracted_skills, job_description, use_ollama=False  # Use custom AI for consistency
-                )
-                if matching_result['success']:
-                    result['job_matching'] = matching_result['matching']
+            if taxonomy_registry is None:
+                return {
+                    'success': False,
+                    'error': 'Custom AI module not available'
+                }
             
+            ai_result = taxonomy_registry.current().skill_extractor.extract_structured(payload)
+            document = Document(ai_result.text)
+            result = SkillService._build_custom_ai_result(ai_result, document, job_description, include_context)
+            
+            # Declared skills have no mentions to score, so their own statement counts as a strong one
+            for skill in ai_result.declared:
+                if result['skill_scores'][skill]['score'] < 100:
+                    result['skill_scores'][skill].update({'score': 100, 'confidence': 'high'})
+            result['declared_skills'] = ai_result.declared
+            result['experience'] = ai_result.experience
+            result['analysis_method'] = 'structured_import'
             return result
             
         except Exception as e:
             return {
                 'success': False,
-                'error': f'Error in skill extraction: {str(e)}'
+                'error': f'Error in structured skill extraction: {str(e)}'
             }
     
+    @staticmethod
+    def _build_custom_ai_result(ai_result, document, job_description=None, include_context=False):
+        """Turn a custom AI ExtractionResult over `document` into the service's result shape"""
+        text = document.text
+        
+        # Extract skill names from the result
+        extracted_skills = list(ai_result.skills)
+        
+        # Categorize skills
+        categorized_skills = SkillService._categorize_skills(extracted_skills)
+        
+        # Calculate skill confidence scores
+        skill_scores = SkillService._calculate_skill_scores(
+            document, {skill: match.span_pairs() for skill, match in ai_result.skills.items()}
+        )
+        
+        # Generate skill insights
+        insights = SkillService._generate_skill_insights(categorized_skills, text)
+        
+        result = {
+            'success': True,
+            'skills': extracted_skills,
+            'categorized_skills': categorized_skills,
+            'skill_scores': skill_scores,
+            'insights': insights,
+            'total_skills': len(extracted_skills),
+            'text_analysis': {
+                'word_count': len(document.tokens),
+                'char_count': len(text),
+                'skill_density': len(extracted_skills) / max(len(document.tokens), 1) * 100,
+                'sections': [name for name, _, _ in document.sections]
+            },
+            'analysis_method': 'custom_ai',  # Indicate fallback method
+            # Stored results are only reused while the taxonomy that produced them is active
+            'taxonomy_fingerprint': taxonomy_registry.current().taxonomy.fingerprint
+        }
+        if include_context:
+            result['skill_contexts'] = {skill: ai_result.context(skill) for skill in extracted_skills}
+        if ai_result.profile is not None:
+            result['profile'] = ai_result.profile
+        
+        # If job description provided, include matching analysis
+        if job_description:
+            matching_result = SkillService.match_skills_to_job(
+                extracted_skills, job_description, use_ollama=False  # Use custom AI for consistency
+            )
+            if matching_result['success']:
+                result['job_matching'] = matching_result['matching']
+        
+        return result
+    
     @staticmethod
     def match_skills_to_job(resume_skills, job_description, use_ollama=True):
         """Match extracted skills to job requirements using Ollama or fallback"""
@@ -161,7 +211,7 @@ class SkillService:
                 pass
             
             # Use custom AI for skill matching
-            if job_matcher is None:
+            if taxonomy_registry is None:
                 return {
                     'success': False,
                     'error': 'Custom AI module not available'
@@ -169,7 +219,8 @@ class SkillService:
             
             # Create a simple resume text from skills for matching
             resume_text = ' '.join(resume_skills)
-            ai_result = job_matcher.calculate_match_score(resume_text, job_description)
+            job_document = Document(SkillService._normalize_text(job_description))
+            ai_result = taxonomy_registry.current().job_matcher.calculate_match_score(resume_text, job_document)
             
             if not ai_result:
                 return {
@@ -181,7 +232,7 @@ class SkillService:
             
             # Enhance matching with additional analysis
             enhanced_matching = SkillService._enhance_matching_analysis(
-                resume_skills, job_description, matching_data
+                resume_skills, job_document, matching_data
             )
             
             return {
@@ -195,53 +246,125 @@ class SkillService:
                 'error': f'Error in skill matching: {str(e)}'
             }
     
+    @staticmethod
+    def _normalize_text(text):
+        """Normalize line endings and outer whitespace so identical content hashes identically"""
+        return text.replace('\r\n', '\n').replace('\r', '\n').strip()
+    
+    @staticmethod
+    def _incremental_session(active, session_key):
+        """Incremental extraction state for a session key on a taxonomy version, evicting the least recently used ones"""
+        session_key = (active.number, session_key)
+        with incremental_sessions_lock:
+            session = incremental_sessions.get(session_key)
+            if session is None:
+                session = incremental_sessions[session_key] = IncrementalExtraction(active.skill_extractor)
+            incremental_sessions.move_to_end(session_key)
+            while len(incremental_sessions) > Config.INCREMENTAL_SESSIONS:
+                incremental_sessions.popitem(last=False)
+            return session
+    
+    @staticmethod
+    def get_taxonomy_status():
+        """Active taxonomy version, its build time and the state of any reload"""
+        if taxonomy_registry is None:
+            return {
+                'success': False,
+                'error': 'Custom AI module not available'
+            }
+        return {
+            'success': True,
+            'taxonomy': taxonomy_registry.status()
+        }
+    
+    @staticmethod
+    def reload_taxonomy():
+        """Start compiling the next taxonomy version from the configured sources"""
+        if taxonomy_registry is None:
+            return {
+                'success': False,
+                'error': 'Custom AI module not available'
+            }
+        if not taxonomy_registry.reload():
+            return {
+                'success': False,
+                'error': 'A taxonomy reload is already running'
+            }
+        return {
+            'success': True,
+            'message': f'Building taxonomy version {taxonomy_registry.requested} in every worker',
+            'active_version': taxonomy_registry.active.number
+        }
+    
+    @staticmethod
+    def current_taxonomy_fingerprint():
+        """Fingerprint of the taxonomy serving this request, None without custom AI"""
+        return taxonomy_registry.current().taxonomy.fingerprint if taxonomy_registry is not None else None
+    
+    @staticmethod
+    def _service_categories():
+        """Category keyword lists of the taxonomy version serving this request"""
+        if taxonomy_registry is None:
+            return SkillService.SKILL_CATEGORIES
+        return taxonomy_registry.current().skill_categories
+    
+    @staticmethod
+    def get_cache_stats():
+        """Counters for the extraction result cache"""
+        return {
+            'success': True,
+            'cache': extraction_cache.stats()
+        }
+    
     @staticmethod
     def _categorize_skills(skills):
         """Categorize skills into different categories"""
-        categorized = {category: [] for category in SkillService.SKILL_CATEGORIES.keys()}
+        categorized = {category: [] for category in SkillService._service_categories().keys()}
         categorized['other'] = []
         
         for skill in skills:
-            skill_lower = skill.lower()
-            categorized_flag = False
-            
-            for category, category_skills in SkillService.SKILL_CATEGORIES.items():
-                if any(cat_skill in skill_lower for cat_skill in category_skills):
-                    categorized[category].append(skill)
-                    categorized_flag = True
-                    break
-            
-            if not categorized_flag:
-                categorized['other'].append(skill)
+            matching_categories = SkillService._skill_categories(skill.lower())
+            categorized[matching_categories[0] if matching_categories else 'other'].append(skill)
         
         # Remove empty categories
         return {k: v for k, v in categorized.items() if v}
     
     @staticmethod
-    def _calculate_skill_scores(text, skills):
-        """Calculate confidence scores for extracted skills"""
-        text_lower = text.lower()
+    def _skill_categories(skill_lower):
+        """Service categories whose keywords occur in a skill name, in declaration order
+        
+        Memoized per taxonomy version (see TaxonomyVersion.categories_of), so a reload of the
+        keyword lists takes effect for the next request.
+        """
+        return taxonomy_registry.current().categories_of(skill_lower)
+    
+    @staticmethod
+    def _calculate_skill_scores(document, skill_spans):
+        """Calculate confidence scores for extracted skills from their (start, end) spans"""
+        text_lower = document.lower
         skill_scores = {}
         
-        for skill in skills:
-            skill_lower = skill.lower()
-            
-            # Count occurrences
-            count = text_lower.count(skill_lower)
+        # Keyword positions do not depend on the skill, so find them once
+        context_keywords = ['experience', 'years', 'proficient', 'expert', 'advanced', 'skilled']
+        keyword_positions_by_keyword = {
+            keyword: [m.start() for m in re.finditer(keyword, text_lower)]
+            for keyword in context_keywords
+        }
+        
+        for skill, spans in skill_spans.items():
+            # Count occurrences the way str.count would, from the extractor's hits
+            skill_positions = [start for start, _ in non_overlapping_spans(spans)]
+            count = len(skill_positions)
             
             # Calculate base score
             base_score = min(count * 20, 100)  # Max 100
             
             # Bonus for context keywords
             context_bonus = 0
-            context_keywords = ['experience', 'years', 'proficient', 'expert', 'advanced', 'skilled']
             
-            for keyword in context_keywords:
-                if keyword in text_lower:
+            for keyword, keyword_positions in keyword_positions_by_keyword.items():
+                if keyword_positions:
                     # Check if keyword is near the skill
-                    skill_positions = [m.start() for m in re.finditer(skill_lower, text_lower)]
-                    keyword_positions = [m.start() for m in re.finditer(keyword, text_lower)]
-                    
                     for skill_pos in skill_positions:
                         for keyword_pos in keyword_positions:
                             if abs(skill_pos - keyword_pos) < 100:  # Within 100 characters
@@ -301,10 +424,10 @@ class SkillService:
         return insights
     
     @staticmethod
-    def _enhance_matching_analysis(resume_skills, job_description, matching_data):
+    def _enhance_matching_analysis(resume_skills, job_document, matching_data):
         """Enhance matching analysis with additional metrics"""
         # Extract job requirements from description
-        job_skills = SkillService._extract_job_requirements(job_description)
+        job_skills = SkillService._extract_job_requirements(job_document)
         
         # Calculate additional metrics
         matched_skills = matching_data.get('matched_skills', [])
@@ -334,19 +457,11 @@ class SkillService:
         return enhanced_matching
     
     @staticmethod
-    def _extract_job_requirements(job_description):
+    def _extract_job_requirements(job_document):
         """Extract skill requirements from job description"""
-        # Simple extraction - can be enhanced with AI
-        skills = []
-        text_lower = job_description.lower()
-        
-        # Check for skills from all categories
-        for category_skills in SkillService.SKILL_CATEGORIES.values():
-            for skill in category_skills:
-                if skill in text_lower:
-                    skills.append(skill.title())
-        
-        return list(set(skills))
+        # Service category keywords found by the registry scan the job matcher already ran over the document
+        taxonomy = taxonomy_registry.current().taxonomy
+        return list({skill.title() for skill in taxonomy.matching_terms('service_categories', job_document)})
     
     @staticmethod
     def _generate_improvement_suggestions(matched_skills, missing_skills, resume_skills):
@@ -372,9 +487,7 @@ class SkillService:
         # Category-specific suggestions
         categories_present = set()
         for skill in resume_skills:
-            for category, category_skills in SkillService.SKILL_CATEGORIES.items():
-                if any(cat_skill in skill.lower() for cat_skill in category_skills):
-                    categories_present.add(category)
+            categories_present.update(SkillService._skill_categories(skill.lower()))
         
         if 'soft_skills' not in categories_present:
             suggestions.append({
@@ -644,4 +757,21 @@ class SkillService:
             return {
                 'success': False,
                 'error': f'Comprehensive Ollama analysis failed: {str(e)}'
-            }
\ No newline at end of file
+            }
+
+def _retire_taxonomy_version(version, previous):
+    """Move the caches keyed on extraction output over to a newly activated taxonomy version"""
+    extraction_cache.activate(version.skill_extractor.version)
+    with incremental_sessions_lock:
+        for session_key in [key for key in incremental_sessions if key[0] != version.number]:
+            del incremental_sessions[session_key]
+
+# Versioned taxonomy with the extractor and matcher built on it, reloadable at runtime
+if TaxonomyRegistry is not None:
+    taxonomy_registry = TaxonomyRegistry({
+        'cache': extraction_cache,
+        'profile_sink': (lambda profile: print(f"Extraction profile: {profile}")) if Config.EXTRACTION_PROFILE_LOG else None
+    })
+    taxonomy_registry.add_listener(_retire_taxonomy_version)
+else:
+    taxonomy_registry = None
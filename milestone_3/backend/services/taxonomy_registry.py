@@ -0,0 +1,256 @@
+"""
+Versioned skill taxonomy, rebuilt in the background and swapped in without restarting workers
+"""
+import contextvars
+import tempfile
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+from config.config import Config
+from custom_ai import (DEFAULT_SKILL_VIEWS, CompiledTaxonomy, CustomJobMatcher, CustomSkillExtractor, SkillDatabase,
+                       SkillGraph, SkillTable, load_skill_graph_file, load_taxonomy_file, taxonomy_fingerprint)
+
+# The version a request started on, see TaxonomyRegistry.pin()
+_pinned_version = contextvars.ContextVar('pinned_taxonomy_version', default=None)
+
+class TaxonomyVersion:
+    """One compiled skill registry with the extractor and matcher built on it
+    
+    A version is never modified once built, so requests holding it are unaffected by reloads.
+    """
+    
+    def __init__(self, number, taxonomy, source, build_seconds, extractor_options):
+        self.number = number
+        self.taxonomy = taxonomy
+        # The service category keyword lists, a view of the registry
+        self.skill_categories = taxonomy.view('service_categories')
+        self.source = source
+        self.build_seconds = build_seconds
+        self.built_at = datetime.utcnow()
+        self.skill_extractor = CustomSkillExtractor(taxonomy=taxonomy, **extractor_options)
+        self.job_matcher = CustomJobMatcher(self.skill_extractor)
+        # Memoized per version, so a reload never answers from the previous keyword lists
+        self.categories_of = lru_cache(maxsize=4096)(self._categories_of)
+    
+    def _categories_of(self, skill_lower):
+        """skill_categories whose keywords occur in a skill name, in declaration order
+        
+        The keywords match as substrings ('react' also files 'react native'), so this is one pass of
+        the registry automaton over the name; the answer per distinct name is memoized, and extracted
+        names repeat.
+        """
+        return self.taxonomy.groups_of('service_categories', skill_lower)
+    
+    def describe(self):
+        """JSON-ready summary of the version"""
+        return {
+            'version': self.number,
+            'fingerprint': self.taxonomy.fingerprint,
+            'extractor_version': self.skill_extractor.version,
+            'synonyms': len(self.taxonomy.all_skills),
+            'service_categories': len(self.skill_categories),
+            'graph_edges': len(self.taxonomy.skill_graph.edges),
+            'weak_match_pairs': sum(len(row) for row in self.taxonomy.similarity_table.pairs.values()),
+            'source': self.source,
+            'compiled_from': self.taxonomy.source,
+            'built_at': self.built_at.isoformat(),
+            'build_seconds': round(self.build_seconds, 3)
+        }
+
+class TaxonomyRegistry:
+    """The active TaxonomyVersion, replaced by reload() without a restart
+    
+    reload() re-reads the configured sources and compiles the next version in a background
+    thread. Activating it is a single reference assignment: requests that pinned the previous
+    version (see pin()) finish on it, and everything after sees the new one. Listeners are
+    called with (new, previous) after each swap to drop state derived from the previous version.
+    
+    Each worker process holds its own registry. reload() therefore also records the new version
+    number in the TAXONOMY_RELOAD_MARKER file, and pin() checks that file (at most every
+    TAXONOMY_POLL_SECONDS) so the other workers build the same version on their next request.
+    """
+    
+    def __init__(self, extractor_options=None, marker_path=None, poll_seconds=None):
+        self.extractor_options = extractor_options or {}
+        self.marker_path = Config.TAXONOMY_RELOAD_MARKER if marker_path is None else marker_path
+        self.poll_seconds = Config.TAXONOMY_POLL_SECONDS if poll_seconds is None else poll_seconds
+        self.reloading = False
+        self.last_error = None
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._marker_mtime, marker_version = self._read_marker()
+        self._polled_at = time.monotonic()
+        # Highest version this worker has started building
+        self.requested = max(marker_version, 1)
+        self._active = self._build(self.requested)
+        print(f"Skill taxonomy version {self.requested} ready in {self._active.build_seconds * 1000:.1f} ms "
+              f"({self._active.taxonomy.source})")
+    
+    @property
+    def active(self):
+        """The version new requests start on"""
+        return self._active
+    
+    def current(self):
+        """The version pinned for the running request, else the active one"""
+        return _pinned_version.get() or self._active
+    
+    def pin(self):
+        """Pin the active version for the current context; returns the token release() expects
+        
+        Also starts building a version another worker has reloaded to, which later requests pick up.
+        """
+        self._poll_marker()
+        return _pinned_version.set(self._active)
+    
+    def release(self, token):
+        """Undo a pin()"""
+        _pinned_version.reset(token)
+    
+    @contextmanager
+    def pinned(self):
+        """Run a block on one version, keeping an outer pin if there is one"""
+        if _pinned_version.get() is not None:
+            yield _pinned_version.get()
+            return
+        token = self.pin()
+        try:
+            yield self._active
+        finally:
+            self.release(token)
+    
+    def add_listener(self, listener):
+        """Call listener(new_version, previous_version) after every swap"""
+        self._listeners.append(listener)
+    
+    def reload(self, background=True):
+        """Build and activate the next version in every worker; False if a reload is already running"""
+        with self._lock:
+            if self.reloading:
+                return False
+            self.reloading = True
+            _, marker_version = self._read_marker()
+            self.requested = max(self.requested, marker_version) + 1
+            number = self.requested
+        
+        try:
+            self._write_marker(number)
+        except OSError as e:
+            print(f"Could not record taxonomy version {number} for other workers: {str(e)}")
+        return self._start(number, background)
+    
+    def status(self):
+        """Active version and the state of any reload"""
+        return {
+            'active': self._active.describe(),
+            'requested_version': self.requested,
+            'reloading': self.reloading,
+            'last_error': self.last_error
+        }
+    
+    def _start(self, number, background):
+        """Run _reload(number) in this thread or a new one; the caller has set `reloading`"""
+        if not background:
+            self._reload(number)
+            return True
+        threading.Thread(target=self._reload, args=(number,), name='taxonomy-reload', daemon=True).start()
+        return True
+    
+    def _reload(self, number):
+        """Compile version `number` and swap it in; on failure the active version stays"""
+        try:
+            version = self._build(number)
+            previous, self._active = self._active, version
+            self.last_error = None
+            print(f"Skill taxonomy version {version.number} active in {version.build_seconds * 1000:.1f} ms "
+                  f"(replaces version {previous.number})")
+            for listener in self._listeners:
+                listener(version, previous)
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"Taxonomy reload failed, keeping version {self._active.number}: {str(e)}")
+        finally:
+            self.reloading = False
+    
+    def _poll_marker(self):
+        """Start building the marker's version if another worker reloaded past this one's"""
+        if not self.marker_path or time.monotonic() - self._polled_at < self.poll_seconds:
+            return
+        self._polled_at = time.monotonic()
+        mtime, marker_version = self._read_marker()
+        if mtime == self._marker_mtime:
+            return
+        with self._lock:
+            if self.reloading:
+                # Looked at again on a later request, once the running build is done
+                return
+            self._marker_mtime = mtime
+            if marker_version <= self.requested:
+                return
+            self.reloading = True
+            self.requested = marker_version
+        self._start(marker_version, background=True)
+    
+    def _read_marker(self):
+        """(modification time in ns, version) of the reload marker; (None, 0) if there is none"""
+        if not self.marker_path:
+            return None, 0
+        try:
+            mtime = os.stat(self.marker_path).st_mtime_ns
+            with open(self.marker_path, encoding='utf-8') as handle:
+                return mtime, int(json.load(handle)['version'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None, 0
+    
+    def _write_marker(self, number):
+        """Atomically record the version every worker should build"""
+        if not self.marker_path:
+            return
+        directory, name = os.path.split(os.path.abspath(self.marker_path))
+        os.makedirs(directory, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(prefix=f'{name}.', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(handle, 'w', encoding='utf-8') as marker:
+                json.dump({'version': number, 'requested_at': datetime.utcnow().isoformat()}, marker)
+            os.replace(temp_path, self.marker_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self._marker_mtime = os.stat(self.marker_path).st_mtime_ns
+    
+    def _build(self, number):
+        """Compile a version from the configured sources"""
+        start = time.perf_counter()
+        skill_db, source = self._load_skill_db()
+        skill_graph = SkillGraph(load_skill_graph_file(Config.SKILL_GRAPH_PATH)) if Config.SKILL_GRAPH_PATH else None
+        taxonomy = CompiledTaxonomy.load_or_build(Config.TAXONOMY_ARTIFACT_PATH, skill_db, self._load_views(),
+                                                  skill_graph)
+        return TaxonomyVersion(number, taxonomy, source, time.perf_counter() - start, self.extractor_options)
+    
+    def _load_skill_db(self):
+        """(SkillDatabase, source description) from TAXONOMY_SOURCE_PATH, TAXONOMY_TABLE_PATH or the built-in data"""
+        if Config.TAXONOMY_SOURCE_PATH:
+            skills_data = load_taxonomy_file(Config.TAXONOMY_SOURCE_PATH)
+            # Named after the content, so a table an older version still maps is never overwritten
+            table_path = f'{os.path.splitext(Config.TAXONOMY_SOURCE_PATH)[0]}.{taxonomy_fingerprint(skills_data)[:16]}.table'
+            if not os.path.exists(table_path):
+                SkillTable.compile(skills_data, table_path)
+            return SkillDatabase.from_table(table_path), Config.TAXONOMY_SOURCE_PATH
+        if Config.TAXONOMY_TABLE_PATH:
+            return SkillDatabase.from_table(Config.TAXONOMY_TABLE_PATH), Config.TAXONOMY_TABLE_PATH
+        return SkillDatabase(), 'built-in'
+    
+    def _load_views(self):
+        """Registry views, with the service category keyword lists from SKILL_CATEGORIES_PATH (JSON) if set"""
+        if not Config.SKILL_CATEGORIES_PATH:
+            return DEFAULT_SKILL_VIEWS
+        with open(Config.SKILL_CATEGORIES_PATH, encoding='utf-8') as handle:
+            categories = json.load(handle)
+        return dict(DEFAULT_SKILL_VIEWS, service_categories={
+            str(category): [str(keyword).lower() for keyword in keywords]
+            for category, keywords in categories.items()
+        })
@@ -0,0 +1,394 @@
+"""
+Micro-benchmarks for the rule-based skill engine in custom_ai.py
+
+Usage: python benchmarks.py [name ...]   (runs every benchmark when no name is given)
+"""
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from custom_ai import (DEFAULT_SKILL_VIEWS, CompiledTaxonomy, CustomSkillExtractor, Document, ExperienceScanner,
+                       IncrementalExtraction, ProximityScorer, SkillDatabase, SkillTable, np, popcount)
+
+MB = 1024 * 1024
+
+def _timed(func: Callable, *args, **kwargs) -> float:
+    """Run func once and return elapsed wall time in seconds"""
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+def _deep_size(obj, seen: set) -> int:
+    """sys.getsizeof of obj and everything it references, skipping objects already in seen"""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(key, seen) + _deep_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(_deep_size(item, seen) for item in obj)
+    elif hasattr(obj, '__slots__'):
+        size += sum(_deep_size(getattr(obj, name), seen) for name in obj.__slots__ if hasattr(obj, name))
+    return size
+
+def _legacy_has_context(skill: str, text: str) -> bool:
+    """The context check CustomSkillExtractor used before ProximityScorer"""
+    context_patterns = [
+        f'{re.escape(skill)}.*experience',
+        f'experience.*{re.escape(skill)}',
+        f'{re.escape(skill)}.*years?',
+        f'proficient.*{re.escape(skill)}',
+        f'expert.*{re.escape(skill)}',
+    ]
+    return any(re.search(pattern, text) for pattern in context_patterns)
+
+def _legacy_extract_experience(text: str):
+    """The two findall passes CustomSkillExtractor used before ExperienceScanner"""
+    years_matches = re.findall(r'(\d+)[\+\s]*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)', text.lower())
+    total_years = max([int(match) for match in years_matches]) if years_matches else 0
+    skill_years = re.findall(r'(\w+(?:\.\w+)*)\s*[:-]\s*(\d+)[\+\s]*(?:years?|yrs?)', text.lower())
+    return total_years, {skill: int(years) for skill, years in skill_years}
+
+def _legacy_find_skill_category(skill_db: SkillDatabase, skill: str) -> str:
+    """SkillDatabase.find_skill_category before the synonym index"""
+    skill_lower = skill.lower()
+    for category_name, category_skills in skill_db.skills_data.items():
+        for main_skill, synonyms in category_skills.items():
+            if skill_lower in [s.lower() for s in synonyms]:
+                return category_name
+    return "other"
+
+def _legacy_skill_overlap(resume_analysis, job_analysis):
+    """Set statistics of CustomJobMatcher.calculate_match_score before the skill bitsets"""
+    resume_skills = set(resume_analysis.skills)
+    job_skills = set(job_analysis.skills)
+    intersection = resume_skills & job_skills
+    union = resume_skills | job_skills
+    resume_categories = resume_analysis.categories
+    job_categories = job_analysis.categories
+    return (len(intersection) / len(union) if union else 0,
+            len(intersection) / len(resume_skills) if resume_skills else 0,
+            len(intersection) / len(job_skills) if job_skills else 0,
+            sum(1 for category in job_categories if category in resume_categories) / len(job_categories)
+            if job_categories else 1.0,
+            list(intersection), list(job_skills - resume_skills), list(resume_skills - job_skills))
+
+def _legacy_view_terms(text_lower: str):
+    """Service category keywords and common skills in a job text, by the substring loops used before the registry"""
+    keywords = {keyword.title() for keywords in DEFAULT_SKILL_VIEWS['service_categories'].values()
+                for keyword in keywords if keyword in text_lower}
+    common = [skill for skill in DEFAULT_SKILL_VIEWS['common_skills']['common'] if skill.lower() in text_lower]
+    return keywords, common
+
+def _legacy_similarity_map(skill_db: SkillDatabase):
+    """The hard-coded weak-match edges CustomJobMatcher used before the skill graph"""
+    similarity_map = {}
+    for main_skill in ('tensorflow', 'pytorch', 'scikit-learn'):
+        similarity_map[main_skill] = [('deep_learning', 0.3), ('machine_learning', 0.4)]
+    for main_skill in ('pandas', 'numpy'):
+        similarity_map[main_skill] = [('data_analysis', 0.5)]
+    for synonym in skill_db.skills_data['data_science']['python_data']:
+        similarity_map.setdefault(synonym, []).extend([('data_analysis', 0.6), ('data_visualization', 0.6)])
+    return similarity_map
+
+def _legacy_weak_matches(skill_db: SkillDatabase, similarity_map, resume_skills, job_skills):
+    """Weak matches resolved by nested loops over job skills and data_science synonym lists"""
+    matches = []
+    data_science = skill_db.skills_data.get('data_science', {})
+    for r_skill in resume_skills - job_skills:
+        for target, score in similarity_map.get(r_skill, ()):
+            for js in job_skills - resume_skills:
+                if js == target or js in data_science.get(target, ()):
+                    matches.append((r_skill, js, score))
+                    break
+    return matches
+
+def _table_weak_matches(skill_db: SkillDatabase, similarity_table, resume_analysis, job_analysis):
+    """The same with the similarity table bitsets and probes _build_comparison_view uses"""
+    matches = []
+    resume_bits = resume_analysis.skill_bits
+    job_bits = job_analysis.skill_bits
+    for r_skill in skill_db.skills_from_bits(resume_bits & ~job_bits & similarity_table.sources):
+        related_bits = similarity_table.targets.get(r_skill, 0) & job_bits & ~resume_bits
+        if related_bits:
+            similarities = similarity_table.pairs[r_skill]
+            targets = set()
+            for js in skill_db.skills_from_bits(related_bits):
+                similarity = similarities[js]
+                if similarity[1] not in targets:
+                    targets.add(similarity[1])
+                    matches.append((r_skill, js, similarity[0]))
+    return matches
+
+def _bitset_skill_overlap(skill_db, resume_analysis, job_analysis):
+    """The same statistics with the popcounts calculate_match_score uses"""
+    resume_bits = resume_analysis.skill_bits
+    job_bits = job_analysis.skill_bits
+    common = popcount(resume_bits & job_bits)
+    union = popcount(resume_bits | job_bits)
+    return (common / union if union else 0,
+            common / popcount(resume_bits) if resume_bits else 0,
+            common / popcount(job_bits) if job_bits else 0,
+            popcount(resume_analysis.category_bits & job_analysis.category_bits)
+            / popcount(job_analysis.category_bits) if job_analysis.category_bits else 1.0,
+            skill_db.skills_from_bits(resume_bits & job_bits), skill_db.skills_from_bits(job_bits & ~resume_bits),
+            skill_db.skills_from_bits(resume_bits & ~job_bits))
+
+def bench_proximity(max_size: int = 16 * MB, legacy_limit: int = 256 * 1024):
+    """Worst case for the `.*` regexes: one long line of skill mentions with the cue words on another line"""
+    extractor = CustomSkillExtractor()
+    scorer = ProximityScorer()
+    unit = 'python developer '
+    cue_line = '\nexperience, expert, proficient'
+    
+    print(f"{'input':>10} {'legacy':>10} {'proximity':>10} {'full scan':>10}")
+    size = 64 * 1024
+    while size <= max_size:
+        text = unit * (size // len(unit)) + cue_line
+        line_breaks = [len(text) - len(cue_line)]
+        skill_hits, cue_positions = extractor._scan_text(Document(text))
+        hits = skill_hits['python']
+        
+        legacy = _timed(_legacy_has_context, 'python', text) if size <= legacy_limit else None
+        proximity = _timed(scorer.has_context, hits, cue_positions, line_breaks)
+        # A fresh Document each time, since scans are memoized per document
+        full_scan = _timed(lambda: extractor._scan_text(Document(text)))
+        
+        legacy_label = f'{legacy:.3f}s' if legacy is not None else 'skipped'
+        print(f'{size // 1024:>8}KB {legacy_label:>10} {proximity:>9.3f}s {full_scan:>9.3f}s')
+        size *= 4
+
+def bench_batch(documents: int = 400, chunksize: int = 4):
+    """Throughput of extract_skills_batch as the worker count grows"""
+    extractor = CustomSkillExtractor()
+    resume = ('Senior Python developer with 8 years of experience in Django, Flask and AWS.\n'
+              'Expert in Kubernetes, Docker and PostgreSQL; proficient with React and TypeScript.\n') * 40
+    texts = [f'{resume}Candidate {index}' for index in range(documents)]
+    
+    serial = _timed(lambda: list(extractor.extract_skills_batch(texts, workers=1)))
+    print(f"{'workers':>8} {'seconds':>9} {'docs/s':>9} {'speedup':>8}")
+    print(f"{'serial':>8} {serial:>8.2f}s {documents / serial:>9.1f} {1.0:>7.2f}x")
+    workers = 2
+    while workers <= max(os.cpu_count() or 1, 2):
+        elapsed = _timed(lambda: list(extractor.extract_skills_batch(texts, workers=workers, chunksize=chunksize)))
+        print(f'{workers:>8} {elapsed:>8.2f}s {documents / elapsed:>9.1f} {serial / elapsed:>7.2f}x')
+        workers *= 2
+
+def bench_scoring(skill_counts: List[int] = (1000, 10000), repeats: int = 5):
+    """Per-skill confidence loop against the NumPy batch scorer on synthetic taxonomies"""
+    print(f"{'skills':>8} {'hits':>8} {'scalar':>10} {'vectorized':>11} {'speedup':>8}")
+    for count in skill_counts:
+        names = [f'skill{index:05d}' for index in range(count)]
+        taxonomy = CompiledTaxonomy.build(SkillDatabase({'synthetic': {name: [name] for name in names}}))
+        extractor = CustomSkillExtractor(taxonomy=taxonomy)
+        lines = [f'{name} with 3 years experience, expert in {name}x and {name}' for name in names]
+        document = Document('\n'.join(lines))
+        skill_hits, cue_positions = extractor._scan_text(document)
+        hit_count = sum(len(hits) for hits in skill_hits.values())
+        
+        extractor.VECTORIZE_MIN_CANDIDATES = float('inf')
+        scalar = min(_timed(extractor._score_candidates, skill_hits, cue_positions, document.line_breaks)
+                     for _ in range(repeats))
+        if np is None:
+            print(f'{count:>8} {hit_count:>8} {scalar:>9.4f}s {"no numpy":>11}')
+            continue
+        extractor.VECTORIZE_MIN_CANDIDATES = 0
+        vectorized = min(_timed(extractor._score_candidates, skill_hits, cue_positions, document.line_breaks)
+                         for _ in range(repeats))
+        print(f'{count:>8} {hit_count:>8} {scalar:>9.4f}s {vectorized:>10.4f}s {scalar / vectorized:>7.1f}x')
+
+def bench_experience(sizes: List[int] = (64 * 1024, 1 * MB, 8 * MB)):
+    """Legacy experience regexes against the single-pass ExperienceScanner (which also parses date ranges)"""
+    section = ('Senior Engineer, Acme Corp, Jan 2018 - Present\n'
+               'Built data pipelines in Python: 5 years; 8+ years of experience with SQL - 6 yrs.\n'
+               'Software Developer, Initech, 03/2014 - 12/2017. Maintained billing services and reports.\n')
+    print(f"{'input':>10} {'legacy':>9} {'scanner':>9} {'speedup':>8}")
+    for size in sizes:
+        text = section * (size // len(section))
+        lower = text.lower()
+        legacy = _timed(_legacy_extract_experience, text)
+        scanner = _timed(lambda: ExperienceScanner().scan(lower))
+        print(f'{size // 1024:>8}KB {legacy:>8.3f}s {scanner:>8.3f}s {legacy / scanner:>7.2f}x')
+
+def bench_incremental(sizes: List[int] = (16 * 1024, 128 * 1024, 1 * MB), repeats: int = 5):
+    """Full re-extraction against IncrementalExtraction after a one-line edit to a resume"""
+    extractor = CustomSkillExtractor()
+    section = ('Senior Engineer, Acme Corp, Jan 2018 - Present\n'
+               'Built data pipelines in Python and Spark; expert in Kubernetes and Docker.\n'
+               'Led a team of 5 with 8+ years of experience in SQL, AWS and React.\n')
+    print(f"{'input':>10} {'full':>9} {'incremental':>12} {'rescanned':>10} {'speedup':>8}")
+    for size in sizes:
+        text = section * (size // len(section))
+        middle = text.index('\n', len(text) // 2) + 1
+        revisions = [text[:middle] + f'Certified in Terraform and Go, revision {index}\n' + text[middle:]
+                     for index in range(repeats)]
+        full = min(_timed(extractor._extract_document, Document(revision)) for revision in revisions)
+        session = IncrementalExtraction(extractor)
+        session.extract(text)
+        incremental = min(_timed(session.extract, revision) for revision in revisions)
+        print(f'{size // 1024:>8}KB {full:>8.3f}s {incremental:>11.4f}s {session.rescanned:>10} '
+              f'{full / incremental:>7.1f}x')
+
+def bench_memory(sizes: List[int] = (4 * 1024, 32 * 1024, 256 * 1024)):
+    """Retained size of an ExtractionResult against the dict result, and of their cache entries
+    
+    Skill and category names belong to the taxonomy and the text to the caller, so neither is counted.
+    """
+    extractor = CustomSkillExtractor()
+    shared = {id(name) for name in extractor.all_skills} | {id(name) for name in extractor.skill_db.skills_data}
+    lines = [f'{skill} developer with 3 years of experience; expert in {skill} and related tooling.\n'
+             for skill in sorted(extractor.all_skills)]
+    print(f"{'input':>10} {'skills':>7} {'dict':>10} {'compact':>10} {'saved':>6} {'cache dict':>11} {'cache rec':>10}")
+    for size in sizes:
+        text = ''
+        while len(text) < size:
+            text += ''.join(lines)[:size - len(text)]
+        result = extractor.extract(Document(text))
+        as_dict = result.to_dict()
+        dict_size = _deep_size(as_dict, set(shared))
+        compact_size = _deep_size(result, set(shared) | {id(result.text)})
+        dict_json = len(json.dumps(as_dict))
+        record_json = len(json.dumps(result.to_record()))
+        print(f'{size // 1024:>8}KB {result.total_skills:>7} {dict_size / 1024:>8.1f}KB {compact_size / 1024:>8.1f}KB '
+              f'{1 - compact_size / dict_size:>5.0%} {dict_json / 1024:>9.1f}KB {record_json / 1024:>8.1f}KB')
+
+def bench_structured(profiles: List[int] = (10, 40, 160), repeats: int = 5):
+    """Flattening a JSON Resume to text and extracting it, against extract_structured on the payload"""
+    extractor = CustomSkillExtractor()
+    skills = sorted(extractor.all_skills)
+    print(f"{'entries':>8} {'flattened':>10} {'structured':>11} {'speedup':>8}")
+    for count in profiles:
+        payload = {
+            'basics': {'summary': 'Backend engineer with 8 years of experience building data platforms.'},
+            'work': [{'name': f'Company {index}', 'position': 'Engineer', 'startDate': f'{2000 + index % 20}-01',
+                      'endDate': f'{2001 + index % 20}-06', 'summary': 'Built services and led migrations.',
+                      'highlights': ['Cut latency by 40%', 'Mentored four engineers']} for index in range(count)],
+            'skills': [{'name': skills[index % len(skills)].title(), 'level': 'Advanced',
+                        'keywords': [skills[(index * 7) % len(skills)]]} for index in range(count)]
+        }
+        flattened = json.dumps(payload, indent=1)
+        full = min(_timed(extractor._extract_document, Document(flattened)) for _ in range(repeats))
+        structured = min(_timed(extractor.extract_structured, payload) for _ in range(repeats))
+        print(f'{count:>8} {full:>9.4f}s {structured:>10.4f}s {full / structured:>7.1f}x')
+
+def bench_categories(repeats: int = 20):
+    """Category lookup of every synonym: nested scan against the synonym index"""
+    skill_db = SkillDatabase()
+    synonyms = sorted(skill_db.synonym_index) + ['not-a-skill']
+    legacy = min(_timed(lambda: [_legacy_find_skill_category(skill_db, skill) for skill in synonyms])
+                 for _ in range(repeats))
+    indexed = min(_timed(lambda: [skill_db.find_skill_category(skill) for skill in synonyms]) for _ in range(repeats))
+    print(f"{'lookups':>8} {'legacy':>10} {'indexed':>10} {'speedup':>8}")
+    print(f'{len(synonyms):>8} {legacy * 1e6 / len(synonyms):>8.2f}us {indexed * 1e6 / len(synonyms):>8.2f}us '
+          f'{legacy / indexed:>7.1f}x')
+
+def bench_overlap(pairs: int = 2000, repeats: int = 5):
+    """Skill-overlap statistics of extracted resume/job pairs: set operations against bitset popcounts"""
+    extractor = CustomSkillExtractor()
+    skills = sorted(extractor.all_skills)
+    rng = random.Random(7)
+    analyses = [extractor.extract(Document('\n'.join(f'{skill} experience' for skill in rng.sample(skills, 40))))
+                for _ in range(50)]
+    pairs = [(rng.choice(analyses), rng.choice(analyses)) for _ in range(pairs)]
+    legacy = min(_timed(lambda: [_legacy_skill_overlap(resume, job) for resume, job in pairs])
+                 for _ in range(repeats))
+    bitset = min(_timed(lambda: [_bitset_skill_overlap(extractor.skill_db, resume, job) for resume, job in pairs])
+                 for _ in range(repeats))
+    print(f"{'pairs':>8} {'sets':>10} {'bitsets':>10} {'speedup':>8}")
+    print(f'{len(pairs):>8} {legacy * 1e6 / len(pairs):>8.2f}us {bitset * 1e6 / len(pairs):>8.2f}us '
+          f'{legacy / bitset:>7.1f}x')
+
+def bench_views(sizes: List[int] = (4 * 1024, 32 * 1024, 256 * 1024), repeats: int = 5):
+    """Extraction plus both keyword views of a job text: substring loops after the scan against the one registry scan"""
+    extractor = CustomSkillExtractor()
+    taxonomy = extractor.taxonomy
+    words = sorted(extractor.all_skills) + ['team', 'delivery', 'services', 'platform', 'ownership']
+    rng = random.Random(5)
+    
+    def legacy(text):
+        document = Document(text)
+        extractor._scan_text(document)
+        return _legacy_view_terms(document.lower)
+    
+    def registry(text):
+        document = Document(text)
+        extractor._scan_text(document)
+        return (taxonomy.matching_terms('service_categories', document),
+                taxonomy.matching_terms('common_skills', document))
+    
+    print(f"{'size':>8} {'loops':>10} {'registry':>10} {'speedup':>8}")
+    for size in sizes:
+        text = ''
+        while len(text) < size:
+            text += ' '.join(rng.choice(words) for _ in range(12)) + '.\n'
+        loops = min(_timed(legacy, text) for _ in range(repeats))
+        single = min(_timed(registry, text) for _ in range(repeats))
+        print(f'{size // 1024:>6}KB {loops * 1000:>8.2f}ms {single * 1000:>8.2f}ms {loops / single:>7.1f}x')
+
+def bench_weak(pairs: int = 2000, repeats: int = 5):
+    """Weak-match resolution of resume/job pairs: nested synonym-list loops against similarity table probes"""
+    extractor = CustomSkillExtractor()
+    skill_db = extractor.skill_db
+    similarity_map = _legacy_similarity_map(skill_db)
+    skills = sorted(extractor.all_skills)
+    rng = random.Random(3)
+    analyses = [extractor.extract(Document('\n'.join(f'{skill} experience' for skill in rng.sample(skills, 40))))
+                for _ in range(50)]
+    pairs = [(rng.choice(analyses), rng.choice(analyses)) for _ in range(pairs)]
+    legacy = min(_timed(lambda: [_legacy_weak_matches(skill_db, similarity_map, set(resume.skills), set(job.skills))
+                                 for resume, job in pairs]) for _ in range(repeats))
+    table = min(_timed(lambda: [_table_weak_matches(skill_db, extractor.taxonomy.similarity_table, resume, job)
+                                for resume, job in pairs]) for _ in range(repeats))
+    print(f"{'pairs':>8} {'loops':>10} {'table':>10} {'speedup':>8}")
+    print(f'{len(pairs):>8} {legacy * 1e6 / len(pairs):>8.2f}us {table * 1e6 / len(pairs):>8.2f}us '
+          f'{legacy / table:>7.1f}x')
+
+def bench_table(sizes: List[int] = (10000, 100000), lookups: int = 20000):
+    """Startup and lookup cost of a synthetic taxonomy held as dicts against a memory-mapped SkillTable"""
+    rng = random.Random(11)
+    print(f"{'synonyms':>9} {'file':>9} {'dict init':>10} {'table open':>11} {'dict get':>9} {'table get':>10}")
+    for size in sizes:
+        skills_data = {f'category{index}': {} for index in range(50)}
+        for index in range(size // 2):
+            skills_data[f'category{index % 50}'][f'skill {index}'] = [f'skill {index}', f'sk{index}x']
+        keys = [f'sk{rng.randrange(size)}x' for _ in range(lookups)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'skills.table')
+            file_size = SkillTable.compile(skills_data, path)
+            dict_init = _timed(SkillDatabase, skills_data)
+            table_open = _timed(SkillDatabase.from_table, path)
+            dict_db = SkillDatabase(skills_data)
+            table_db = SkillDatabase.from_table(path)
+            dict_get = _timed(lambda: [dict_db.find_skill_category(key) for key in keys])
+            table_get = _timed(lambda: [table_db.find_skill_category(key) for key in keys])
+        print(f'{size:>9} {file_size / MB:>7.1f}MB {dict_init * 1000:>8.1f}ms {table_open * 1000:>9.2f}ms '
+              f'{dict_get * 1e6 / lookups:>7.2f}us {table_get * 1e6 / lookups:>8.2f}us')
+
+BENCHMARKS: Dict[str, Callable] = {
+    'proximity': bench_proximity,
+    'batch': bench_batch,
+    'scoring': bench_scoring,
+    'experience': bench_experience,
+    'incremental': bench_incremental,
+    'memory': bench_memory,
+    'structured': bench_structured,
+    'categories': bench_categories,
+    'overlap': bench_overlap,
+    'table': bench_table,
+    'views': bench_views,
+    'weak': bench_weak,
+}
+
+def main(names: List[str]):
+    for name in names or BENCHMARKS:
+        print(f'== {name} ==')
+        BENCHMARKS[name]()
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
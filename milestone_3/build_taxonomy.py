@@ -0,0 +1,46 @@
+"""
+Compile the skill taxonomy into a versioned artifact that services load at startup
+
+Usage: python build_taxonomy.py [output] [--source taxonomy.json|taxonomy.csv] [--table skills.table]
+                                [--graph skill_graph.json|skill_graph.csv]
+Point TAXONOMY_ARTIFACT_PATH at the output to have the backend load it instead of compiling.
+With --source, the external taxonomy is first compiled into a memory-mapped skill table
+(next to the source unless --table is given); point TAXONOMY_TABLE_PATH at that table as well.
+With --graph, weak matches use that skill graph; point SKILL_GRAPH_PATH at it as well.
+"""
+import argparse
+import os
+import time
+
+from custom_ai import CompiledTaxonomy, SkillDatabase, SkillGraph, SkillTable, load_skill_graph_file, load_taxonomy_file
+
+def main(output: str, source: str = None, table_path: str = None, graph: str = None):
+    skill_db = None
+    if source:
+        start = time.perf_counter()
+        skills_data = load_taxonomy_file(source)
+        table_path = table_path or os.path.splitext(source)[0] + '.table'
+        size = SkillTable.compile(skills_data, table_path)
+        print(f"Compiled {source} into {table_path} ({size / 1024:.1f} KB) in {time.perf_counter() - start:.2f} s")
+        skill_db = SkillDatabase.from_table(table_path)
+    
+    skill_graph = SkillGraph(load_skill_graph_file(graph)) if graph else None
+    taxonomy = CompiledTaxonomy.build(skill_db, skill_graph=skill_graph)
+    size = taxonomy.save(output)
+    print(f"Compiled {len(taxonomy.all_skills)} synonyms in {taxonomy.startup_seconds * 1000:.1f} ms")
+    print(f"Skill graph: {len(taxonomy.skill_graph.edges)} edges, "
+          f"{sum(len(row) for row in taxonomy.similarity_table.pairs.values())} weak-match pairs")
+    print(f"Wrote {output} ({size / 1024:.1f} KB, fingerprint {taxonomy.fingerprint[:16]})")
+    
+    loaded = CompiledTaxonomy.load(output)
+    print(f"Cold start from artifact: {loaded.startup_seconds * 1000:.1f} ms")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compile the skill taxonomy')
+    parser.add_argument('output', nargs='?',
+                        default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'compiled_taxonomy.pkl'))
+    parser.add_argument('--source', help='external taxonomy (JSON or CSV) to use instead of the built-in one')
+    parser.add_argument('--table', help='where to write the skill table compiled from --source')
+    parser.add_argument('--graph', help='skill relationship graph (JSON or CSV) to use instead of the built-in one')
+    args = parser.parse_args()
+    main(args.output, args.source, args.table, args.graph)
@@ -0,0 +1,193 @@
+"""
+Regression check for rule-based extraction against the recorded corpus in extraction_corpus.json
+
+Every document of the corpus is extracted along each path the extractor offers, and each result
+must equal the extract_skills_from_text output recorded for it:
+    scalar       confidence scoring one skill at a time
+    vectorized   the NumPy scoring pass (skipped when NumPy is not installed)
+    streaming    extract_skills_streaming at several chunk sizes (no fuzzy_matches or spans)
+    sectioned    section-scoped extraction, scanning only the sections and re-querying a scanned Document
+    incremental  IncrementalExtraction through a series of recorded edits
+
+The corpus avoids open-ended date ranges ("- present"), whose length depends on the current date.
+
+Usage: python check_extraction.py            (exits 1 on any mismatch)
+       python check_extraction.py --record   (rewrites the corpus from the scalar path)
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+from custom_ai import CustomSkillExtractor, Document, IncrementalExtraction, SkillDatabase, np
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'extraction_corpus.json')
+CHUNK_SIZES = (1, 7, 64, 4096)
+SECTION_SELECTIONS = (['skills'], ['experience'], ['experience', 'skills'])
+EDITS_PER_DOCUMENT = 4
+FILLER = ('the a and with using team built designed led senior engineer years experience expert proficient '
+          'developer worked on data platform services results maintain api tools technologies languages: '
+          '5+ years of experience Python: 4 years java-3 yrs experienced pyton javscript kubernets dockr').split()
+HEADINGS = ['Skills', '## Technical Skills', 'EXPERIENCE:', 'Work Experience', 'Education', 'Projects',
+            'Skills: docker, aws, c++', 'Summary']
+EXTRA_LINES = ['Python developer with 5 years experience', 'expert in kubernetes', '', 'Skills: docker, aws, c++',
+               'Acme Corp, Jan 2018 - Mar 2021', '03/2015 to 2017', 'proficient react', 'kubernets and pyton',
+               'Handled 1000 to 5000 requests per second', 'Reduced costs from 2000 - 2024 dollars']
+HANDWRITTEN = [
+    "Senior Python developer with 8 years of experience in Django, Flask, React and AWS. Expert in C++ and C#.\n"
+    "Proficient in Kubernetes, docker-compose, CI/CD.",
+    "",
+    "go go good",
+    "Experience:\nJava - 5 years\nSpring Boot microservices; .NET, ASP.NET core",
+    "R programming and rstudio; ML/AI; NLP",
+    "Summary\nData engineer.\nSkills: Python, SQL, Spark, Airflow\nExperience\nAcme 2016 - 2019, Globex 03/2019 to 2021\n"
+    "Education\nBSc Computer Science",
+]
+
+def _generated_text(rng, synonyms, words):
+    """Synonyms (some upper-cased or clipped), filler and section headings, in lines of varying length"""
+    parts = []
+    for _ in range(words):
+        roll = rng.random()
+        if roll < 0.25:
+            word = rng.choice(synonyms)
+        elif roll < 0.3:
+            word = rng.choice(synonyms).upper()
+        elif roll < 0.35:
+            word = rng.choice(synonyms)
+            word = word[:-1] if len(word) > 4 else word
+        elif roll < 0.38:
+            word = '\n' + rng.choice(HEADINGS) + '\n'
+        else:
+            word = rng.choice(FILLER)
+        parts.append(word)
+        roll = rng.random()
+        parts.append('\n' if roll < 0.08 else ', ' if roll < 0.15 else '. ' if roll < 0.2 else ' ')
+    return ''.join(parts)
+
+def _edited(rng, text):
+    """The text after one to four line insertions, deletions, word insertions or character edits"""
+    lines = text.split('\n')
+    for _ in range(rng.randint(1, 4)):
+        roll, index = rng.random(), rng.randint(0, len(lines))
+        if roll < 0.3 or not lines:
+            lines.insert(index, rng.choice(EXTRA_LINES))
+        elif roll < 0.5:
+            del lines[min(index, len(lines) - 1)]
+        elif roll < 0.8:
+            line = min(index, len(lines) - 1)
+            words = lines[line].split(' ')
+            words.insert(rng.randint(0, len(words)), rng.choice(FILLER + EXTRA_LINES))
+            lines[line] = ' '.join(words)
+        else:
+            line = min(index, len(lines) - 1)
+            cut = rng.randint(0, len(lines[line]))
+            lines[line] = lines[line][:cut] + rng.choice(['\n', ' ', 'x', 'Python ', '']) + lines[line][cut:]
+    return '\n'.join(lines)
+
+def _corpus_texts():
+    """Handwritten resumes plus generated ones of 5 to 300 words, each with a series of edits"""
+    rng = random.Random(11)
+    synonyms = sorted(SkillDatabase().get_all_skills())
+    texts = HANDWRITTEN + [_generated_text(rng, synonyms, words) for words in (5, 20, 60, 150, 300) * 2]
+    cases = []
+    for text in texts:
+        edits = [text]
+        for _ in range(EDITS_PER_DOCUMENT):
+            edits.append(_edited(rng, edits[-1]))
+        cases.append((text, edits[1:]))
+    return cases
+
+def _plain(result):
+    """A result as the JSON the corpus stores it in"""
+    return json.loads(json.dumps(result))
+
+def _streamed(result):
+    """What extract_skills_streaming reports for a recorded result"""
+    expected = {key: value for key, value in result.items() if key != 'fuzzy_matches'}
+    expected['skills'] = {skill: {key: value for key, value in info.items() if key != 'spans'}
+                          for skill, info in result['skills'].items()}
+    return expected
+
+def _scalar_extractor():
+    """An extractor that never takes the NumPy scoring pass"""
+    extractor = CustomSkillExtractor()
+    extractor.VECTORIZE_MIN_CANDIDATES = float('inf')
+    return extractor
+
+def record():
+    """Write the corpus with the scalar path's answers"""
+    extractor = _scalar_extractor()
+    cases = []
+    for text, edits in _corpus_texts():
+        cases.append({
+            'text': text,
+            'result': _plain(extractor.extract_skills_from_text(text)),
+            'sections': {','.join(selection): _plain(extractor.extract_skills_from_text(text, selection))
+                         for selection in SECTION_SELECTIONS},
+            'edits': [{'text': edit, 'result': _plain(extractor.extract_skills_from_text(edit))} for edit in edits]
+        })
+    with open(CORPUS_PATH, 'w', encoding='utf-8') as handle:
+        # One case per line keeps diffs of a re-recorded corpus readable
+        handle.write('{"cases": [\n')
+        handle.write(',\n'.join(json.dumps(case) for case in cases))
+        handle.write('\n]}\n')
+    print(f"Recorded {len(cases)} documents to {CORPUS_PATH}")
+
+def check():
+    """Compare every extraction path with the recorded results; returns the number of mismatches"""
+    with open(CORPUS_PATH, encoding='utf-8') as handle:
+        corpus = json.load(handle)
+    scalar = _scalar_extractor()
+    vectorized = CustomSkillExtractor(taxonomy=scalar.taxonomy)
+    vectorized.VECTORIZE_MIN_CANDIDATES = 0
+    mismatches = 0
+    checked = dict.fromkeys(('scalar', 'vectorized', 'streaming', 'sectioned', 'incremental'), 0)
+    
+    def compare(path, number, label, expected, actual):
+        nonlocal mismatches
+        checked[path] += 1
+        if _plain(actual) != expected:
+            mismatches += 1
+            print(f"document {number} {path} {label}: differs from the recorded result")
+    
+    for number, case in enumerate(corpus['cases']):
+        text, expected = case['text'], case['result']
+        compare('scalar', number, '', expected, scalar.extract_skills_from_text(text))
+        if np is not None:
+            compare('vectorized', number, '', expected, vectorized.extract_skills_from_text(text))
+        for size in CHUNK_SIZES:
+            chunks = [text[start:start + size] for start in range(0, len(text), size)]
+            compare('streaming', number, f'chunks of {size}', _streamed(expected),
+                    scalar.extract_skills_streaming(iter(chunks)))
+        
+        # Scoped scans of a fresh Document, then re-queries of one scanned in full
+        scanned = Document(text)
+        scalar.extract(scanned)
+        for selection, sectioned in case['sections'].items():
+            names = selection.split(',')
+            compare('sectioned', number, f'{selection} scan', sectioned,
+                    scalar.extract_skills_from_text(Document(text), names))
+            compare('sectioned', number, f'{selection} re-query', sectioned,
+                    scalar.extract_skills_from_text(scanned, names))
+        
+        session = IncrementalExtraction(scalar)
+        compare('incremental', number, 'initial', expected, session.extract(text).to_dict())
+        for step, edit in enumerate(case['edits'], 1):
+            compare('incremental', number, f'edit {step}', edit['result'], session.extract(edit['text']).to_dict())
+    
+    if np is None:
+        print("NumPy is not installed, vectorized scoring was not checked")
+    summary = ', '.join(f'{path} {count}' for path, count in checked.items())
+    print(f"{len(corpus['cases'])} documents ({summary} comparisons), {mismatches} mismatches")
+    return mismatches
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Check every extraction path against the recorded corpus')
+    parser.add_argument('--record', action='store_true', help='rewrite the corpus from the scalar path')
+    args = parser.parse_args()
+    if args.record:
+        record()
+    else:
+        sys.exit(1 if check() else 0)
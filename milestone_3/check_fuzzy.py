@@ -0,0 +1,86 @@
+"""
+Regression check for fuzzy skill matching against the recorded corpus in fuzzy_corpus.json
+
+Every token of the corpus is matched three ways: the BK-tree index (FuzzySkillIndex), the
+SequenceMatcher scan over every synonym that fuzzy matching used before the index, and the
+matches recorded in the corpus. Any difference fails the check.
+
+Usage: python check_fuzzy.py            (exits 1 on any mismatch)
+       python check_fuzzy.py --record   (rewrites the corpus from the SequenceMatcher scan)
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from difflib import SequenceMatcher
+
+from custom_ai import FuzzySkillIndex, SkillDatabase
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fuzzy_corpus.json')
+THRESHOLD = 0.8
+# Resume words that resemble no skill, plus misspellings seen in real uploads
+EXTRA_TOKENS = [
+    'experience', 'developer', 'engineer', 'years', 'proficient', 'team', 'built', 'designed', 'services',
+    'platform', 'senior', 'tools', 'technologies', 'languages', 'pyton', 'javscript', 'kubernets', 'dockr',
+    'postgre', 'mongdb', 'typscript', 'djano', 'tensorflo', 'pytorh', 'reactjs', 'nodejs', 'agil', 'scrumm',
+    'leadrship', 'comunication', 'elasticsarch', 'terrafrom', 'jenkin', 'ansibel', 'kafak', 'graphq', 'a', 'go',
+    'c++', 'c#', '.net', 'ml', 'ai', 'x' * 40
+]
+
+def _fuzzy_skills():
+    """The synonyms fuzzy matching considers, as the extractor indexes them"""
+    return sorted({skill.lower() for skill in SkillDatabase().get_all_skills() if len(skill) > 3})
+
+def _legacy_matches(skills, token):
+    """Skills the pre-index scan accepted for a token: SequenceMatcher ratio above THRESHOLD"""
+    return sorted(skill for skill in skills if SequenceMatcher(None, skill, token).ratio() > THRESHOLD)
+
+def _corpus_tokens(skills):
+    """Every synonym with one character dropped, swapped and replaced, plus EXTRA_TOKENS"""
+    rng = random.Random(3)
+    tokens = []
+    for skill in skills:
+        position = rng.randrange(len(skill))
+        tokens.append(skill)
+        tokens.append(skill[:position] + skill[position + 1:])
+        if position < len(skill) - 1:
+            tokens.append(skill[:position] + skill[position + 1] + skill[position] + skill[position + 2:])
+        tokens.append(skill[:position] + rng.choice('aeiostxz') + skill[position + 1:])
+    return list(dict.fromkeys(tokens + EXTRA_TOKENS))
+
+def record(skills):
+    """Write the corpus with the SequenceMatcher scan's answers"""
+    cases = [{'token': token, 'matches': _legacy_matches(skills, token)} for token in _corpus_tokens(skills)]
+    with open(CORPUS_PATH, 'w', encoding='utf-8') as handle:
+        # One case per line keeps diffs of a re-recorded corpus readable
+        handle.write(f'{{"threshold": {THRESHOLD}, "cases": [\n')
+        handle.write(',\n'.join(json.dumps(case) for case in cases))
+        handle.write('\n]}\n')
+    print(f"Recorded {len(cases)} tokens to {CORPUS_PATH}")
+
+def check(skills):
+    """Compare the index and the scan with the recorded matches; returns the number of mismatches"""
+    with open(CORPUS_PATH, encoding='utf-8') as handle:
+        corpus = json.load(handle)
+    index = FuzzySkillIndex(skills)
+    mismatches = 0
+    for case in corpus['cases']:
+        token, expected = case['token'], case['matches']
+        indexed = sorted(index.search(token, corpus['threshold']))
+        scanned = _legacy_matches(skills, token)
+        if indexed != expected or scanned != expected:
+            mismatches += 1
+            print(f"{token!r}: recorded {expected}, index {indexed}, scan {scanned}")
+    matched = sum(1 for case in corpus['cases'] if case['matches'])
+    print(f"{len(corpus['cases'])} tokens ({matched} with matches), {mismatches} mismatches")
+    return mismatches
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Check fuzzy skill matching against the recorded corpus')
+    parser.add_argument('--record', action='store_true', help='rewrite the corpus from the SequenceMatcher scan')
+    args = parser.parse_args()
+    if args.record:
+        record(_fuzzy_skills())
+    else:
+        sys.exit(1 if check(_fuzzy_skills()) else 0)
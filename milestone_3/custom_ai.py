@@ -1,14 +1,749 @@
 import re
 import json
-from typing import Dict, List, Set, Tuple, Any
-from collections import defaultdict, Counter
+from typing import Dict, FrozenSet, List, Set, Tuple, Any, Callable, Iterable, Iterator, Mapping, NamedTuple, Optional, Sequence, Union
+from collections import defaultdict, Counter, deque
 from difflib import SequenceMatcher
+from bisect import bisect_left, bisect_right
+from functools import cached_property
+from contextlib import contextmanager, nullcontext
+from itertools import accumulate, chain
+from array import array
+import codecs
+import csv
+import hashlib
+import heapq
 import math
+import mmap
+import multiprocessing
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+from types import MappingProxyType
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; confidence scoring then runs one skill at a time
+    np = None
+
+# Bump whenever a change to the extraction logic alters results, so cached results are not reused
+EXTRACTION_ENGINE_VERSION = 6
+
+def _is_word_char(char: str) -> bool:
+    """Mirror the word-character class (\\w) used by re for str patterns"""
+    return char.isalnum() or char == '_'
+
+def popcount(bits: int) -> int:
+    """Number of set bits of a non-negative int; int.bit_count() would need Python 3.10"""
+    return bin(bits).count('1')
+
+@contextmanager
+def _replacing(path: Union[str, os.PathLike]) -> Iterator[Any]:
+    """Binary file that atomically replaces `path` once the block completes
+    
+    It is a unique temporary file beside `path`, so processes writing the same path at once never
+    share one, and it is removed if the block fails.
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    handle, temp_path = tempfile.mkstemp(prefix=f'{name}.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(handle, 'wb') as stream:
+            yield stream
+        # mkstemp creates the file private to its owner
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+def _is_word_boundary(text: str, index: int) -> bool:
+    """Check whether a word-boundary assertion would hold at index in text"""
+    before = index > 0 and _is_word_char(text[index - 1])
+    after = index < len(text) and _is_word_char(text[index])
+    return before != after
+
+def _split_names(value: str) -> List[str]:
+    """The non-empty names of a comma-separated list ("Python, SQL")"""
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+def non_overlapping_spans(spans: Iterable[Sequence]) -> Iterator[Sequence]:
+    """Yield the (start, end, ...) spans str.count and re.finditer would report, in start order
+    
+    `spans` must be sorted by start; spans overlapping an already yielded one are skipped.
+    """
+    next_free = 0
+    for span in spans:
+        if span[0] >= next_free:
+            yield span
+            next_free = span[1]
+
+def _bit_positions(bits: int) -> Iterator[int]:
+    """Positions of the set bits of a non-negative int, lowest first"""
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+def _within(ranges: List[Tuple[int, int]], position: int) -> bool:
+    """Check whether position falls inside one of the sorted, disjoint (start, end) ranges"""
+    index = bisect_right(ranges, (position, math.inf)) - 1
+    return index >= 0 and position < ranges[index][1]
+
+# Canonical resume sections and the headings that open them
+SECTION_HEADINGS = {
+    'summary': ('summary', 'professional summary', 'profile', 'objective', 'career objective', 'about me'),
+    'skills': ('skills', 'technical skills', 'key skills', 'core skills', 'core competencies', 'competencies',
+               'technologies', 'tech stack', 'tools'),
+    'experience': ('experience', 'work experience', 'professional experience', 'employment',
+                   'employment history', 'work history', 'career history'),
+    'education': ('education', 'academic background', 'academics', 'qualifications'),
+    'projects': ('projects', 'personal projects', 'academic projects', 'key projects'),
+    'certifications': ('certifications', 'certificates', 'licenses', 'courses', 'training'),
+    'achievements': ('achievements', 'awards', 'honors', 'accomplishments'),
+}
+_SECTION_BY_HEADING = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+# A heading owns its whole line, optionally decorated (`## Skills`, `SKILLS:`) or followed by
+# inline content after a colon (`Skills: Python, SQL`)
+_SECTION_HEADING = re.compile(
+    r'^[ \t]*[#*=\-•]*[ \t]*('
+    + '|'.join(re.escape(heading) for heading in sorted(_SECTION_BY_HEADING, key=len, reverse=True))
+    + r')[ \t]*(?::[^\n]*|[#*=\-]*[ \t\r]*)$',
+    re.MULTILINE
+)
+
+class Document:
+    """Text prepared once for every extraction stage: normalized copy, tokens, lines and sentences"""
+    
+    SENTENCE_END = re.compile(r'[.!?]+(?=\s)|\n')
+    
+    def __init__(self, text: str):
+        self.text = text
+        self.lower = text.lower()
+        # Scanner output per taxonomy, so section-scoped re-queries never rescan the text
+        self.scans: Dict[Any, Any] = {}
+    
+    @cached_property
+    def digest(self) -> str:
+        """SHA-256 of the text, used as a content address"""
+        return hashlib.sha256(self.text.encode('utf-8', 'surrogatepass')).hexdigest()
+    
+    @classmethod
+    def of(cls, text: Union[str, 'Document']) -> 'Document':
+        """Reuse an existing Document or build one from raw text"""
+        return text if isinstance(text, Document) else cls(text)
+    
+    @cached_property
+    def token_offsets(self) -> List[Tuple[int, int]]:
+        """(start, end) offsets of whitespace-delimited tokens in the normalized text"""
+        return [match.span() for match in re.finditer(r'\S+', self.lower)]
+    
+    @cached_property
+    def tokens(self) -> List[str]:
+        """Whitespace-delimited tokens of the normalized text, in the same order as token_offsets"""
+        return self.lower.split()
+    
+    @cached_property
+    def line_breaks(self) -> List[int]:
+        """Sorted positions of newline characters"""
+        return [match.start() for match in re.finditer('\n', self.lower)]
+    
+    @cached_property
+    def sentence_bounds(self) -> List[Tuple[int, int]]:
+        """(start, end) offsets of sentences, split on terminal punctuation and newlines"""
+        bounds = []
+        start = 0
+        for match in self.SENTENCE_END.finditer(self.lower):
+            if match.end() > start:
+                bounds.append((start, match.end()))
+            start = match.end()
+        if start < len(self.lower):
+            bounds.append((start, len(self.lower)))
+        return bounds
+    
+    def sentence_at(self, position: int) -> Tuple[int, int]:
+        """Bounds of the sentence containing position"""
+        bounds = self.sentence_bounds
+        index = bisect_right(bounds, (position, math.inf)) - 1
+        return bounds[max(index, 0)] if bounds else (0, 0)
+    
+    @cached_property
+    def sections(self) -> List[Tuple[str, int, int]]:
+        """(name, start, end) of each resume section, from its heading line up to the next heading
+        
+        Names are SECTION_HEADINGS keys, with 'header' for any text before the first heading.
+        Ends stop before the newline preceding the next heading, so every range is line-aligned.
+        """
+        sections = []
+        name, start = 'header', 0
+        for match in _SECTION_HEADING.finditer(self.lower):
+            if match.start() > start:
+                sections.append((name, start, match.start() - 1))
+            name, start = _SECTION_BY_HEADING[match.group(1)], match.start()
+        if len(self.lower) > start:
+            sections.append((name, start, len(self.lower)))
+        return sections
+    
+    def section_ranges(self, names: Iterable[str]) -> List[Tuple[int, int]]:
+        """Sorted (start, end) ranges of every section with one of the given names"""
+        wanted = set(names)
+        return [(start, end) for name, start, end in self.sections if name in wanted]
+
+def _line_offset(document: Document, line: int) -> int:
+    """Character offset where the given line of the document starts (its length past the last line)"""
+    if line == 0:
+        return 0
+    breaks = document.line_breaks
+    return breaks[line - 1] + 1 if line <= len(breaks) else len(document.lower)
+
+def _changed_line_blocks(old: Document, new: Document) -> List[Tuple[int, int, int, int]]:
+    """(old_start, old_end, new_start, new_end) ranges of the lines that differ between two documents
+    
+    Ranges are line-aligned; common leading and trailing lines are trimmed before diffing the rest,
+    so a local edit costs one pass over the lines plus a diff of the edited ones.
+    """
+    old_lines = old.lower.split('\n')
+    new_lines = new.lower.split('\n')
+    shortest = min(len(old_lines), len(new_lines))
+    prefix = 0
+    while prefix < shortest and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < shortest - prefix and old_lines[-1 - suffix] == new_lines[-1 - suffix]:
+        suffix += 1
+    
+    matcher = SequenceMatcher(None, old_lines[prefix:len(old_lines) - suffix],
+                              new_lines[prefix:len(new_lines) - suffix], autojunk=False)
+    return [(_line_offset(old, prefix + old_first), _line_offset(old, prefix + old_last),
+             _line_offset(new, prefix + new_first), _line_offset(new, prefix + new_last))
+            for tag, old_first, old_last, new_first, new_last in matcher.get_opcodes() if tag != 'equal']
+
+class AhoCorasickAutomaton:
+    """Multi-pattern matcher that finds every occurrence of every pattern in one pass"""
+    
+    def __init__(self, patterns: Iterable[str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[str]] = [[]]
+        self.patterns: Set[str] = set()
+        self.max_pattern_length = 0
+        
+        for pattern in patterns:
+            if pattern:
+                self._add_pattern(pattern)
+        self._build_failure_links()
+    
+    def _add_pattern(self, pattern: str):
+        """Insert a pattern into the trie"""
+        state = 0
+        for char in pattern:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = next_state
+        if pattern not in self.patterns:
+            self.patterns.add(pattern)
+            self.output[state].append(pattern)
+            self.max_pattern_length = max(self.max_pattern_length, len(pattern))
+    
+    def _build_failure_links(self):
+        """Breadth-first construction of failure links and merged outputs"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+    
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """Yield (start, end, pattern) for every, possibly overlapping, occurrence"""
+        matches, _ = self.match_chunk(text)
+        return iter(matches)
+    
+    def match_chunk(self, text: str, state: int = 0, offset: int = 0) -> Tuple[List[Tuple[int, int, str]], int]:
+        """Match one chunk of a longer stream, resuming from `state` with positions shifted by `offset`
+        
+        Returns the (start, end, pattern) matches ordered by end and the state to resume from,
+        so patterns spanning chunk boundaries are still found.
+        """
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        matches = []
+        for index, char in enumerate(text, offset):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                end = index + 1
+                for pattern in output[state]:
+                    matches.append((end - len(pattern), end, pattern))
+        return matches, state
+
+def _lcs_length(a: str, b: str) -> int:
+    """Length of the longest common subsequence, using the bit-parallel algorithm"""
+    if len(a) < len(b):
+        a, b = b, a
+    masks: Dict[str, int] = {}
+    for index, char in enumerate(a):
+        masks[char] = masks.get(char, 0) | (1 << index)
+    all_ones = (1 << len(a)) - 1
+    row = all_ones
+    for char in b:
+        matches = row & masks.get(char, 0)
+        row = ((row + matches) | (row - matches)) & all_ones
+    return len(a) - bin(row).count('1')
+
+def _indel_distance(a: str, b: str) -> int:
+    """Insert/delete edit distance, a metric bounded below by SequenceMatcher's dissimilarity"""
+    return len(a) + len(b) - 2 * _lcs_length(a, b)
+
+class FuzzySkillIndex:
+    """BK-tree over skill synonyms answering SequenceMatcher ratio queries"""
+    
+    def __init__(self, skills: Iterable[str]):
+        self.root: Optional[List[Any]] = None
+        self.size = 0
+        for skill in skills:
+            self._add(skill)
+    
+    def _add(self, skill: str):
+        """Insert a skill; each node is [skill, {distance: child}]"""
+        if self.root is None:
+            self.root = [skill, {}]
+            self.size = 1
+            return
+        node = self.root
+        while True:
+            distance = _indel_distance(skill, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = [skill, {}]
+                self.size += 1
+                return
+            node = child
+    
+    def search(self, word: str, threshold: float = 0.8, counters: Optional[Counter] = None) -> List[str]:
+        """Return skills whose SequenceMatcher ratio with word is above threshold
+        
+        `counters` (e.g. ExtractionProfile.counters) accumulates distance checks and SequenceMatcher comparisons.
+        """
+        if self.root is None or not word:
+            return []
+        
+        # ratio = 2M / (la + lb) and M <= LCS, so a match needs an indel distance
+        # below (1 - threshold) * (la + lb); with la <= lb + distance that caps the
+        # search radius at 2 * lb * (1 - threshold) / threshold
+        word_length = len(word)
+        radius = int(2 * word_length * (1 - threshold) / threshold) if threshold > 0 else math.inf
+        
+        matches = []
+        visited = compared = 0
+        stack = [self.root]
+        while stack:
+            skill, children = stack.pop()
+            distance = _indel_distance(word, skill)
+            visited += 1
+            if distance < (1 - threshold) * (word_length + len(skill)):
+                compared += 1
+                if SequenceMatcher(None, skill, word).ratio() > threshold:
+                    matches.append(skill)
+            for child_distance, child in children.items():
+                if distance - radius <= child_distance <= distance + radius:
+                    stack.append(child)
+        if counters is not None:
+            counters['fuzzy_distance_checks'] += visited
+            counters['sequence_matcher_comparisons'] += compared
+        return matches
+
+class ProximityScorer:
+    """Score skill/cue co-occurrence from sorted position lists"""
+    
+    # (cue, side) pairs replacing the legacy context regexes: `skill.*experience`,
+    # `experience.*skill`, `skill.*years?`, `proficient.*skill`, `expert.*skill`
+    CONTEXT_RULES = (
+        ('experience', 'after'),
+        ('experience', 'before'),
+        ('year', 'after'),
+        ('proficient', 'before'),
+        ('expert', 'before'),
+    )
+    CUE_WORDS = frozenset(cue for cue, _ in CONTEXT_RULES)
+    
+    def __init__(self, window: Optional[int] = None):
+        """`window` caps the gap in characters between skill and cue; None keeps the legacy same-line scope"""
+        self.window = window
+    
+    def has_context(self, hits: List[Tuple[int, int, bool]], cue_positions: Dict[str, List[int]],
+                    line_breaks: List[int]) -> bool:
+        """Check whether any hit has a cue word on the same line within the window"""
+        for cue, side in self.CONTEXT_RULES:
+            starts = cue_positions.get(cue)
+            if not starts:
+                continue
+            for start, end, _ in hits:
+                if side == 'after':
+                    if self._cue_after(end, starts, line_breaks):
+                        return True
+                elif self._cue_before(start, len(cue), starts, line_breaks):
+                    return True
+        return False
+    
+    def hit_context_mask(self, starts: 'np.ndarray', ends: 'np.ndarray', cue_positions: Dict[str, List[int]],
+                         line_breaks: List[int]) -> 'np.ndarray':
+        """NumPy form of has_context: for each hit, whether some rule finds a cue for it (requires NumPy)"""
+        in_context = np.zeros(len(starts), dtype=bool)
+        breaks = np.asarray(line_breaks, dtype=np.int64)
+        for cue, side in self.CONTEXT_RULES:
+            cue_starts = np.asarray(cue_positions.get(cue, ()), dtype=np.int64)
+            if not len(cue_starts):
+                continue
+            if side == 'after':
+                index = np.searchsorted(cue_starts, ends, 'left')
+                found = index < len(cue_starts)
+                cue_start = cue_starts[np.minimum(index, len(cue_starts) - 1)]
+                if self.window is not None:
+                    found &= cue_start - ends <= self.window
+                if len(breaks):
+                    break_index = np.searchsorted(breaks, ends, 'left')
+                    found &= ((break_index == len(breaks))
+                              | (breaks[np.minimum(break_index, len(breaks) - 1)] >= cue_start))
+            else:
+                index = np.searchsorted(cue_starts, starts - len(cue), 'right') - 1
+                found = index >= 0
+                cue_start = cue_starts[np.maximum(index, 0)]
+                if self.window is not None:
+                    found &= starts - (cue_start + len(cue)) <= self.window
+                if len(breaks):
+                    break_index = np.searchsorted(breaks, starts, 'left') - 1
+                    found &= (break_index < 0) | (breaks[np.maximum(break_index, 0)] < cue_start)
+            in_context |= found
+        return in_context
+    
+    def _cue_after(self, end: int, starts: List[int], line_breaks: List[int]) -> bool:
+        """Nearest cue starting at or after `end`, with no line break in between"""
+        index = bisect_left(starts, end)
+        if index == len(starts):
+            return False
+        cue_start = starts[index]
+        if self.window is not None and cue_start - end > self.window:
+            return False
+        break_index = bisect_left(line_breaks, end)
+        return break_index == len(line_breaks) or line_breaks[break_index] >= cue_start
+    
+    def _cue_before(self, start: int, cue_length: int, starts: List[int], line_breaks: List[int]) -> bool:
+        """Nearest cue ending at or before `start`, with no line break in between"""
+        index = bisect_right(starts, start - cue_length) - 1
+        if index < 0:
+            return False
+        cue_start = starts[index]
+        if self.window is not None and start - (cue_start + cue_length) > self.window:
+            return False
+        break_index = bisect_left(line_breaks, start) - 1
+        return break_index < 0 or line_breaks[break_index] < cue_start
+
+class SkillEntry(NamedTuple):
+    """What the synonym index knows about one synonym"""
+    # Main skill and category of the synonym's first listing, as find_skill_category always answered
+    canonical: str
+    category: str
+    # Every category listing the synonym, in taxonomy order
+    categories: Tuple[str, ...]
+    # Dense ids: bit positions in skill and category bitsets (see SkillDatabase.skill_names)
+    id: int
+    category_id: int
+
+def taxonomy_fingerprint(skills_data: Mapping[str, Mapping[str, List[str]]]) -> str:
+    """Stable hash of a category -> main skill -> synonyms nesting"""
+    return hashlib.sha256(json.dumps(skills_data, sort_keys=True).encode('utf-8')).hexdigest()
+
+def load_taxonomy_file(path: Union[str, os.PathLike]) -> Dict[str, Dict[str, List[str]]]:
+    """Read an external taxonomy into the category -> main skill -> synonyms nesting
+    
+    JSON files hold either that nesting or a list of {"skill", "category", "synonyms"} records;
+    CSV files need `skill` and `category` columns and may have a `synonyms` column separated
+    by `|`. A main skill is always one of its own synonyms in record and CSV input.
+    """
+    path = os.fspath(path)
+    if path.lower().endswith('.csv'):
+        with open(path, newline='', encoding='utf-8') as handle:
+            records = [{'skill': row.get('skill'), 'category': row.get('category'),
+                        'synonyms': (row.get('synonyms') or '').split('|')} for row in csv.DictReader(handle)]
+    else:
+        with open(path, encoding='utf-8') as handle:
+            data = json.load(handle)
+        if isinstance(data, dict):
+            return {str(category): {str(skill): [str(synonym) for synonym in synonyms]
+                                    for skill, synonyms in skills.items()}
+                    for category, skills in data.items()}
+        records = data
+    
+    skills_data: Dict[str, Dict[str, List[str]]] = {}
+    for record in records:
+        skill = (record.get('skill') or '').strip()
+        category = (record.get('category') or '').strip()
+        if not skill or not category:
+            continue
+        synonyms = skills_data.setdefault(category, {}).setdefault(skill, [])
+        for synonym in [skill] + list(record.get('synonyms') or ()):
+            synonym = synonym.strip()
+            if synonym and synonym not in synonyms:
+                synonyms.append(synonym)
+    return skills_data
+
+class _StringTable(Sequence):
+    """Read-only sequence of the UTF-8 strings in a mapped blob, one per offset pair"""
+    
+    def __init__(self, mapped: mmap.mmap, blob_start: int, offsets: memoryview):
+        self._mapped = mapped
+        self._blob_start = blob_start
+        self._offsets = offsets
+    
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+    
+    def encoded(self, index: int) -> bytes:
+        """The string at index, still encoded (bytes order like the code points they encode)"""
+        return self._mapped[self._blob_start + self._offsets[index]:self._blob_start + self._offsets[index + 1]]
+    
+    def __getitem__(self, index: int) -> str:
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.encoded(index).decode('utf-8')
+
+class _CategoryListing(Mapping):
+    """Main skill -> synonyms of one category of a SkillTable; built into a dict on first lookup"""
+    
+    def __init__(self, table: 'SkillTable', category_id: int):
+        self._table = table
+        self._first = table._category_listings[category_id]
+        self._last = table._category_listings[category_id + 1]
+        self._by_skill: Optional[Dict[str, int]] = None
+    
+    def __len__(self) -> int:
+        return self._last - self._first
+    
+    def __iter__(self) -> Iterator[str]:
+        for listing in range(self._first, self._last):
+            yield self._table._canonical_names[self._table._listing_canonical[listing]]
+    
+    def __getitem__(self, skill: str) -> List[str]:
+        if self._by_skill is None:
+            self._by_skill = {}
+            for listing in range(self._first, self._last):
+                self._by_skill.setdefault(self._table._canonical_names[self._table._listing_canonical[listing]], listing)
+        listing = self._by_skill[skill]
+        synonyms = self._table._listing_synonyms[self._table._listing_offsets[listing]:
+                                                 self._table._listing_offsets[listing + 1]]
+        return [self._table.skill_names[skill_id] for skill_id in synonyms]
+
+class _TaxonomyListing(Mapping):
+    """The skills_data nesting of a SkillTable, read from the mapped file on demand"""
+    
+    def __init__(self, table: 'SkillTable'):
+        self._table = table
+        self._categories = {name: _CategoryListing(table, category_id)
+                            for category_id, name in enumerate(table.category_names)}
+    
+    def __len__(self) -> int:
+        return len(self._categories)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._categories)
+    
+    def __getitem__(self, category: str) -> _CategoryListing:
+        return self._categories[category]
+
+class SkillTable(Mapping):
+    """Compiled taxonomy file, memory-mapped, answering synonym -> SkillEntry lookups
+    
+    `compile()` writes a taxonomy as string tables (UTF-8 blobs plus uint32 offset arrays) and
+    id arrays: synonyms in id order with a sorted permutation for binary search, the canonical
+    skill and categories of every synonym, and the category listings. `open()` maps the file
+    read-only and reads every array in place, so worker processes opening the same file share
+    one physical copy through the page cache and nothing is parsed at startup. Synonym ids and
+    the fingerprint match SkillDatabase built from the same data, so cached results carry over.
+    """
+    
+    FORMAT_VERSION = 1
+    MAGIC = 'skill-table'
+    ALIGNMENT = 8
+    SECTIONS = ('synonym_offsets', 'synonyms', 'sorted_ids', 'canonical', 'category', 'category_offsets',
+                'categories', 'canonical_offsets', 'canonical_names', 'category_name_offsets', 'category_names',
+                'category_listings', 'listing_canonical', 'listing_offsets', 'listing_synonyms')
+    
+    @classmethod
+    def compile(cls, skills_data: Dict[str, Dict[str, List[str]]], path: Union[str, os.PathLike]) -> int:
+        """Write skills_data as a table file atomically and return its size in bytes"""
+        synonym_ids: Dict[str, int] = {}
+        canonical_ids: Dict[str, int] = {}
+        canonical, category, categories = array('I'), array('I'), []
+        category_listings, listing_canonical, listing_offsets, listing_synonyms = (array('I', [0]), array('I'),
+                                                                                    array('I', [0]), array('I'))
+        for category_id, category_skills in enumerate(skills_data.values()):
+            for main_skill, synonyms in category_skills.items():
+                canonical_id = canonical_ids.setdefault(main_skill, len(canonical_ids))
+                listing_canonical.append(canonical_id)
+                for synonym in synonyms:
+                    synonym = synonym.lower()
+                    skill_id = synonym_ids.get(synonym)
+                    if skill_id is None:
+                        skill_id = synonym_ids[synonym] = len(synonym_ids)
+                        canonical.append(canonical_id)
+                        category.append(category_id)
+                        categories.append([category_id])
+                    elif category_id not in categories[skill_id]:
+                        categories[skill_id].append(category_id)
+                    listing_synonyms.append(skill_id)
+                listing_offsets.append(len(listing_synonyms))
+            category_listings.append(len(listing_canonical))
+        
+        encoded = [synonym.encode('utf-8') for synonym in synonym_ids]
+        sections = {}
+        sections['synonym_offsets'], sections['synonyms'] = cls._pack_strings(encoded)
+        sections['sorted_ids'] = array('I', sorted(range(len(encoded)), key=encoded.__getitem__)).tobytes()
+        sections['canonical'] = canonical.tobytes()
+        sections['category'] = category.tobytes()
+        sections['category_offsets'] = array('I', accumulate(chain([0], map(len, categories)))).tobytes()
+        sections['categories'] = array('I', chain.from_iterable(categories)).tobytes()
+        sections['canonical_offsets'], sections['canonical_names'] = cls._pack_strings(
+            [name.encode('utf-8') for name in canonical_ids])
+        sections['category_name_offsets'], sections['category_names'] = cls._pack_strings(
+            [name.encode('utf-8') for name in skills_data])
+        for name, values in (('category_listings', category_listings), ('listing_canonical', listing_canonical),
+                             ('listing_offsets', listing_offsets), ('listing_synonyms', listing_synonyms)):
+            sections[name] = values.tobytes()
+        
+        # Same hash as SkillDatabase.fingerprint(), so extraction cache keys agree
+        fingerprint = taxonomy_fingerprint(skills_data)
+        layout, position = {}, 0
+        for name in cls.SECTIONS:
+            position += -position % cls.ALIGNMENT
+            layout[name] = [position, len(sections[name])]
+            position += len(sections[name])
+        header = {'fingerprint': fingerprint, 'byteorder': sys.byteorder, 'itemsize': array('I').itemsize,
+                  'synonyms': len(encoded), 'sections': layout}
+        prefix = f'{cls.MAGIC}/{cls.FORMAT_VERSION}\n'.encode('ascii') + json.dumps(header).encode('ascii') + b'\n'
+        # Sections are placed relative to the first aligned byte after the header
+        base = len(prefix) + -len(prefix) % cls.ALIGNMENT
+        
+        with _replacing(path) as handle:
+            handle.write(prefix.ljust(base, b'\0'))
+            for name in cls.SECTIONS:
+                handle.write(b'\0' * (base + layout[name][0] - handle.tell()))
+                handle.write(sections[name])
+            size = handle.tell()
+        return size
+    
+    @staticmethod
+    def _pack_strings(encoded: List[bytes]) -> Tuple[bytes, bytes]:
+        """uint32 offsets and the concatenated blob of a string table"""
+        return array('I', accumulate(chain([0], map(len, encoded)))).tobytes(), b''.join(encoded)
+    
+    @classmethod
+    def open(cls, path: Union[str, os.PathLike]) -> 'SkillTable':
+        """Map a table file; raises ValueError if it is not one this version (and machine) can read"""
+        with open(path, 'rb') as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic = mapped.readline()
+        expected = f'{cls.MAGIC}/{cls.FORMAT_VERSION}\n'.encode('ascii')
+        if magic != expected:
+            raise ValueError(f'{os.fspath(path)} is not a compatible skill table (found {magic[:40]!r}, expected {expected!r})')
+        header = json.loads(mapped.readline())
+        if header['byteorder'] != sys.byteorder or header['itemsize'] != array('I').itemsize:
+            raise ValueError(f'{os.fspath(path)} was compiled on a machine with another integer layout')
+        return cls(os.fspath(path), mapped, header)
+    
+    def __init__(self, path: str, mapped: mmap.mmap, header: Dict[str, Any]):
+        self.path = path
+        self.fingerprint: str = header['fingerprint']
+        self._mapped = mapped
+        base = mapped.tell() + -mapped.tell() % self.ALIGNMENT
+        view = memoryview(mapped)
+        self._starts = {name: base + start for name, (start, _) in header['sections'].items()}
+        arrays = {name: view[base + start:base + start + length].cast('I')
+                  for name, (start, length) in header['sections'].items()
+                  if name not in ('synonyms', 'canonical_names', 'category_names')}
+        self.skill_names = _StringTable(mapped, self._starts['synonyms'], arrays['synonym_offsets'])
+        self._canonical_names = _StringTable(mapped, self._starts['canonical_names'], arrays['canonical_offsets'])
+        self.category_names: Tuple[str, ...] = tuple(
+            _StringTable(mapped, self._starts['category_names'], arrays['category_name_offsets']))
+        self._sorted_ids = arrays['sorted_ids']
+        self._canonical = arrays['canonical']
+        self._category = arrays['category']
+        self._category_offsets = arrays['category_offsets']
+        self._categories = arrays['categories']
+        self._category_listings = arrays['category_listings']
+        self._listing_canonical = arrays['listing_canonical']
+        self._listing_offsets = arrays['listing_offsets']
+        self._listing_synonyms = arrays['listing_synonyms']
+        self.listing = _TaxonomyListing(self)
+    
+    def find(self, synonym: str) -> int:
+        """Id of a lowercased synonym by binary search over the sorted permutation, -1 if unknown"""
+        encoded = synonym.encode('utf-8')
+        name_of = self.skill_names.encoded
+        # bisect's key= argument needs Python 3.10, so the search is written out
+        low, high = 0, len(self._sorted_ids)
+        while low < high:
+            middle = (low + high) // 2
+            if name_of(self._sorted_ids[middle]) < encoded:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self._sorted_ids) and name_of(self._sorted_ids[low]) == encoded:
+            return self._sorted_ids[low]
+        return -1
+    
+    def entry(self, skill_id: int) -> SkillEntry:
+        """SkillEntry of a synonym id"""
+        category_ids = self._categories[self._category_offsets[skill_id]:self._category_offsets[skill_id + 1]]
+        return SkillEntry(self._canonical_names[self._canonical[skill_id]], self.category_names[self._category[skill_id]],
+                          tuple(self.category_names[category_id] for category_id in category_ids), skill_id,
+                          self._category[skill_id])
+    
+    def __getitem__(self, synonym: str) -> SkillEntry:
+        skill_id = self.find(synonym)
+        if skill_id < 0:
+            raise KeyError(synonym)
+        return self.entry(skill_id)
+    
+    def __contains__(self, synonym: object) -> bool:
+        return isinstance(synonym, str) and self.find(synonym) >= 0
+    
+    def __len__(self) -> int:
+        return len(self.skill_names)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.skill_names)
 
 class SkillDatabase:
-    """Comprehensive skill database with categories and synonyms"""
+    """Comprehensive skill database with categories and synonyms
     
-    def __init__(self):
+    `synonym_index` maps every lowercased synonym to its SkillEntry. It is built once, when the
+    database is constructed, so later edits to `skills_data` need a new SkillDatabase. Synonyms
+    (the skill keys extraction reports) and categories get dense ids in taxonomy order, so a set
+    of skills is an int bitset and set algebra is a few bitwise operations.
+    
+    `from_table()` backs the database with a memory-mapped SkillTable instead, for external
+    taxonomies too large to hold as dicts in every process; `skills_data` is then a read-only view.
+    """
+    
+    table: Optional[SkillTable] = None
+    
+    def __init__(self, skills_data: Optional[Dict[str, Dict[str, List[str]]]] = None):
         self.skills_data = {
             "programming_languages": {
                 "python": ["python", "py", "python3", "django", "flask", "fastapi"],
@@ -104,9 +839,82 @@ class SkillDatabase:
                 "teamwork": ["teamwork", "collaboration", "cross-functional"]
             }
         }
+        if skills_data is not None:
+            self.skills_data = skills_data
+        self._build_indexes()
+    
+    @classmethod
+    def from_table(cls, table: Union[SkillTable, str, os.PathLike]) -> 'SkillDatabase':
+        """Database answering every lookup from a compiled SkillTable (or the path of one)"""
+        skill_db = cls.__new__(cls)
+        skill_db._attach_table(table if isinstance(table, SkillTable) else SkillTable.open(table))
+        return skill_db
+    
+    def _attach_table(self, table: SkillTable):
+        """Serve skills_data, the synonym index and the id tables straight from the mapped file"""
+        self.table = table
+        self.skills_data = table.listing
+        self.synonym_index = table
+        self.skill_names = table.skill_names
+        self.category_names = table.category_names
+    
+    def _build_indexes(self):
+        """Invert the category -> main skill -> synonyms nesting into one read-only hash lookup"""
+        category_ids = {category_name: index for index, category_name in enumerate(self.skills_data)}
+        first = {}
+        categories = defaultdict(list)
+        for category_name, category_skills in self.skills_data.items():
+            for main_skill, synonyms in category_skills.items():
+                for synonym in synonyms:
+                    synonym = synonym.lower()
+                    first.setdefault(synonym, (main_skill, category_name))
+                    if category_name not in categories[synonym]:
+                        categories[synonym].append(category_name)
+        self.synonym_index: Mapping[str, SkillEntry] = MappingProxyType({
+            synonym: SkillEntry(main_skill, category_name, tuple(categories[synonym]), skill_id,
+                                category_ids[category_name])
+            for skill_id, (synonym, (main_skill, category_name)) in enumerate(first.items())
+        })
+        self.skill_names: Tuple[str, ...] = tuple(first)
+        self.category_names: Tuple[str, ...] = tuple(category_ids)
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # The index is a read-only view, which cannot be pickled; it is rebuilt on unpickling.
+        # A table-backed database is reopened from its file, sharing the mapping across processes.
+        if self.table is not None:
+            return {'table_path': self.table.path}
+        return {'skills_data': self.skills_data}
+    
+    def __setstate__(self, state: Dict[str, Any]):
+        if 'table_path' in state:
+            self._attach_table(SkillTable.open(state['table_path']))
+            return
+        self.skills_data = state['skills_data']
+        self._build_indexes()
+    
+    def skill_bits(self, skills: Iterable[str]) -> int:
+        """Bitset of the known synonyms among skills"""
+        bits = 0
+        for skill in skills:
+            entry = self.synonym_index.get(skill.lower())
+            if entry is not None:
+                bits |= 1 << entry.id
+        return bits
+    
+    def skills_from_bits(self, bits: int) -> List[str]:
+        """Synonyms of a bitset, in id order"""
+        return [self.skill_names[skill_id] for skill_id in _bit_positions(bits)]
+    
+    def fingerprint(self) -> str:
+        """Stable hash of the taxonomy, changes whenever a skill, synonym or category does"""
+        if self.table is not None:
+            return self.table.fingerprint
+        return taxonomy_fingerprint(self.skills_data)
     
     def get_all_skills(self) -> Set[str]:
         """Get all unique skills from the database"""
+        if self.table is not None:
+            return set(self.table)
         all_skills = set()
         for category in self.skills_data.values():
             for skill_list in category.values():
@@ -115,136 +923,1619 @@ class SkillDatabase:
     
     def find_skill_category(self, skill: str) -> str:
         """Find which category a skill belongs to"""
-        skill_lower = skill.lower()
-        for category_name, category_skills in self.skills_data.items():
-            for main_skill, synonyms in category_skills.items():
-                if skill_lower in [s.lower() for s in synonyms]:
-                    return category_name
-        return "other"
+        entry = self.synonym_index.get(skill.lower())
+        return entry.category if entry is not None else "other"
+    
+    def canonical_skill(self, skill: str) -> Optional[str]:
+        """Main skill a synonym is listed under (its first listing), or None if unknown"""
+        entry = self.synonym_index.get(skill.lower())
+        return entry.canonical if entry is not None else None
+    
+    def skill_categories(self, skill: str) -> Tuple[str, ...]:
+        """Every category listing the synonym, empty if unknown"""
+        entry = self.synonym_index.get(skill.lower())
+        return entry.categories if entry is not None else ()
 
-class CustomSkillExtractor:
-    """Extract skills from text using rule-based methods"""
+# Vocabularies kept as views of the skill registry (see CompiledTaxonomy.views), each a group -> terms
+# listing: the service categories SkillService files skills under, matched as substrings of skill
+# names and job text, and the display names the skillmatcher app suggests from
+DEFAULT_SKILL_VIEWS: Dict[str, Dict[str, List[str]]] = {
+    'service_categories': {
+        'programming': [
+            'python', 'java', 'javascript', 'c++', 'c#', 'php', 'ruby', 'go', 'rust',
+            'typescript', 'kotlin', 'swift', 'scala', 'r', 'matlab', 'perl', 'bash'
+        ],
+        'web_development': [
+            'html', 'css', 'react', 'angular', 'vue', 'node.js', 'express', 'django',
+            'flask', 'spring', 'laravel', 'bootstrap', 'jquery', 'webpack', 'sass'
+        ],
+        'databases': [
+            'sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch',
+            'oracle', 'sqlite', 'cassandra', 'dynamodb', 'neo4j'
+        ],
+        'cloud_devops': [
+            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'git',
+            'terraform', 'ansible', 'chef', 'puppet', 'gitlab', 'circleci'
+        ],
+        'data_science': [
+            'machine learning', 'deep learning', 'tensorflow', 'pytorch', 'scikit-learn',
+            'pandas', 'numpy', 'matplotlib', 'seaborn', 'jupyter', 'tableau', 'power bi'
+        ],
+        'mobile_development': [
+            'android', 'ios', 'react native', 'flutter', 'xamarin', 'cordova',
+            'ionic', 'swift', 'kotlin', 'objective-c'
+        ],
+        'cybersecurity': [
+            'penetration testing', 'vulnerability assessment', 'network security',
+            'cryptography', 'ethical hacking', 'incident response', 'compliance'
+        ],
+        'soft_skills': [
+            'leadership', 'communication', 'teamwork', 'problem solving',
+            'project management', 'agile', 'scrum', 'time management'
+        ]
+    },
+    'common_skills': {
+        'common': [
+            "Python", "Java", "C++", "JavaScript", "TypeScript", "SQL", "NoSQL", "HTML", "CSS", "React", "Angular", "Vue.js",
+            "Node.js", "Express.js", "Django", "Flask", "Spring Boot", "Ruby on Rails", "PHP", "Laravel", "Go", "Rust", "Kotlin", "Swift",
+            "Objective-C", "Scala", "Perl", "R", "MATLAB", "SAS", "SPSS", "TensorFlow", "PyTorch", "Keras", "Scikit-learn", "Pandas",
+            "NumPy", "Matplotlib", "Seaborn", "Tableau", "Power BI", "Excel", "AWS", "Azure", "Google Cloud", "Docker", "Kubernetes",
+            "CI/CD", "Jenkins", "Git", "GitHub", "Bitbucket", "Agile", "Scrum", "Kanban", "Project Management", "JIRA", "Confluence",
+            "Communication", "Teamwork", "Problem Solving", "Critical Thinking", "Leadership", "Time Management", "Adaptability",
+            "Creativity", "Attention to Detail", "Customer Service", "Sales", "Marketing", "SEO", "Content Writing", "Copywriting",
+            "Data Analysis", "Data Visualization", "Business Analysis", "Financial Analysis", "Machine Learning", "Deep Learning",
+            "Natural Language Processing", "Computer Vision", "Cloud Computing", "Cybersecurity", "Network Security", "Penetration Testing",
+            "DevOps", "Mobile Development", "iOS Development", "Android Development", "UI/UX Design", "Graphic Design", "Figma",
+            "Adobe Photoshop", "Adobe Illustrator", "AutoCAD", "SolidWorks", "SAP", "Oracle", "MongoDB", "PostgreSQL", "MySQL",
+            "Redis", "Elasticsearch", "Hadoop", "Spark", "Big Data", "ETL", "Data Engineering", "APIs", "REST", "GraphQL", "SOAP"
+        ]
+    }
+}
+
+# Weighted relationships between skills, see SkillGraph: nodes are main skills of the taxonomy (or
+# synonyms), plus concepts that are no skill and are found by their label in the job text
+DEFAULT_SKILL_GRAPH: Dict[str, Any] = {
+    'nodes': {
+        'data_visualization': {'label': 'Data Visualization', 'category': 'Data Science & AI'}
+    },
+    'edges': [
+        # Frameworks to the concepts they are used for
+        ('tensorflow', 'deep_learning', 'parent', 0.3),
+        ('tensorflow', 'machine_learning', 'parent', 0.4),
+        ('pytorch', 'deep_learning', 'parent', 0.3),
+        ('pytorch', 'machine_learning', 'parent', 0.4),
+        ('scikit-learn', 'deep_learning', 'parent', 0.3),
+        ('scikit-learn', 'machine_learning', 'parent', 0.4),
+        ('pandas', 'data_analysis', 'parent', 0.5),
+        ('numpy', 'data_analysis', 'parent', 0.5),
+        ('matplotlib', 'data_visualization', 'parent', 0.7),
+        ('seaborn', 'data_visualization', 'parent', 0.7),
+        ('plotly', 'data_visualization', 'parent', 0.7),
+        # The Python data stack as a whole
+        ('python_data', 'data_analysis', 'parent', 0.6),
+        ('python_data', 'data_visualization', 'parent', 0.6)
+    ]
+}
+
+def load_skill_graph_file(path: Union[str, os.PathLike]) -> Dict[str, Any]:
+    """Read an external skill graph into the DEFAULT_SKILL_GRAPH shape
     
-    def __init__(self):
-        self.skill_db = SkillDatabase()
-        self.all_skills = self.skill_db.get_all_skills()
-        
-        self.patterns = {
-            'years_experience': r'(\d+)[\+\s]*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)',
-            'skill_with_years': r'(\w+(?:\.\w+)*)\s*[:-]\s*(\d+)[\+\s]*(?:years?|yrs?)',
-            'frameworks': r'(?:using|with|in)\s+([A-Za-z][A-Za-z0-9\.\-\+#]*)',
-            'technologies': r'(?:technologies?|tools?|platforms?)[:\s]+([^,.;!?]+)',
-            'programming_languages': r'(?:programming\s+)?(?:languages?|lang)[:\s]+([^,.;!?]+)',
+    JSON files hold {"nodes": {name: {"label", "category"}}, "edges": [...]}, edges being
+    {"source", "target", "relation", "weight"} records or [source, target, relation, weight]
+    lists; CSV files hold edges only, with those four columns.
+    """
+    path = os.fspath(path)
+    if path.lower().endswith('.csv'):
+        with open(path, newline='', encoding='utf-8') as handle:
+            data = {'nodes': {}, 'edges': list(csv.DictReader(handle))}
+    else:
+        with open(path, encoding='utf-8') as handle:
+            data = json.load(handle)
+    
+    edges = []
+    for edge in data.get('edges') or ():
+        if isinstance(edge, dict):
+            edge = (edge.get('source'), edge.get('target'), edge.get('relation') or 'related', edge.get('weight'))
+        source, target, relation, weight = edge
+        if not source or not target or weight in (None, ''):
+            continue
+        edges.append((str(source).strip(), str(target).strip(), str(relation).strip().lower(), float(weight)))
+    return {'nodes': {str(name): dict(attributes) for name, attributes in (data.get('nodes') or {}).items()},
+            'edges': edges}
+
+class SimilarityTable(NamedTuple):
+    """Best-path similarities of a SkillGraph resolved to taxonomy synonyms, see SkillGraph.compile"""
+    # Resume synonym -> job synonym -> (similarity, graph node the job synonym stands for)
+    pairs: Dict[str, Dict[str, Tuple[float, str]]]
+    # Resume synonym -> ((concept node, similarity), ...), strongest first
+    concepts: Dict[str, Tuple[Tuple[str, float], ...]]
+    # Skill bitsets (SkillDatabase ids): synonyms with pairs or concepts, and the job synonyms of each one's pairs
+    sources: int
+    targets: Dict[str, int]
+
+class SkillGraph:
+    """Weighted skill relationships with the best-path similarity of every connected pair precomputed
+    
+    An edge (source, target, relation, weight) with relation 'parent' makes target the broader
+    skill and is only followed from the specific one: pandas on a resume partly covers a data
+    analysis requirement, not the reverse. 'child' is the same edge written from the parent and
+    'related' is followed both ways. The similarity of two nodes is the highest product of
+    weights over any path, kept when it reaches MIN_SIMILARITY, so `closure` stays sparse.
+    """
+    
+    RELATIONS = ('parent', 'child', 'related')
+    MIN_SIMILARITY = 0.1
+    
+    def __init__(self, graph: Optional[Mapping[str, Any]] = None):
+        graph = DEFAULT_SKILL_GRAPH if graph is None else graph
+        self.nodes: Dict[str, Dict[str, str]] = {name: dict(attributes) for name, attributes in graph['nodes'].items()}
+        self.edges: List[Tuple[str, str, str, float]] = [tuple(edge) for edge in graph['edges']]
+        self.fingerprint = hashlib.sha256(
+            json.dumps([self.nodes, self.edges], sort_keys=True).encode('utf-8')).hexdigest()
+        
+        # Directed adjacency in the direction a resume skill may stand in for a job skill
+        adjacency = defaultdict(dict)
+        for source, target, relation, weight in self.edges:
+            if relation not in self.RELATIONS:
+                raise ValueError(f'Unknown skill relation {relation!r} ({source} -> {target})')
+            if not 0 < weight <= 1:
+                raise ValueError(f'Skill relation weights must be in (0, 1], got {weight} ({source} -> {target})')
+            if relation == 'child':
+                source, target = target, source
+            arcs = [(source, target)] + ([(target, source)] if relation == 'related' else [])
+            for arc_source, arc_target in arcs:
+                if weight > adjacency[arc_source].get(arc_target, 0):
+                    adjacency[arc_source][arc_target] = weight
+        # Node -> every other node it reaches -> best-path similarity
+        self.closure: Dict[str, Dict[str, float]] = {
+            node: reachable for node in adjacency if (reachable := self._best_paths(adjacency, node))
         }
     
-    def extract_skills_from_text(self, text: str) -> Dict[str, Any]:
-        """Extract skills from text with confidence scores"""
-        text_lower = text.lower()
-        found_skills = {}
-        skill_categories = defaultdict(list)
+    def _best_paths(self, adjacency: Dict[str, Dict[str, float]], source: str) -> Dict[str, float]:
+        """Dijkstra on products: weights never exceed 1, so a node's best path is final once popped"""
+        best = {source: 1.0}
+        heap = [(-1.0, source)]
+        done = set()
+        while heap:
+            score, node = heapq.heappop(heap)
+            if node in done:
+                continue
+            done.add(node)
+            for neighbour, weight in adjacency.get(node, {}).items():
+                candidate = -score * weight
+                if candidate >= self.MIN_SIMILARITY and candidate > best.get(neighbour, 0):
+                    best[neighbour] = candidate
+                    heapq.heappush(heap, (-candidate, neighbour))
+        del best[source]
+        return best
+    
+    def label(self, node: str) -> str:
+        """Display name of a node"""
+        return self.nodes.get(node, {}).get('label') or node.replace('_', ' ').title()
+    
+    def category(self, node: str) -> Optional[str]:
+        """Display category of a node, None if the graph data gives none"""
+        return self.nodes.get(node, {}).get('category')
+    
+    def compile(self, skill_db: SkillDatabase) -> SimilarityTable:
+        """Resolve the closure to synonyms: a node stands for the synonyms listed under main skills of
+        that name, else for the synonym of that name, else it is a concept"""
+        node_names = set(self.closure).union(*self.closure.values())
+        synonyms_of = defaultdict(list)
+        for category_skills in skill_db.skills_data.values():
+            for main_skill, synonyms in category_skills.items():
+                if main_skill in node_names:
+                    synonyms_of[main_skill].extend(synonym.lower() for synonym in synonyms)
+        for node in node_names:
+            if node not in synonyms_of and node.lower() in skill_db.synonym_index:
+                synonyms_of[node].append(node.lower())
+        
+        pairs = defaultdict(dict)
+        concepts = defaultdict(dict)
+        for source, reachable in self.closure.items():
+            for synonym in dict.fromkeys(synonyms_of.get(source, ())):
+                row = pairs[synonym]
+                for target, similarity in reachable.items():
+                    if target not in synonyms_of:
+                        concepts[synonym][target] = max(similarity, concepts[synonym].get(target, 0))
+                    for job_synonym in synonyms_of.get(target, ()):
+                        if job_synonym != synonym and similarity > row.get(job_synonym, (0,))[0]:
+                            row[job_synonym] = (similarity, target)
+        pairs = {synonym: row for synonym, row in pairs.items() if row}
+        return SimilarityTable(
+            pairs,
+            {synonym: tuple(sorted(found.items(), key=lambda item: (-item[1], item[0])))
+             for synonym, found in concepts.items()},
+            skill_db.skill_bits(chain(pairs, concepts)),
+            {synonym: skill_db.skill_bits(row) for synonym, row in pairs.items()}
+        )
+
+class CompiledTaxonomy:
+    """Everything the extractor and matcher derive from a SkillDatabase, compiled once
+    
+    `build()` compiles the synonym set, Aho-Corasick automaton, fuzzy index and the similarity
+    table of the skill graph; `save()` writes them as one versioned pickle artifact and `load()` maps it back in a
+    single read, so worker processes skip the compilation entirely. Artifacts are pickles:
+    only load files produced by your own build step. An artifact built from a SkillTable
+    refers to the table file by path instead of embedding the taxonomy.
+    
+    It is also the skill registry the other vocabularies are views of (DEFAULT_SKILL_VIEWS):
+    their terms share the one automaton, so a single pass over a document answers the
+    taxonomy and every view, and `view()` gives back the legacy group -> terms listing.
+    """
+    
+    FORMAT_VERSION = 4
+    MAGIC = 'skill-taxonomy'
+    
+    def __init__(self, skill_db: SkillDatabase, all_skills: Set[str], skill_matcher: AhoCorasickAutomaton,
+                 fuzzy_index: FuzzySkillIndex, skill_graph: SkillGraph, similarity_table: SimilarityTable,
+                 fingerprint: str, views: Optional[Dict[str, Dict[str, List[str]]]] = None):
+        self.skill_db = skill_db
+        self.all_skills = all_skills
+        self.skill_matcher = skill_matcher
+        self.fuzzy_index = fuzzy_index
+        self.skill_graph = skill_graph
+        self.similarity_table = similarity_table
+        self.fingerprint = fingerprint
+        self.views = views or {}
+        # Per view, each lowercased term -> indexes of the groups listing it
+        self.view_index: Dict[str, Dict[str, Tuple[int, ...]]] = {}
+        for name, groups in self.views.items():
+            index = defaultdict(list)
+            for group_index, terms in enumerate(groups.values()):
+                for term in terms:
+                    if group_index not in index[term.lower()]:
+                        index[term.lower()].append(group_index)
+            self.view_index[name] = {term: tuple(group_indexes) for term, group_indexes in index.items()}
+        self.view_terms = frozenset(chain.from_iterable(self.view_index.values()))
+        # Where a document memoizes the view terms found in it
+        self.terms_key = (fingerprint, 'terms', hashlib.sha256(
+            json.dumps(self.views, sort_keys=True).encode('utf-8')).hexdigest()[:16])
+        # How this instance came to be and how long it took ('built' or 'artifact')
+        self.source = 'built'
+        self.startup_seconds = 0.0
+    
+    @classmethod
+    def build(cls, skill_db: Optional[SkillDatabase] = None,
+              views: Optional[Dict[str, Dict[str, List[str]]]] = None,
+              skill_graph: Optional[SkillGraph] = None) -> 'CompiledTaxonomy':
+        """Compile every lookup structure from the skill database, the views (default DEFAULT_SKILL_VIEWS)
+        and the skill graph (default DEFAULT_SKILL_GRAPH)"""
+        start = time.perf_counter()
+        skill_db = skill_db or SkillDatabase()
+        views = DEFAULT_SKILL_VIEWS if views is None else views
+        skill_graph = skill_graph or SkillGraph()
+        all_skills = skill_db.get_all_skills()
+        view_terms = [term.lower() for groups in views.values() for terms in groups.values() for term in terms]
+        taxonomy = cls(
+            skill_db,
+            all_skills,
+            AhoCorasickAutomaton([skill.lower() for skill in all_skills] + view_terms
+                                 + list(ProximityScorer.CUE_WORDS) + ['\n']),
+            FuzzySkillIndex(skill.lower() for skill in all_skills if len(skill) > 3),
+            skill_graph,
+            skill_graph.compile(skill_db),
+            skill_db.fingerprint(),
+            views
+        )
+        taxonomy.startup_seconds = time.perf_counter() - start
+        return taxonomy
+    
+    @classmethod
+    def _header_prefix(cls) -> bytes:
+        """Artifact format and engine version, the part of the header a loader must agree with"""
+        return f'{cls.MAGIC}/{cls.FORMAT_VERSION}/{EXTRACTION_ENGINE_VERSION}/'.encode('ascii')
+    
+    def save(self, path: Union[str, os.PathLike]) -> int:
+        """Write the compiled artifact atomically and return its size in bytes"""
+        payload = pickle.dumps({
+            'skill_db': self.skill_db,
+            'all_skills': self.all_skills,
+            'skill_matcher': self.skill_matcher,
+            'fuzzy_index': self.fuzzy_index,
+            'skill_graph': self.skill_graph,
+            'similarity_table': self.similarity_table,
+            'fingerprint': self.fingerprint,
+            'views': self.views
+        }, protocol=pickle.HIGHEST_PROTOCOL)
+        data = self._header_prefix() + self.fingerprint.encode('ascii') + b'\n' + payload
+        
+        with _replacing(path) as handle:
+            handle.write(data)
+        return len(data)
+    
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> 'CompiledTaxonomy':
+        """Map a compiled artifact into memory; raises ValueError if it was built by another engine version"""
+        start = time.perf_counter()
+        with open(path, 'rb') as handle:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                header = mapped.readline()
+                expected = cls._header_prefix()
+                if not header.startswith(expected):
+                    raise ValueError(f'{os.fspath(path)} is not a compatible taxonomy artifact '
+                                     f'(found {header[:40]!r}, expected {expected!r})')
+                payload = pickle.load(mapped)
+        if payload['skill_db'].fingerprint() != payload['fingerprint']:
+            raise ValueError(f'{os.fspath(path)} was compiled from a skill table that has changed since')
+        
+        taxonomy = cls(
+            payload['skill_db'],
+            payload['all_skills'],
+            payload['skill_matcher'],
+            payload['fuzzy_index'],
+            payload['skill_graph'],
+            payload['similarity_table'],
+            payload['fingerprint'],
+            payload['views']
+        )
+        taxonomy.source = 'artifact'
+        taxonomy.startup_seconds = time.perf_counter() - start
+        return taxonomy
+    
+    @classmethod
+    def load_or_build(cls, path: Optional[Union[str, os.PathLike]] = None,
+                      skill_db: Optional[SkillDatabase] = None,
+                      views: Optional[Dict[str, Dict[str, List[str]]]] = None,
+                      skill_graph: Optional[SkillGraph] = None) -> 'CompiledTaxonomy':
+        """Load the artifact at `path` when it exists and is compatible, otherwise compile in-process
+        
+        An artifact compiled from a different taxonomy than `skill_db` (default: the built-in
+        SkillDatabase) is ignored, as is one compiled with other views or another skill graph.
+        """
+        skill_db = SkillDatabase() if skill_db is None else skill_db
+        views = DEFAULT_SKILL_VIEWS if views is None else views
+        skill_graph = skill_graph or SkillGraph()
+        if path and os.path.exists(path):
+            try:
+                taxonomy = cls.load(path)
+                if taxonomy.fingerprint != skill_db.fingerprint():
+                    print(f"Ignoring taxonomy artifact {path}: it was compiled from another taxonomy")
+                elif taxonomy.views != views:
+                    print(f"Ignoring taxonomy artifact {path}: it was compiled with other skill views")
+                elif taxonomy.skill_graph.fingerprint != skill_graph.fingerprint:
+                    print(f"Ignoring taxonomy artifact {path}: it was compiled with another skill graph")
+                else:
+                    return taxonomy
+            except (ValueError, OSError, pickle.UnpicklingError, EOFError) as e:
+                print(f"Ignoring taxonomy artifact {path}: {e}")
+        return cls.build(skill_db, views, skill_graph)
+    
+    def view(self, name: str) -> Dict[str, List[str]]:
+        """A vocabulary in its legacy group -> terms shape, e.g. view('service_categories')"""
+        return self.views[name]
+    
+    def view_list(self, name: str) -> List[str]:
+        """Every term of a view once, in declaration order, e.g. view_list('common_skills')"""
+        return list(dict.fromkeys(chain.from_iterable(self.views[name].values())))
+    
+    def terms_in(self, text: Union[str, Document]) -> FrozenSet[str]:
+        """Lowercased view terms occurring anywhere in the text, as substrings
+        
+        Memoized on a Document. The extractor records them during its own full scan, so a
+        document it has already read is not scanned again.
+        """
+        if not isinstance(text, Document):
+            return self.view_terms_of(self.skill_matcher.match_chunk(text.lower())[0])
+        terms = text.scans.get(self.terms_key)
+        if terms is None:
+            terms = text.scans[self.terms_key] = self.view_terms_of(self.skill_matcher.match_chunk(text.lower)[0])
+        return terms
+    
+    def matching_terms(self, name: str, text: Union[str, Document]) -> List[str]:
+        """Terms of a view occurring in the text, in declaration order"""
+        found = self.terms_in(text)
+        return [term for term in self.view_list(name) if term.lower() in found]
+    
+    def groups_of(self, name: str, text: Union[str, Document]) -> Tuple[str, ...]:
+        """Groups of a view with a term occurring in the text, in declaration order"""
+        index = self.view_index[name]
+        group_indexes = set()
+        for term in self.terms_in(text):
+            group_indexes.update(index.get(term, ()))
+        groups = list(self.views[name])
+        return tuple(groups[group_index] for group_index in sorted(group_indexes))
+    
+    def view_terms_of(self, matches: Iterable[Tuple[int, int, str]]) -> FrozenSet[str]:
+        """The view terms among automaton matches"""
+        return frozenset(pattern for _, _, pattern in matches if pattern in self.view_terms)
+
+_MONTH = (r'(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?'
+          r'|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)')
+# Years from 1950 to 2099; ends later than the current month are rejected when a range is observed
+_YEAR = r'(?:19[5-9]\d|20\d\d)'
+_DATE = rf'(?:(?<![a-z]){_MONTH}\.?,?\s+{_YEAR}|\d{{1,2}}/{_YEAR}|{_YEAR})(?!\d)'
+# Words after a range that make its numbers amounts ("from 2000 - 2024 dollars"), not years
+_AMOUNT = (r'(?:%|percent|dollars?|usd|eur(?:os)?|gbp|k\b|users?|customers?|clients?|requests?|records?'
+           r'|rows?|items?|units?|people|employees|transactions?|orders?|downloads?)')
+
+class ExperienceScanner:
+    """Single-pass scanner for experience claims, skill/year pairs and employment date ranges
+    
+    The "of experience" tail and the end of a date range are lookaheads, so a match only
+    consumes text no other alternative starts in and one finditer reproduces the former
+    separate years/skill-years searches. Text such as "03/2017 - 2020 yrs" is now read as a
+    date range rather than a skill "2017" with 2020 years.
+    """
+    
+    PATTERN = re.compile(
+        # python: 5 years  (optionally "... of experience", which also counts as a claim)
+        r'(?<!\w)(?P<skill>\w+(?:\.\w+)*)\s*[:-]\s*(?P<skill_years>\d+)[\+\s]*(?:years?|yrs?)'
+        r'(?P<skill_claim>(?=\s*(?:of\s*)?(?:experience|exp)))?'
+        # 5+ years of experience
+        r'|(?<!\d)(?P<years>\d+)[\+\s]*(?:years?|yrs?)(?=\s*(?:of\s*)?(?:experience|exp))'
+        # jan 2018 - present, 03/2016 to 2019
+        rf'|(?<![\d$€£])(?P<range_start>{_DATE})'
+        rf'(?=\s*(?:-|–|—|to|until)\s*(?P<range_end>{_DATE}|present|current|now|today|date)(?!\s*{_AMOUNT}))'
+    )
+    # A match attempt, lookarounds included, reads at most 7 whitespace-separated tokens that are not
+    # bare '+' runs, so text further than this many tokens away cannot change how a position is matched
+    REACH_TOKENS = 10
+    REACH_TOKEN = re.compile(r'\S*[^\s+]\S*')
+    MONTHS = {month: index for index, month in enumerate(
+        ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'), 1)}
+    # Structured dates: 2018, 2018-03 or 2018-03-31
+    ISO_DATE = re.compile(r'(\d{4})(?:-(\d{1,2}))?')
+    MIN_YEAR = 1950
+    # Longer periods are noise rather than one job
+    MAX_PERIOD_MONTHS = 50 * 12
+    
+    def __init__(self, today: Optional[date] = None):
+        """`today` resolves open-ended ranges ("- present") and defaults to the current date"""
+        self.today = today or date.today()
+        self.claimed_years = 0
+        self.skill_experience: Dict[str, int] = {}
+        # (first month, month after the last) as year * 12 + month - 1
+        self.periods: List[Tuple[int, int]] = []
+    
+    def scan(self, text: str) -> 'ExperienceScanner':
+        """Observe every match in text; may be called once per section"""
+        for match in self.PATTERN.finditer(text):
+            self.observe(match.groupdict())
+        return self
+    
+    def observe(self, groups: Dict[str, Optional[str]]):
+        """Fold the named groups of one PATTERN match into the collected facts"""
+        if groups['skill'] is not None:
+            self.skill_experience[groups['skill']] = int(groups['skill_years'])
+            if groups['skill_claim'] is not None:
+                self.claimed_years = max(self.claimed_years, int(groups['skill_years']))
+        elif groups['years'] is not None:
+            self.claimed_years = max(self.claimed_years, int(groups['years']))
+        else:
+            start = self._month_index(groups['range_start'], is_end=False)
+            end = self._month_index(groups['range_end'], is_end=True)
+            if self._plausible(start, end):
+                self.periods.append((start, end))
+    
+    def add_period(self, start: Optional[str], end: Optional[str] = None) -> bool:
+        """Add an employment period given as ISO dates; a missing or non-date end means ongoing"""
+        start_match = self.ISO_DATE.match(start or '')
+        if start_match is None:
+            return False
+        year, month = start_match.groups()
+        start_index = int(year) * 12 + (int(month) - 1 if month else 0)
         
-        for skill in self.all_skills:
-            if self._fuzzy_match(skill, text_lower):
-                confidence = self._calculate_confidence(skill, text_lower)
-                if confidence > 0.6:
-                    category = self.skill_db.find_skill_category(skill)
-                    found_skills[skill] = {
-                        'confidence': confidence,
-                        'category': category,
-                        'context': self._extract_context(skill, text, 50)
-                    }
-                    skill_categories[category].append(skill)
+        end_match = self.ISO_DATE.match(end or '')
+        if end_match is None:
+            end_index = self.today.year * 12 + self.today.month
+        else:
+            year, month = end_match.groups()
+            # Read like the text forms: a month is inclusive, a bare year means "up to" that year
+            end_index = int(year) * 12 + int(month) if month else int(year) * 12
+        if not self._plausible(start_index, end_index):
+            return False
+        self.periods.append((start_index, end_index))
+        return True
+    
+    def _plausible(self, start: int, end: int) -> bool:
+        """Whether a period starts after MIN_YEAR, ends after it starts but not after this month,
+        and spans at most MAX_PERIOD_MONTHS"""
+        this_month_end = self.today.year * 12 + self.today.month
+        return (self.MIN_YEAR * 12 <= start < end <= this_month_end
+                and end - start <= self.MAX_PERIOD_MONTHS)
+    
+    def _month_index(self, value: str, is_end: bool) -> int:
+        """Month index of a date; ends are exclusive, so 'dec 2020' maps to january 2021"""
+        if not value[0].isdigit():
+            if value[:3] in self.MONTHS:
+                month, year = self.MONTHS[value[:3]], int(value[-4:])
+            else:
+                # present, current, now, today, date
+                month, year = self.today.month, self.today.year
+            return year * 12 + month - 1 + (1 if is_end else 0)
+        if '/' in value:
+            month, year = value.split('/')
+            return int(year) * 12 + int(month) - 1 + (1 if is_end else 0)
+        # A bare year starts in january; as an end it means "up to" that year, so 2016 - 2019 is 3 years
+        return int(value) * 12
+    
+    def tenure_months(self) -> int:
+        """Months covered by the union of all employment periods"""
+        months = 0
+        current_start, current_end = None, None
+        for start, end in sorted(self.periods):
+            if current_end is not None and start <= current_end:
+                current_end = max(current_end, end)
+                continue
+            if current_end is not None:
+                months += current_end - current_start
+            current_start, current_end = start, end
+        if current_end is not None:
+            months += current_end - current_start
+        return months
+    
+    def employment_periods(self) -> List[Dict[str, Any]]:
+        """Periods in order of appearance, as 'YYYY-MM' inclusive month bounds"""
+        return [{
+            'start': f'{start // 12}-{start % 12 + 1:02d}',
+            'end': f'{(end - 1) // 12}-{(end - 1) % 12 + 1:02d}',
+            'months': end - start
+        } for start, end in self.periods]
+
+def _iter_text_chunks(source: Union[str, os.PathLike, Iterable[str]], chunk_size: int) -> Iterator[str]:
+    """Yield text chunks from a file path (memory-mapped, decoded as UTF-8) or an iterable of str chunks"""
+    if not isinstance(source, (str, os.PathLike)):
+        for chunk in source:
+            if chunk:
+                yield chunk
+        return
+    
+    with open(source, 'rb') as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            for offset in range(0, len(mapped), chunk_size):
+                chunk = decoder.decode(mapped[offset:offset + chunk_size])
+                if chunk:
+                    yield chunk
+            chunk = decoder.decode(b'', final=True)
+            if chunk:
+                yield chunk
+
+class StreamingSkillScan:
+    """Incremental skill extraction over a stream of text chunks with bounded memory
+    
+    The automaton state is carried across chunks so skills spanning a chunk boundary are
+    still found; only a short tail of the previous chunk is kept for word-boundary checks
+    and context snippets, and experience patterns are matched over overlapping windows.
+    """
+    
+    CONTEXT_WINDOW = 50
+    EXPERIENCE_OVERLAP = 256
+    AFTER_CUES = frozenset(cue for cue, side in ProximityScorer.CONTEXT_RULES if side == 'after')
+    BEFORE_CUES = frozenset(cue for cue, side in ProximityScorer.CONTEXT_RULES if side == 'before')
+    
+    def __init__(self, extractor: 'CustomSkillExtractor'):
+        self.extractor = extractor
+        self.matcher = extractor.skill_matcher
+        self.window = extractor.proximity.window
+        self.state = 0
+        self.consumed = 0
+        self.tail_length = self.CONTEXT_WINDOW + self.matcher.max_pattern_length + 1
+        self.tail_lower = ''
+        self.tail_text = ''
+        self.pending_matches: List[Tuple[int, int, str]] = []
+        
+        # Per-skill aggregates, bounded by the taxonomy size
+        self.frequencies: Dict[str, int] = {}
+        self.next_free: Dict[str, int] = {}
+        self.on_boundary: Set[str] = set()
+        self.in_context: Set[str] = set()
+        self.contexts: Dict[str, str] = {}
+        self.pending_contexts: List[List[Any]] = []
+        
+        # Skill and cue positions on the current line, enough to answer the proximity rules
+        max_cue_length = max(len(cue) for cue in ProximityScorer.CUE_WORDS)
+        self.line_first_hit_end: Dict[str, int] = {}
+        self.line_hit_ends: Dict[str, deque] = defaultdict(lambda: deque(maxlen=max_cue_length + 1))
+        self.line_first_cue_end: Dict[str, int] = {}
+        self.line_cue_ends: Dict[str, deque] = defaultdict(lambda: deque(maxlen=self.matcher.max_pattern_length + 1))
+        
+        self.experience = ExperienceScanner()
+        self.experience_buffer = ''
+        self.experience_offset = 0
+        self.experience_done = 0
+    
+    def feed(self, chunk: str) -> List[Tuple[int, int, str, bool]]:
+        """Consume the next chunk and return the skill hits that could be confirmed"""
+        chunk_lower = chunk.lower()
+        offset = self.consumed
+        window_lower = self.tail_lower + chunk_lower
+        window_text = self.tail_text + chunk
+        lower_offset = offset - len(self.tail_lower)
+        text_offset = offset - len(self.tail_text)
+        
+        self.consumed += len(chunk_lower)
+        matches, self.state = self.matcher.match_chunk(chunk_lower, self.state, offset)
+        
+        # A match ending on the last character needs the next chunk for its right boundary
+        ready = self.pending_matches + matches
+        split = len(ready)
+        while split and ready[split - 1][1] == self.consumed:
+            split -= 1
+        self.pending_matches = ready[split:]
         
-        experience_info = self._extract_experience(text)
+        hits = self._observe(ready[:split], window_lower, lower_offset, window_text, text_offset)
+        self._extend_contexts(window_text, text_offset)
+        self._scan_experience(chunk_lower, final=False)
+        
+        self.tail_lower = window_lower[-self.tail_length:]
+        self.tail_text = window_text[-self.tail_length:]
+        return hits
+    
+    def finish(self) -> List[Tuple[int, int, str, bool]]:
+        """Flush matches held back for a boundary check at the end of the stream"""
+        text_offset = self.consumed - len(self.tail_text)
+        hits = self._observe(self.pending_matches, self.tail_lower, self.consumed - len(self.tail_lower),
+                             self.tail_text, text_offset)
+        self.pending_matches = []
+        self._extend_contexts(self.tail_text, text_offset)
+        self.pending_contexts = []
+        self._scan_experience('', final=True)
+        return hits
+    
+    def result(self) -> Dict[str, Any]:
+        """Summarize the stream in the extract_skills_from_text result shape"""
+        found_skills = {}
+        skill_categories = defaultdict(list)
+        for skill, frequency in self.frequencies.items():
+            confidence = self.extractor._combine_confidence(
+                True, skill in self.on_boundary, skill in self.in_context, frequency
+            )
+            if confidence > self.extractor.CONFIDENCE_CUTOFF:
+                category = self.extractor.skill_db.synonym_index[skill].category
+                found_skills[skill] = {
+                    'confidence': confidence,
+                    'category': category,
+                    'context': self.contexts.get(skill, '').strip()
+                }
+                skill_categories[category].append(skill)
         
         return {
             'skills': found_skills,
             'categories': dict(skill_categories),
-            'experience': experience_info,
+            'experience': self.extractor._build_experience_info(self.experience),
             'total_skills': len(found_skills),
-            'top_categories': self._get_top_categories(skill_categories)
+            'top_categories': self.extractor._get_top_categories(skill_categories)
         }
     
-    def _fuzzy_match(self, skill: str, text: str, threshold: float = 0.8) -> bool:
-        """Check if skill appears in text with fuzzy matching"""
-        skill_lower = skill.lower()
-        if skill_lower in text:
-            return True
-        if re.search(r'\b' + re.escape(skill_lower) + r'\b', text):
-            return True
-        if len(skill) > 3:
-            words = text.split()
-            for word in words:
-                if SequenceMatcher(None, skill_lower, word).ratio() > threshold:
-                    return True
-        return False
+    def _observe(self, matches: List[Tuple[int, int, str]], window_lower: str, lower_offset: int,
+                 window_text: str, text_offset: int) -> List[Tuple[int, int, str, bool]]:
+        """Update line, proximity and frequency state with matches ordered by end position"""
+        hits = []
+        for start, end, pattern in matches:
+            if pattern == '\n':
+                self.line_first_hit_end.clear()
+                self.line_hit_ends.clear()
+                self.line_first_cue_end.clear()
+                self.line_cue_ends.clear()
+                continue
+            
+            if pattern in ProximityScorer.CUE_WORDS:
+                self._observe_cue(start, end, pattern)
+            
+            if pattern in self.extractor.all_skills:
+                on_boundary = (_is_word_boundary(window_lower, start - lower_offset)
+                               and _is_word_boundary(window_lower, end - lower_offset))
+                self._observe_skill(start, end, pattern, on_boundary, window_text, text_offset)
+                hits.append((start, end, pattern, on_boundary))
+        return hits
     
-    def _calculate_confidence(self, skill: str, text: str) -> float:
-        """Calculate confidence score for skill match"""
-        skill_lower = skill.lower()
-        confidence = 0.0
-        if skill_lower in text:
-            confidence += 0.5
-        if re.search(r'\b' + re.escape(skill_lower) + r'\b', text):
-            confidence += 0.3
+    def _observe_cue(self, start: int, end: int, cue: str):
+        """Record a cue and credit skills earlier on the line for `skill ... cue` rules"""
+        if cue in self.AFTER_CUES:
+            for skill, hit_ends in self.line_hit_ends.items():
+                if skill in self.in_context:
+                    continue
+                if self.window is None:
+                    matched = self.line_first_hit_end[skill] <= start
+                else:
+                    matched = any(hit_end <= start and start - hit_end <= self.window for hit_end in hit_ends)
+                if matched:
+                    self.in_context.add(skill)
         
-        context_patterns = [
-            f'{re.escape(skill_lower)}.*experience',
-            f'experience.*{re.escape(skill_lower)}',
-            f'{re.escape(skill_lower)}.*years?',
-            f'proficient.*{re.escape(skill_lower)}',
-            f'expert.*{re.escape(skill_lower)}',
-        ]
+        if cue in self.BEFORE_CUES:
+            self.line_first_cue_end.setdefault(cue, end)
+            self.line_cue_ends[cue].append(end)
+    
+    def _observe_skill(self, start: int, end: int, skill: str, on_boundary: bool,
+                       window_text: str, text_offset: int):
+        """Update a skill's aggregates and check `cue ... skill` rules"""
+        if skill not in self.frequencies:
+            self.frequencies[skill] = 0
+            self.next_free[skill] = 0
+            context_start = max(0, start - self.CONTEXT_WINDOW)
+            context_end = end + self.CONTEXT_WINDOW
+            collected_until = min(context_end, text_offset + len(window_text))
+            self.contexts[skill] = window_text[context_start - text_offset:collected_until - text_offset]
+            if collected_until < context_end:
+                self.pending_contexts.append([skill, collected_until, context_end])
+        if start >= self.next_free[skill]:
+            self.frequencies[skill] += 1
+            self.next_free[skill] = end
+        if on_boundary:
+            self.on_boundary.add(skill)
+        
+        if skill not in self.in_context:
+            for cue in self.BEFORE_CUES:
+                if self.window is None:
+                    matched = self.line_first_cue_end.get(cue, start + 1) <= start
+                else:
+                    matched = any(cue_end <= start and start - cue_end <= self.window
+                                  for cue_end in self.line_cue_ends.get(cue, ()))
+                if matched:
+                    self.in_context.add(skill)
+                    break
+        
+        self.line_first_hit_end.setdefault(skill, end)
+        self.line_hit_ends[skill].append(end)
+    
+    def _extend_contexts(self, window_text: str, text_offset: int):
+        """Append newly available text to context snippets still waiting for their right side"""
+        window_end = text_offset + len(window_text)
+        still_pending = []
+        for entry in self.pending_contexts:
+            skill, collected_until, context_end = entry
+            if collected_until < window_end:
+                extra_end = min(context_end, window_end)
+                self.contexts[skill] += window_text[collected_until - text_offset:extra_end - text_offset]
+                entry[1] = extra_end
+            if entry[1] < context_end:
+                still_pending.append(entry)
+        self.pending_contexts = still_pending
+    
+    def _scan_experience(self, chunk_lower: str, final: bool):
+        """Run the experience scanner on overlapping windows, keeping matches that start in the settled region"""
+        self.experience_buffer += chunk_lower
+        buffer_end = self.experience_offset + len(self.experience_buffer)
+        settled = buffer_end if final else buffer_end - self.EXPERIENCE_OVERLAP
+        if settled <= self.experience_done:
+            return
         
-        for pattern in context_patterns:
-            if re.search(pattern, text):
-                confidence += 0.2
+        search_from = max(self.experience_done - self.EXPERIENCE_OVERLAP, self.experience_offset) - self.experience_offset
+        for match in ExperienceScanner.PATTERN.finditer(self.experience_buffer, search_from):
+            match_start = match.start() + self.experience_offset
+            if match_start >= settled:
                 break
+            if match_start >= self.experience_done:
+                self.experience.observe(match.groupdict())
         
-        frequency = text.count(skill_lower)
-        confidence += min(frequency * 0.1, 0.3)
+        self.experience_done = settled
+        keep_from = max(settled - self.EXPERIENCE_OVERLAP, self.experience_offset)
+        self.experience_buffer = self.experience_buffer[keep_from - self.experience_offset:]
+        self.experience_offset = keep_from
+
+class SkillMatch:
+    """One accepted skill, holding offsets into the document instead of copied text"""
+    
+    __slots__ = ('skill', 'confidence', 'category', 'spans', 'skill_id', 'category_id')
+    
+    def __init__(self, skill: str, confidence: float, category: str, spans: array, skill_id: int, category_id: int):
+        """`spans` is a flat array of start, end pairs; the ids are the taxonomy's (see SkillEntry)"""
+        self.skill = skill
+        self.confidence = confidence
+        self.category = category
+        self.spans = spans
+        self.skill_id = skill_id
+        self.category_id = category_id
+    
+    def span_pairs(self) -> List[Tuple[int, int]]:
+        """(start, end) of every hit, in text order"""
+        return list(zip(self.spans[::2], self.spans[1::2]))
+
+class ExtractionResult:
+    """Compact result of CustomSkillExtractor.extract: SkillMatch records over the document text
+    
+    Skill and category names are shared string objects and context snippets are only sliced from
+    the text when read, so a result costs a few slots per skill. to_dict() expands it to the
+    extract_skills_from_text shape for API responses; to_record() and from_record() give a flat
+    JSON form for result caches.
+    """
+    
+    # Characters of context on each side of a skill's first mention
+    CONTEXT_WINDOW = 50
+    
+    __slots__ = ('text', 'skills', 'fuzzy_matches', 'experience', 'top_categories', 'ranges', 'profile', 'declared',
+                 'skill_bits', 'category_bits')
+    
+    def __init__(self, text: str, skills: Dict[str, SkillMatch], fuzzy_matches: Dict[str, str],
+                 experience: Dict[str, Any], top_categories: List[Dict[str, Any]],
+                 ranges: Optional[List[Tuple[int, int]]] = None, declared: Optional[List[str]] = None):
+        """`ranges` are the section ranges a scoped extraction was limited to; contexts stay inside them.
+        `declared` lists the skills a structured profile stated outright (see extract_structured)."""
+        self.text = text
+        self.skills = skills
+        self.fuzzy_matches = fuzzy_matches
+        self.experience = experience
+        self.top_categories = top_categories
+        self.ranges = ranges
+        self.declared = declared
+        self.profile: Optional[Dict[str, Any]] = None
+        # The accepted skills and their categories as bitsets over the taxonomy ids
+        self.skill_bits = 0
+        self.category_bits = 0
+        for match in skills.values():
+            self.skill_bits |= 1 << match.skill_id
+            self.category_bits |= 1 << match.category_id
+    
+    @property
+    def categories(self) -> Dict[str, List[str]]:
+        """Accepted skills grouped by category, in skill order"""
+        categories = defaultdict(list)
+        for match in self.skills.values():
+            categories[match.category].append(match.skill)
+        return dict(categories)
+    
+    @property
+    def total_skills(self) -> int:
+        return len(self.skills)
+    
+    def context(self, skill: str) -> str:
+        """Text around the first mention of an accepted skill, kept inside its section for scoped results"""
+        spans = self.skills[skill].spans
+        if not spans:
+            # A declared skill the text never mentions
+            return ''
+        low, high = 0, len(self.text)
+        if self.ranges:
+            low, high = self.ranges[bisect_right(self.ranges, (spans[0], math.inf)) - 1]
+        return self.text[max(low, spans[0] - self.CONTEXT_WINDOW):min(high, spans[1] + self.CONTEXT_WINDOW)].strip()
+    
+    def to_dict(self, include_context: bool = True) -> Dict[str, Any]:
+        """The plain-dict result shape returned by extract_skills_from_text, optionally without snippets"""
+        skills = {}
+        for skill, match in self.skills.items():
+            skills[skill] = {'confidence': match.confidence, 'category': match.category}
+            if include_context:
+                skills[skill]['context'] = self.context(skill)
+            skills[skill]['spans'] = [[start, end, skill] for start, end in match.span_pairs()]
+        result = {
+            'skills': skills,
+            'categories': self.categories,
+            'fuzzy_matches': self.fuzzy_matches,
+            'experience': self.experience,
+            'total_skills': self.total_skills,
+            'top_categories': self.top_categories
+        }
+        if self.declared is not None:
+            result['declared_skills'] = self.declared
+        if self.profile is not None:
+            result['profile'] = self.profile
+        return result
+    
+    def to_record(self) -> Dict[str, Any]:
+        """JSON-ready form with one flat list per skill; the text itself is not included"""
+        return {
+            'skills': [[match.skill, match.confidence, match.category, match.spans.tolist(), match.skill_id,
+                        match.category_id] for match in self.skills.values()],
+            'fuzzy_matches': self.fuzzy_matches,
+            'experience': self.experience,
+            'top_categories': self.top_categories,
+            'ranges': self.ranges,
+            'declared': self.declared
+        }
+    
+    @classmethod
+    def from_record(cls, record: Dict[str, Any], text: str) -> 'ExtractionResult':
+        """Rebuild a result from to_record() output and the text it was extracted from"""
+        skills = {}
+        for skill, confidence, category, spans, skill_id, category_id in record['skills']:
+            skill = sys.intern(skill)
+            skills[skill] = SkillMatch(skill, confidence, sys.intern(category), array('q', spans), skill_id, category_id)
+        ranges = None if record['ranges'] is None else [tuple(bounds) for bounds in record['ranges']]
+        return cls(text, skills, record['fuzzy_matches'], record['experience'], record['top_categories'], ranges,
+                   record.get('declared'))
+
+class ExtractionProfile:
+    """Wall time per pipeline stage and work counters for one extraction call
+    
+    Stages: scan, confidence, categorization, experience and fuzzy. Stages that found
+    their work memoized on the document (or in the result cache) simply report less.
+    """
+    
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self.counters: Counter = Counter()
+    
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block, adding to any earlier time for the same stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """JSON-ready summary with times in milliseconds"""
+        return {
+            'total_ms': round((time.perf_counter() - self.started) * 1000, 3),
+            'stages_ms': {name: round(seconds * 1000, 3) for name, seconds in self.stages.items()},
+            'counters': dict(self.counters)
+        }
+
+_NO_STAGE = nullcontext()
+
+def _stage(profile: Optional[ExtractionProfile], name: str):
+    """profile.stage(name), or a shared no-op context when profiling is off"""
+    return _NO_STAGE if profile is None else profile.stage(name)
+
+class IncrementalExtraction:
+    """Re-extract a resume as it is edited, rescanning only the lines changed since the previous call
+    
+    The previous document keeps its skill hits and cue positions: hits on unchanged lines are
+    shifted to their new offsets, changed lines are rescanned, and only skills with a hit on a
+    changed line are rescored. Matches and every proximity rule stay within a line, so results
+    are identical to a full extraction. Experience patterns can span lines, so they are re-matched
+    from a few tokens before the edit until the old matches line up again.
+    """
+    
+    # Past this share of changed text a full scan is as cheap as patching the previous one
+    MAX_PATCH_FRACTION = 0.5
+    
+    def __init__(self, extractor: 'CustomSkillExtractor'):
+        self.extractor = extractor
+        self.document: Optional[Document] = None
+        self.confidences: Dict[str, float] = {}
+        # Characters rescanned by the last call, for monitoring how much patching saves
+        self.rescanned = 0
+        self.lock = threading.Lock()
+        # A skill spanning lines (possible in custom taxonomies) breaks the line-local patching
+        self.line_local = not any('\n' in skill for skill in extractor.all_skills)
+    
+    def extract(self, text: Union[str, Document], profile: bool = False) -> 'ExtractionResult':
+        """Extract skills from the new revision of the text, same result as CustomSkillExtractor.extract"""
+        document = Document.of(text)
+        run_profile = ExtractionProfile() if profile or self.extractor.profile_sink is not None else None
+        with self.lock:
+            with _stage(run_profile, 'patch'):
+                scores = self._patch(document) if self.document is not None else None
+            if scores is None:
+                self.rescanned = len(document.lower)
+            if run_profile is not None:
+                run_profile.counters['rescanned_chars'] += self.rescanned
+            result = self.extractor._extract_document(document, scores=scores, profile=run_profile)
+            self.document = document
+            self.confidences = {skill: match.confidence for skill, match in result.skills.items()}
+        return self.extractor._attach_profile(result, run_profile, profile)
+    
+    def _patch(self, document: Document) -> Optional[Dict[str, float]]:
+        """Scan document by patching the previous scan; returns its confidences, or None to start over"""
+        extractor = self.extractor
+        key = extractor.taxonomy.fingerprint
+        previous = self.document
+        if not self.line_local or key not in previous.scans:
+            return None
+        blocks = _changed_line_blocks(previous, document)
+        self.rescanned = sum(new_end - new_start for _, _, new_start, new_end in blocks)
+        if self.rescanned > self.MAX_PATCH_FRACTION * len(document.lower):
+            return None
         
-        return min(confidence, 1.0)
+        old_bounds = [(old_start, old_end) for old_start, old_end, _, _ in blocks]
+        shifts = list(accumulate((new_end - new_start) - (old_end - old_start)
+                                 for old_start, old_end, new_start, new_end in blocks))
+        first_change = old_bounds[0][0] if blocks else math.inf
+        
+        def relocate(position: int) -> Optional[int]:
+            """Offset of an old position in the new text, or None if its line changed"""
+            index = bisect_right(old_bounds, (position, math.inf)) - 1
+            if position < old_bounds[index][1]:
+                return None
+            return position + shifts[index]
+        
+        old_hits, old_cues = previous.scans[key]
+        affected = set()
+        skill_hits = {}
+        for skill, hits in old_hits.items():
+            if hits[-1][0] < first_change:
+                skill_hits[skill] = hits
+                continue
+            cut = bisect_left(hits, (first_change,))
+            kept = hits[:cut]
+            for start, end, on_boundary in hits[cut:]:
+                new_start = relocate(start)
+                if new_start is None:
+                    affected.add(skill)
+                else:
+                    kept.append((new_start, new_start + end - start, on_boundary))
+            if kept:
+                skill_hits[skill] = kept
+        cue_positions = {}
+        for cue, positions in old_cues.items():
+            cut = bisect_left(positions, first_change)
+            kept = positions[:cut] + [position for position in map(relocate, positions[cut:]) if position is not None]
+            if kept:
+                cue_positions[cue] = kept
+        
+        touched_cues = set()
+        for _, _, new_start, new_end in blocks:
+            if new_end == new_start:
+                continue
+            range_hits, range_cues = extractor._scan_range(document, new_start, new_end)
+            for skill, hits in range_hits.items():
+                affected.add(skill)
+                skill_hits[skill] = skill_hits.get(skill, []) + hits
+            for cue, positions in range_cues.items():
+                touched_cues.add(cue)
+                cue_positions[cue] = cue_positions.get(cue, []) + positions
+        for skill in affected & skill_hits.keys():
+            skill_hits[skill].sort()
+        for cue in touched_cues:
+            cue_positions[cue].sort()
+        
+        # Same skill order as a full scan: by first hit end, longest pattern first
+        skill_hits = dict(sorted(skill_hits.items(), key=lambda item: (item[1][0][1], item[1][0][0])))
+        document.scans[key] = (skill_hits, cue_positions)
+        fuzzy_memo = previous.scans.get(extractor.fuzzy_memo_key)
+        if fuzzy_memo is not None:
+            document.scans[extractor.fuzzy_memo_key] = dict(fuzzy_memo)
+        if blocks and 'experience' in previous.scans:
+            self._patch_experience(previous, document, blocks[0][0], blocks[-1][1], blocks[-1][3])
+        elif 'experience' in previous.scans:
+            document.scans['experience'] = previous.scans['experience']
+        
+        rescored = extractor._score_candidates({skill: skill_hits[skill] for skill in affected if skill in skill_hits},
+                                               cue_positions, document.line_breaks)
+        scores = {}
+        for skill in skill_hits:
+            known = rescored if skill in affected else self.confidences
+            if skill in known:
+                scores[skill] = known[skill]
+        return scores
     
-    def _extract_context(self, skill: str, text: str, window: int = 50) -> str:
-        """Extract context around skill mention"""
-        skill_lower = skill.lower()
-        text_lower = text.lower()
+    def _patch_experience(self, previous: Document, document: Document, change_start: int, old_end: int, new_end: int):
+        """Re-match experience patterns only from a few tokens before the edit until both texts resynchronize"""
+        old_matches = previous.scans['experience']
+        reach = ExperienceScanner.REACH_TOKENS
+        shift = new_end - old_end
         
-        index = text_lower.find(skill_lower)
-        if index == -1:
-            return ""
+        # Restart where the old scan would have tried next, far enough back that nothing before it saw the edit
+        restart = self._token_start_before(previous.lower, change_start, reach)
+        first_redone = bisect_left(old_matches, (restart,))
+        if first_redone and old_matches[first_redone - 1][1] > restart:
+            first_redone -= 1
+            restart = old_matches[first_redone][0]
         
-        start = max(0, index - window)
-        end = min(len(text), index + len(skill) + window)
+        # Resume the old matches at the first token start past the edit that neither scan is inside
+        starts = self._token_starts_after(document.lower, new_end, 3 * reach)
+        if len(starts) == 3 * reach:
+            window_end = starts[-1]
+            candidates = starts[reach:2 * reach]
+        else:
+            # The window runs to the end of the text, where the new scan can simply stop
+            window_end = len(document.lower)
+            candidates = starts[reach:] + [window_end]
+        rematched = [(match.start(), match.end(), match.groupdict())
+                     for match in ExperienceScanner.PATTERN.finditer(document.lower, restart, window_end)]
+        for resume in candidates:
+            first_kept = bisect_left(old_matches, (resume - shift,))
+            inside_old = first_kept and old_matches[first_kept - 1][1] > resume - shift
+            if not inside_old and not any(start < resume < end for start, end, _ in rematched):
+                break
+        else:
+            return
         
-        return text[start:end].strip()
+        document.scans['experience'] = (
+            old_matches[:first_redone]
+            + [match for match in rematched if match[0] < resume]
+            + [(start + shift, end + shift, groups) for start, end, groups in old_matches[first_kept:]]
+        )
     
-    def _extract_experience(self, text: str) -> Dict[str, Any]:
-        """Extract experience information"""
-        experience_info = {
-            'total_years': 0,
-            'skill_experience': {},
-            'experience_level': 'entry'
-        }
+    @staticmethod
+    def _token_start_before(text: str, position: int, count: int) -> int:
+        """Start of the count-th reach token before position (0 when there are fewer)"""
+        span = 64 * count
+        while True:
+            low = max(position - span, 0)
+            starts = [match.start() for match in ExperienceScanner.REACH_TOKEN.finditer(text, low, position)]
+            # The first token may be cut off at low, so it never counts
+            if len(starts) > count:
+                return starts[-count]
+            if low == 0:
+                return 0
+            span *= 4
+    
+    @staticmethod
+    def _token_starts_after(text: str, position: int, count: int) -> List[int]:
+        """Starts of up to count reach tokens at or after position"""
+        starts = []
+        for match in ExperienceScanner.REACH_TOKEN.finditer(text, position):
+            starts.append(match.start())
+            if len(starts) == count:
+                break
+        return starts
+
+# Per-process extractor used by CustomSkillExtractor.extract_skills_batch workers
+_batch_worker_extractor = None
+
+def _init_batch_worker(context_window: Optional[int], fuzzy_threshold: float, taxonomy: CompiledTaxonomy):
+    """Pool initializer: reuse the parent's compiled taxonomy in each worker process"""
+    global _batch_worker_extractor
+    _batch_worker_extractor = CustomSkillExtractor(context_window, fuzzy_threshold, taxonomy=taxonomy)
+
+def _extract_in_batch_worker(text: str) -> Dict[str, Any]:
+    """Pool task: extract skills with the worker's extractor"""
+    return _batch_worker_extractor.extract_skills_from_text(text)
+
+class CustomSkillExtractor:
+    """Extract skills from text using rule-based methods"""
+    
+    CONFIDENCE_CUTOFF = 0.6
+    # Structured profiles: skills they declare are taken at face value
+    DECLARED_CONFIDENCE = 1.0
+    STRUCTURED_SECTIONS = ('work', 'experience', 'volunteer', 'projects')
+    STRUCTURED_TEXT_FIELDS = ('summary', 'description', 'highlights')
+    STRUCTURED_DATE_KEYS = (('startDate', 'start_date', 'start'), ('endDate', 'end_date', 'end'))
+    # Below this many candidates the NumPy set-up costs more than the per-skill loop
+    VECTORIZE_MIN_CANDIDATES = 48
+    
+    def __init__(self, context_window: Optional[int] = None, fuzzy_threshold: float = 0.8, cache: Any = None,
+                 taxonomy: Optional[CompiledTaxonomy] = None,
+                 profile_sink: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """`cache` is an optional result store exposing get(version, digest) and put(version, digest, result);
+        `taxonomy` is a CompiledTaxonomy to share instead of compiling a fresh one; `profile_sink` is
+        called with ExtractionProfile.as_dict() after every extraction"""
+        self.taxonomy = taxonomy or CompiledTaxonomy.build()
+        self.skill_db = self.taxonomy.skill_db
+        self.all_skills = self.taxonomy.all_skills
+        self.cache = cache
+        self.profile_sink = profile_sink
+        self.version = (f'{EXTRACTION_ENGINE_VERSION}-{self.taxonomy.fingerprint[:16]}'
+                        f'-{context_window}-{fuzzy_threshold}')
+        self.fuzzy_threshold = fuzzy_threshold
+        self.fuzzy_index = self.taxonomy.fuzzy_index
+        self.proximity = ProximityScorer(context_window)
+        self.skill_matcher = self.taxonomy.skill_matcher
+        # Where a document memoizes fuzzy index lookups per distinct token
+        self.fuzzy_memo_key = (self.taxonomy.fingerprint, 'fuzzy', fuzzy_threshold)
+    
+    def extract_skills_from_text(self, text: Union[str, Document], sections: Optional[Iterable[str]] = None,
+                                 profile: bool = False, include_context: bool = True) -> Dict[str, Any]:
+        """Extract skills from text with confidence scores, as plain dicts (see extract)
+        
+        Without `include_context` skills carry no 'context' snippet, which skips slicing the text for them.
+        """
+        return self.extract(text, sections, profile).to_dict(include_context)
+    
+    def extract(self, text: Union[str, Document], sections: Optional[Iterable[str]] = None,
+                profile: bool = False) -> ExtractionResult:
+        """Extract skills from text into a compact ExtractionResult
+        
+        `sections` restricts every stage to those resume sections (names from SECTION_HEADINGS,
+        e.g. ['skills', 'experience']); pass a Document to re-query it without rescanning.
+        With `profile` the result carries an ExtractionProfile summary.
+        """
+        document = Document.of(text)
+        run_profile = ExtractionProfile() if profile or self.profile_sink is not None else None
+        if sections is not None:
+            sections = sorted(set(sections))
+        if self.cache is None:
+            return self._attach_profile(self._extract_document(document, sections, profile=run_profile),
+                                        run_profile, profile)
+        
+        key = document.digest if sections is None else f"{document.digest}:{','.join(sections)}"
+        with _stage(run_profile, 'cache'):
+            cached = self.cache.get(self.version, key)
+        if cached is not None:
+            if run_profile is not None:
+                run_profile.counters['cache_hits'] += 1
+            return self._attach_profile(ExtractionResult.from_record(cached, document.text), run_profile, profile)
+        result = self._extract_document(document, sections, profile=run_profile)
+        self.cache.put(self.version, key, result.to_record())
+        return self._attach_profile(result, run_profile, profile)
+    
+    def _attach_profile(self, result: ExtractionResult, run_profile: Optional[ExtractionProfile],
+                        include: bool) -> ExtractionResult:
+        """Hand a finished profile to the sink and, when asked for, to the caller"""
+        if run_profile is None:
+            return result
+        summary = run_profile.as_dict()
+        if self.profile_sink is not None:
+            self.profile_sink(summary)
+        if include:
+            result.profile = summary
+        return result
+    
+    def _extract_document(self, document: Document, sections: Optional[List[str]] = None,
+                          scores: Optional[Dict[str, float]] = None,
+                          profile: Optional[ExtractionProfile] = None) -> ExtractionResult:
+        """Run the full extraction pipeline on a document, or on some of its sections
+        
+        `scores` are already known confidences of the accepted skills, in scan order (see IncrementalExtraction).
+        """
+        ranges = None if sections is None else document.section_ranges(sections)
         
-        years_matches = re.findall(self.patterns['years_experience'], text.lower())
-        if years_matches:
-            experience_info['total_years'] = max([int(match) for match in years_matches])
+        # Skills without a literal occurrence can only ever score 0.0, so the
+        # automaton hits are the complete candidate set
+        with _stage(profile, 'scan'):
+            skill_hits, cue_positions = self._scan_text(document, ranges, profile)
         
-        skill_years_matches = re.findall(self.patterns['skill_with_years'], text.lower())
-        for skill, years in skill_years_matches:
-            experience_info['skill_experience'][skill] = int(years)
+        with _stage(profile, 'confidence'):
+            if scores is None:
+                scores = self._score_candidates(skill_hits, cue_positions, document.line_breaks)
+        with _stage(profile, 'categorization'):
+            # Scanner patterns are lowercased synonyms, so they index directly
+            synonym_index = self.skill_db.synonym_index
+            entries = {skill: synonym_index[skill] for skill in scores}
+        if profile is not None:
+            profile.counters['candidates'] += len(skill_hits)
+            profile.counters['accepted'] += len(scores)
+        
+        found_skills = {}
+        skill_categories = defaultdict(list)
+        for skill, confidence in scores.items():
+            entry = entries[skill]
+            spans = array('q', [offset for start, end, _ in skill_hits[skill] for offset in (start, end)])
+            found_skills[skill] = SkillMatch(skill, confidence, entry.category, spans, entry.id, entry.category_id)
+            skill_categories[entry.category].append(skill)
+        
+        with _stage(profile, 'experience'):
+            experience_info = self._extract_experience(document, ranges, profile)
+        with _stage(profile, 'fuzzy'):
+            fuzzy_matches = self._find_fuzzy_matches(document, skill_hits, ranges, profile)
+        
+        return ExtractionResult(document.text, found_skills, fuzzy_matches, experience_info,
+                                self._get_top_categories(skill_categories), ranges)
+    
+    def extract_skills_batch(self, texts: Iterable[str], workers: Optional[int] = None,
+                             chunksize: int = 4) -> Iterator[Dict[str, Any]]:
+        """Extract skills from many texts on a process pool, yielding results in input order"""
+        if workers == 1:
+            for text in texts:
+                yield self.extract_skills_from_text(text)
+            return
+    
+        with multiprocessing.Pool(
+            processes=workers,
+            initializer=_init_batch_worker,
+            initargs=(self.proximity.window, self.fuzzy_threshold, self.taxonomy)
+        ) as pool:
+            yield from pool.imap(_extract_in_batch_worker, texts, chunksize)
+    
+    def iter_skill_hits(self, source: Union[str, os.PathLike, Iterable[str]],
+                        chunk_size: int = 1 << 20) -> Iterator[Tuple[int, int, str, bool]]:
+        """Stream (start, end, skill, on_word_boundary) hits from a file path or an iterable of text chunks"""
+        scan = StreamingSkillScan(self)
+        for chunk in _iter_text_chunks(source, chunk_size):
+            yield from scan.feed(chunk)
+        yield from scan.finish()
+    
+    def extract_skills_streaming(self, source: Union[str, os.PathLike, Iterable[str]],
+                                 chunk_size: int = 1 << 20) -> Dict[str, Any]:
+        """Extract skills from a document too large to hold in memory, in bounded memory
+        
+        Produces the same result as extract_skills_from_text except that fuzzy matching is skipped
+        and skills carry no 'spans' list; use iter_skill_hits to consume the hits themselves.
+        """
+        scan = StreamingSkillScan(self)
+        for chunk in _iter_text_chunks(source, chunk_size):
+            scan.feed(chunk)
+        scan.finish()
+        return scan.result()
+    
+    def extract_structured(self, payload: Dict[str, Any]) -> ExtractionResult:
+        """Extract skills from a structured profile (JSON Resume, or similar key-value data)
+        
+        Declared skills ('skills' as names, {'name', 'keywords', 'years'} objects or a name: years
+        mapping; any name or keyword string may list several, comma-separated) are looked up in the taxonomy directly and accepted with DECLARED_CONFIDENCE.
+        Employment periods come from the start/end dates of 'work' (or 'experience') entries. Only
+        the free-text fields (STRUCTURED_TEXT_FIELDS of basics and every entry) go through the
+        scanning pipeline; the result's text is those fields joined by newlines.
+        """
+        payload = payload or {}
+        basics = payload.get('basics') or {}
+        entries = [entry for section in self.STRUCTURED_SECTIONS
+                   for entry in payload.get(section) or () if isinstance(entry, dict)]
+        
+        texts = []
+        for source in [payload, basics] + entries:
+            for field in self.STRUCTURED_TEXT_FIELDS:
+                value = source.get(field)
+                if isinstance(value, str):
+                    texts.append(value)
+                elif isinstance(value, list):
+                    texts.extend(item for item in value if isinstance(item, str))
+        document = Document('\n'.join(text.strip() for text in texts if text.strip()))
+        result = self._extract_document(document)
+        
+        declared = {}
+        skill_years = {}
+        for name, years in self._declared_skill_names(payload.get('skills')):
+            for skill in self._resolve_declared_skill(name, result.fuzzy_matches):
+                declared.setdefault(skill, None)
+                if years is not None:
+                    skill_years[skill] = max(years, skill_years.get(skill, 0))
+        
+        # Declared skills come first, then the ones only the free text mentions
+        skills = {}
+        for skill in declared:
+            match = result.skills.get(skill)
+            spans = match.spans if match is not None else array('q')
+            entry = self.skill_db.synonym_index[skill]
+            skills[skill] = SkillMatch(skill, self.DECLARED_CONFIDENCE, entry.category, spans, entry.id, entry.category_id)
+            result.fuzzy_matches.pop(skill, None)
+        for skill, match in result.skills.items():
+            skills.setdefault(skill, match)
+        
+        scanner = ExperienceScanner()
+        for _, _, groups in self._experience_matches(document):
+            scanner.observe(groups)
+        for entry in payload.get('work') or payload.get('experience') or ():
+            if isinstance(entry, dict):
+                scanner.add_period(*(next((entry[key] for key in keys if isinstance(entry.get(key), str)), None)
+                                     for keys in self.STRUCTURED_DATE_KEYS))
+        scanner.skill_experience.update(skill_years)
+        
+        structured = ExtractionResult(result.text, skills, result.fuzzy_matches, self._build_experience_info(scanner), [],
+                                      result.ranges, list(declared))
+        structured.top_categories = self._get_top_categories(structured.categories)
+        return structured
+    
+    @staticmethod
+    def _declared_skill_names(skills: Any) -> Iterator[Tuple[str, Optional[int]]]:
+        """(name, years or None) of every skill a structured profile declares, keywords included"""
+        if isinstance(skills, str):
+            skills = [skills]
+        elif isinstance(skills, dict):
+            skills = [{'name': name, 'years': years} for name, years in skills.items()]
+        for entry in skills or ():
+            if isinstance(entry, str):
+                for name in _split_names(entry):
+                    yield name, None
+            elif isinstance(entry, dict):
+                years = entry.get('years', entry.get('yearsOfExperience'))
+                years = int(years) if isinstance(years, (int, float)) or str(years).isdigit() else None
+                if isinstance(entry.get('name'), str):
+                    for name in _split_names(entry['name']):
+                        yield name, years
+                keywords = entry.get('keywords')
+                for keyword in [keywords] if isinstance(keywords, str) else keywords or ():
+                    if isinstance(keyword, str):
+                        for name in _split_names(keyword):
+                            yield name, None
+    
+    def _resolve_declared_skill(self, name: str, fuzzy_matches: Dict[str, str]) -> List[str]:
+        """Taxonomy skills a declared name stands for: itself if it is a synonym, else the synonyms it
+        contains ("Python 3 / Django"); a name matching nothing is only offered as a fuzzy match"""
+        key = ' '.join(name.lower().split())
+        if key in self.all_skills:
+            return [key]
+        skills = []
+        matches, _ = self.skill_matcher.match_chunk(key, 0, 0)
+        for start, end, pattern in matches:
+            if (pattern in self.all_skills and pattern not in skills
+                    and _is_word_boundary(key, start) and _is_word_boundary(key, end)):
+                skills.append(pattern)
+        if not skills:
+            for skill in self.fuzzy_index.search(key, self.fuzzy_threshold):
+                fuzzy_matches.setdefault(skill, name)
+        return skills
+    
+    def _scan_text(self, document: Document, ranges: Optional[List[Tuple[int, int]]] = None,
+                   profile: Optional[ExtractionProfile] = None
+                   ) -> Tuple[Dict[str, List[Tuple[int, int, bool]]], Dict[str, List[int]]]:
+        """Collect (start, end, on_word_boundary) skill hits and cue word starts, scanning each text once
+        
+        With `ranges` (sorted, line-aligned, e.g. from Document.section_ranges) only those parts are
+        scanned, or filtered out of an existing whole-document scan. Scans are memoized on the document,
+        and a whole-document scan also records the view terms for CompiledTaxonomy.terms_in.
+        """
+        key = self.taxonomy.fingerprint
+        full_scan = document.scans.get(key)
+        if ranges is None:
+            if full_scan is None:
+                view_terms = set()
+                full_scan = document.scans[key] = self._scan_range(document, 0, len(document.lower), view_terms)
+                document.scans.setdefault(self.taxonomy.terms_key, frozenset(view_terms))
+                if profile is not None:
+                    profile.counters['scanned_chars'] += len(document.lower)
+            return full_scan
+        
+        if full_scan is not None:
+            kept_hits = []
+            for skill, hits in full_scan[0].items():
+                kept = [hit for hit in hits if _within(ranges, hit[0])]
+                if kept:
+                    kept_hits.append((skill, kept))
+            # Order skills by their first hit inside the ranges as a scan of just the ranges would:
+            # by end, longest pattern first
+            skill_hits = dict(sorted(kept_hits, key=lambda item: (item[1][0][1], item[1][0][0])))
+            cue_positions = {cue: [position for position in positions if _within(ranges, position)]
+                             for cue, positions in full_scan[1].items()}
+            return skill_hits, cue_positions
+        
+        skill_hits = defaultdict(list)
+        cue_positions = defaultdict(list)
+        for start, end in ranges:
+            range_key = (key, start, end)
+            if range_key not in document.scans:
+                document.scans[range_key] = self._scan_range(document, start, end)
+                if profile is not None:
+                    profile.counters['scanned_chars'] += end - start
+            range_hits, range_cues = document.scans[range_key]
+            for skill, hits in range_hits.items():
+                skill_hits[skill].extend(hits)
+            for cue, positions in range_cues.items():
+                cue_positions[cue].extend(positions)
+        return dict(skill_hits), dict(cue_positions)
+    
+    def _scan_range(self, document: Document, start: int, end: int, view_terms: Optional[Set[str]] = None
+                    ) -> Tuple[Dict[str, List[Tuple[int, int, bool]]], Dict[str, List[int]]]:
+        """Run the automaton over document.lower[start:end], reporting document offsets
+        
+        View terms found on the way are added to `view_terms` when it is given.
+        """
+        text = document.lower
+        skill_hits = defaultdict(list)
+        cue_positions = defaultdict(list)
+        matches, _ = self.skill_matcher.match_chunk(text[start:end], 0, start)
+        if view_terms is not None:
+            view_terms.update(self.taxonomy.view_terms_of(matches))
+        for hit_start, hit_end, pattern in matches:
+            if pattern in ProximityScorer.CUE_WORDS:
+                cue_positions[pattern].append(hit_start)
+            if pattern in self.all_skills:
+                on_boundary = _is_word_boundary(text, hit_start) and _is_word_boundary(text, hit_end)
+                skill_hits[pattern].append((hit_start, hit_end, on_boundary))
+        return dict(skill_hits), dict(cue_positions)
+    
+    def _find_fuzzy_matches(self, document: Document, skill_hits: Dict[str, List[Tuple[int, int, bool]]],
+                            ranges: Optional[List[Tuple[int, int]]] = None,
+                            profile: Optional[ExtractionProfile] = None) -> Dict[str, str]:
+        """Map skills that only appear misspelled (e.g. 'kubernets') to the first token resembling them"""
+        fuzzy_matches = {}
+        tokens = document.tokens
+        if ranges is not None:
+            offsets = document.token_offsets
+            tokens = [token for start, end in ranges
+                      for token in tokens[bisect_left(offsets, (start,)):bisect_left(offsets, (end,))]]
+        memo = document.scans.setdefault(self.fuzzy_memo_key, {})
+        counters = None if profile is None else profile.counters
+        distinct_tokens = dict.fromkeys(tokens)
+        if counters is not None:
+            counters['fuzzy_tokens'] += len(distinct_tokens)
+        for token in distinct_tokens:
+            candidates = memo.get(token)
+            if candidates is None:
+                candidates = memo[token] = self.fuzzy_index.search(token, self.fuzzy_threshold, counters)
+            for skill in candidates:
+                if skill not in skill_hits and skill not in fuzzy_matches:
+                    fuzzy_matches[skill] = token
+        return fuzzy_matches
+    
+    def _score_candidates(self, skill_hits: Dict[str, List[Tuple[int, int, bool]]], cue_positions: Dict[str, List[int]],
+                          line_breaks: List[int]) -> Dict[str, float]:
+        """Confidence of every candidate above CONFIDENCE_CUTOFF, in candidate order"""
+        if np is not None and skill_hits and len(skill_hits) >= self.VECTORIZE_MIN_CANDIDATES:
+            return self._score_candidates_vectorized(skill_hits, cue_positions, line_breaks)
+        
+        scores = {}
+        for skill, hits in skill_hits.items():
+            confidence = self._calculate_confidence(hits, cue_positions, line_breaks)
+            if confidence > self.CONFIDENCE_CUTOFF:
+                scores[skill] = confidence
+        return scores
+    
+    def _score_candidates_vectorized(self, skill_hits: Dict[str, List[Tuple[int, int, bool]]],
+                                     cue_positions: Dict[str, List[int]], line_breaks: List[int]) -> Dict[str, float]:
+        """_score_candidates as NumPy array passes over the flattened hits; bit-identical to the scalar path"""
+        skills = list(skill_hits)
+        hit_counts = np.fromiter((len(hits) for hits in skill_hits.values()), dtype=np.int64, count=len(skills))
+        flat = np.fromiter(chain.from_iterable(chain.from_iterable(skill_hits.values())), dtype=np.int64,
+                           count=3 * int(hit_counts.sum())).reshape(-1, 3)
+        starts, ends = flat[:, 0], flat[:, 1]
+        # Every candidate has at least one hit, so these offsets delimit non-empty groups
+        offsets = np.concatenate(([0], np.cumsum(hit_counts)[:-1]))
+        
+        present = hit_counts > 0
+        on_boundary = np.logical_or.reduceat(flat[:, 2].astype(bool), offsets)
+        in_context = np.logical_or.reduceat(self.proximity.hit_context_mask(starts, ends, cue_positions, line_breaks),
+                                            offsets)
+        
+        # Hits of one skill share a length, so they only overlap when a synonym overlaps itself;
+        # just those skills need the str.count-style walk
+        frequency = hit_counts.copy()
+        overlapping = np.zeros(len(flat), dtype=bool)
+        overlapping[1:] = starts[1:] < ends[:-1]
+        overlapping[offsets] = False
+        for index in np.unique(np.searchsorted(offsets, np.flatnonzero(overlapping), 'right') - 1):
+            frequency[index] = self._count_non_overlapping(skill_hits[skills[index]])
+        
+        # Same terms, added in the same order, as _combine_confidence
+        confidence = np.zeros(len(skills))
+        confidence += np.where(present, 0.5, 0.0)
+        confidence += np.where(on_boundary, 0.3, 0.0)
+        confidence += np.where(in_context, 0.2, 0.0)
+        confidence += np.minimum(frequency * 0.1, 0.3)
+        confidence = np.minimum(confidence, 1.0)
+        
+        accepted = np.flatnonzero(confidence > self.CONFIDENCE_CUTOFF)
+        return dict(zip([skills[index] for index in accepted], confidence[accepted].tolist()))
+    
+    def _calculate_confidence(self, hits: List[Tuple[int, int, bool]], cue_positions: Dict[str, List[int]],
+                              line_breaks: List[int]) -> float:
+        """Calculate confidence score for skill match from its scanner hits"""
+        return self._combine_confidence(
+            bool(hits),
+            any(on_boundary for _, _, on_boundary in hits),
+            self.proximity.has_context(hits, cue_positions, line_breaks),
+            self._count_non_overlapping(hits)
+        )
+    
+    @staticmethod
+    def _combine_confidence(present: bool, on_boundary: bool, in_context: bool, frequency: int) -> float:
+        """Add up the confidence terms: presence, word boundary, cue context and frequency"""
+        confidence = 0.0
+        if present:
+            confidence += 0.5
+        if on_boundary:
+            confidence += 0.3
+        
+        if in_context:
+            confidence += 0.2
+        
+        confidence += min(frequency * 0.1, 0.3)
+        
+        return min(confidence, 1.0)
+    
+    @staticmethod
+    def _count_non_overlapping(hits: List[Tuple[int, int, Any]]) -> int:
+        """Count hits the way str.count does, skipping occurrences that overlap a counted one"""
+        return sum(1 for _ in non_overlapping_spans(hits))
+        
+    def _extract_experience(self, document: Document, ranges: Optional[List[Tuple[int, int]]] = None,
+                            profile: Optional[ExtractionProfile] = None) -> Dict[str, Any]:
+        """Extract experience information from the whole document or only the given ranges"""
+        scanner = ExperienceScanner()
+        if ranges is None:
+            if profile is not None and 'experience' not in document.scans:
+                profile.counters['regex_searches'] += 1
+            matches = self._experience_matches(document)
+            for _, _, groups in matches:
+                scanner.observe(groups)
+            if profile is not None:
+                profile.counters['experience_matches'] += len(matches)
+        else:
+            for start, end in ranges:
+                scanner.scan(document.lower[start:end])
+            if profile is not None:
+                profile.counters['regex_searches'] += len(ranges)
+        
+        return self._build_experience_info(scanner)
+    
+    @staticmethod
+    def _experience_matches(document: Document) -> List[Tuple[int, int, Dict[str, Optional[str]]]]:
+        """(start, end, named groups) of every ExperienceScanner match in the document, memoized on it"""
+        matches = document.scans.get('experience')
+        if matches is None:
+            matches = document.scans['experience'] = [(match.start(), match.end(), match.groupdict())
+                                                      for match in ExperienceScanner.PATTERN.finditer(document.lower)]
+        return matches
+    
+    @staticmethod
+    def _build_experience_info(scanner: ExperienceScanner) -> Dict[str, Any]:
+        """Assemble the experience summary and derive the experience level"""
+        tenure_months = scanner.tenure_months()
+        # Dated roles count even when the resume never claims "N years of experience"
+        total_years = max(scanner.claimed_years, tenure_months // 12)
         
-        total_years = experience_info['total_years']
         if total_years >= 8:
-            experience_info['experience_level'] = 'senior'
+            experience_level = 'senior'
         elif total_years >= 3:
-            experience_info['experience_level'] = 'mid'
+            experience_level = 'mid'
         else:
-            experience_info['experience_level'] = 'entry'
+            experience_level = 'entry'
         
-        return experience_info
+        return {
+            'total_years': total_years,
+            'skill_experience': scanner.skill_experience,
+            'experience_level': experience_level,
+            'tenure_years': round(tenure_months / 12, 1),
+            'employment_periods': scanner.employment_periods()
+        }
     
     def _get_top_categories(self, skill_categories: Dict[str, List[str]], top_n: int = 3) -> List[Dict[str, Any]]:
         """Get top skill categories by count"""
@@ -259,93 +2550,84 @@ class CustomSkillExtractor:
 class CustomJobMatcher:
     """Match resumes against job descriptions without AI"""
     
-    def __init__(self):
-        self.skill_extractor = CustomSkillExtractor()
-        self.skill_db = SkillDatabase()
+    def __init__(self, skill_extractor: Optional[CustomSkillExtractor] = None):
+        self.skill_extractor = skill_extractor or CustomSkillExtractor()
+        self.skill_db = self.skill_extractor.skill_db
         self._build_similarity_map()
 
     def _build_similarity_map(self):
-        """Builds a map for weak skill similarities."""
-        self.similarity_map = defaultdict(list)
-        # Frameworks to concepts
-        for cat, skills in self.skill_db.skills_data.items():
-            if cat == 'frameworks_libraries':
-                for main_skill, synonyms in skills.items():
-                    if main_skill in ['tensorflow', 'pytorch', 'scikit-learn']:
-                        self.similarity_map[main_skill].append(('deep_learning', 0.3))
-                        self.similarity_map[main_skill].append(('machine_learning', 0.4))
-                    if main_skill in ['pandas', 'numpy']:
-                         self.similarity_map[main_skill].append(('data_analysis', 0.5))
-                    if main_skill in ['matplotlib', 'seaborn', 'plotly']:
-                        self.similarity_map[main_skill].append(('data_visualization', 0.7)) # Not a skill, but for demo
-            if cat == 'data_science':
-                 for main_skill, synonyms in skills.items():
-                     if main_skill == 'python_data':
-                         for s in synonyms:
-                            self.similarity_map[s].append(('data_analysis', 0.6))
-                            self.similarity_map[s].append(('data_visualization', 0.6))
-
-
-    def get_comparison_view(self, resume_text: str, job_description: str) -> Dict[str, Any]:
+        """Weak skill similarities: the skill graph and its best-path table, compiled with the taxonomy"""
+        self.skill_graph = self.skill_extractor.taxonomy.skill_graph
+        self.similarity_table = self.skill_extractor.taxonomy.similarity_table
+
+
+    def get_comparison_view(self, resume_text: Union[str, Document], job_description: Union[str, Document]) -> Dict[str, Any]:
         """
         Generates a detailed comparison view like the provided image.
         """
-        resume_analysis = self.skill_extractor.extract_skills_from_text(resume_text)
-        job_analysis = self.skill_extractor.extract_skills_from_text(job_description)
+        job_document = Document.of(job_description)
+        resume_analysis = self.skill_extractor.extract(resume_text)
+        job_analysis = self.skill_extractor.extract(job_document)
+        return self._build_comparison_view(resume_analysis, job_analysis, job_document)
 
-        resume_skills = set(resume_analysis['skills'].keys())
-        job_skills = set(job_analysis['skills'].keys())
+    def _build_comparison_view(self, resume_analysis: ExtractionResult, job_analysis: ExtractionResult, job_document: Document) -> Dict[str, Any]:
+        """Build the comparison table from already extracted resume and job analyses"""
+        resume_skills = set(resume_analysis.skills)
+        job_skills = set(job_analysis.skills)
 
         comparison = []
 
         # 1. Exact Matches
         exact_matches = resume_skills.intersection(job_skills)
         for skill in exact_matches:
-            job_skill_info = job_analysis['skills'][skill]
+            job_skill_info = job_analysis.skills[skill]
             comparison.append({
                 "resumeSkill": skill,
                 "jobSkill": skill,
                 "matchType": "EXACT MATCH",
                 "similarityScore": 1.0,
-                "category": job_skill_info['category'],
-                "priority": "REQUIRED" if job_skill_info['confidence'] > 0.7 else "MENTIONED"
+                "category": job_skill_info.category,
+                "priority": "REQUIRED" if job_skill_info.confidence > 0.7 else "MENTIONED"
             })
 
-        # 2. Weak Matches (Resume Skill -> Broader Job Skill)
-        resume_skills_for_weak_match = resume_skills - exact_matches
-        job_skills_for_weak_match = job_skills - exact_matches
+        # 2. Weak Matches (Resume Skill -> Broader Job Skill): the similarity table's bitsets pick the related
+        # job skills, then each pair is a single table probe
+        resume_bits = resume_analysis.skill_bits
+        job_bits = job_analysis.skill_bits
+        job_bits_for_weak_match = job_bits & ~resume_bits
         
-        for r_skill in resume_skills_for_weak_match:
-            # Find canonical name for resume skill
-            r_skill_canon = self.skill_db.find_skill_category(r_skill) # This is not quite right, need to find main skill
-            
-            if r_skill in self.similarity_map:
-                for j_skill_target, score in self.similarity_map[r_skill]:
-                    # Check if this target skill or its synonyms are in the job description
-                    found_in_job = False
-                    for js in job_skills_for_weak_match:
-                        if js == j_skill_target or js in self.skill_db.skills_data.get('data_science', {}).get(j_skill_target, []):
-                             found_in_job = True
-                             job_skill_info = job_analysis['skills'][js]
-                             comparison.append({
-                                "resumeSkill": r_skill,
-                                "jobSkill": js,
-                                "matchType": "WEAK MATCH",
-                                "similarityScore": score,
-                                "category": job_skill_info['category'],
-                                "priority": "REQUIRED" if job_skill_info['confidence'] > 0.7 else "MENTIONED"
-                             })
-                             break # Avoid multiple matches for the same resume skill to the same target
-                    # A special case for 'Data Visualization' from the image, which is not a standard skill
-                    if 'data visualization' in job_description.lower() and j_skill_target == 'data_visualization':
-                        comparison.append({
-                            "resumeSkill": r_skill,
-                            "jobSkill": "Data Visualization",
-                            "matchType": "WEAK MATCH",
-                            "similarityScore": score,
-                            "category": "Data Science & AI",
-                            "priority": "REQUIRED" 
-                        })
+        for r_skill in self.skill_db.skills_from_bits(resume_bits & ~job_bits & self.similarity_table.sources):
+            related_bits = self.similarity_table.targets.get(r_skill, 0) & job_bits_for_weak_match
+            if related_bits:
+                similarities = self.similarity_table.pairs[r_skill]
+                matched_targets = set()
+                for js in self.skill_db.skills_from_bits(related_bits):
+                    similarity = similarities[js]
+                    # One match per broader skill, however many of its synonyms the job lists
+                    if similarity[1] in matched_targets:
+                        continue
+                    matched_targets.add(similarity[1])
+                    job_skill_info = job_analysis.skills[js]
+                    comparison.append({
+                        "resumeSkill": r_skill,
+                        "jobSkill": js,
+                        "matchType": "WEAK MATCH",
+                        "similarityScore": similarity[0],
+                        "category": job_skill_info.category,
+                        "priority": "REQUIRED" if job_skill_info.confidence > 0.7 else "MENTIONED"
+                    })
+            # Concepts that are not skills (e.g. 'Data Visualization') are found by their label in the job text
+            for concept, score in self.similarity_table.concepts.get(r_skill, ()):
+                label = self.skill_graph.label(concept)
+                if label.lower() in job_document.lower:
+                    comparison.append({
+                        "resumeSkill": r_skill,
+                        "jobSkill": label,
+                        "matchType": "WEAK MATCH",
+                        "similarityScore": score,
+                        "category": self.skill_graph.category(concept) or "other",
+                        "priority": "REQUIRED"
+                    })
 
 
         # 3. Missing Skills (from Job)
@@ -358,34 +2640,39 @@ class CustomJobMatcher:
         return {"comparison": comparison}
 
 
-    def calculate_match_score(self, resume_text: str, job_description: str) -> Dict[str, Any]:
+    def calculate_match_score(self, resume_text: Union[str, Document], job_description: Union[str, Document]) -> Dict[str, Any]:
         """Calculate comprehensive match score between resume and job"""
         
-        # This now can use the comparison view or stay as is
-        comparison_data = self.get_comparison_view(resume_text, job_description)
+        job_document = Document.of(job_description)
+        resume_analysis = self.skill_extractor.extract(resume_text)
+        job_analysis = self.skill_extractor.extract(job_document)
 
-        resume_analysis = self.skill_extractor.extract_skills_from_text(resume_text)
-        job_analysis = self.skill_extractor.extract_skills_from_text(job_description)
+        comparison_data = self._build_comparison_view(resume_analysis, job_analysis, job_document)
         
-        resume_skills = set(resume_analysis['skills'].keys())
-        job_skills = set(job_analysis['skills'].keys())
+        # Set algebra on the skill bitsets; skill names are only materialized for the response
+        resume_bits = resume_analysis.skill_bits
+        job_bits = job_analysis.skill_bits
+        common_bits = resume_bits & job_bits
         
-        intersection = resume_skills.intersection(job_skills)
-        union = resume_skills.union(job_skills)
+        matched_count = popcount(common_bits)
+        union_count = popcount(resume_bits | job_bits)
+        resume_count = popcount(resume_bits)
+        job_count = popcount(job_bits)
         
-        jaccard_similarity = len(intersection) / len(union) if union else 0
-        precision = len(intersection) / len(resume_skills) if resume_skills else 0
-        recall = len(intersection) / len(job_skills) if job_skills else 0
+        jaccard_similarity = matched_count / union_count if union_count else 0
+        precision = matched_count / resume_count if resume_count else 0
+        recall = matched_count / job_count if job_count else 0
         f1_score = 2 * (precision * recall) / (precision + recall) if (precision + recall) > 0 else 0
         
-        weighted_score = self._calculate_weighted_score(resume_analysis, job_analysis, intersection)
+        weighted_score = self._calculate_weighted_score(resume_analysis, job_analysis, common_bits)
         
-        experience_match = self._match_experience(resume_analysis['experience'], job_analysis['experience'])
+        experience_match = self._match_experience(resume_analysis.experience, job_analysis.experience)
         
-        category_match = self._match_categories(resume_analysis['categories'], job_analysis['categories'])
+        category_match = self._match_categories(resume_analysis.category_bits, job_analysis.category_bits)
         
-        missing_skills = job_skills - resume_skills
-        extra_skills = resume_skills - job_skills
+        matched_skills = self.skill_db.skills_from_bits(common_bits)
+        missing_skills = self.skill_db.skills_from_bits(job_bits & ~resume_bits)
+        extra_skills = self.skill_db.skills_from_bits(resume_bits & ~job_bits)
         
         overall_score = (
             weighted_score * 0.4 +
@@ -405,28 +2692,28 @@ class CustomJobMatcher:
                 'experience_match': round(experience_match * 100, 1),
                 'category_match': round(category_match * 100, 1)
             },
-            'matched_skills': list(intersection),
-            'missing_skills': list(missing_skills),
-            'extra_skills': list(extra_skills),
+            'matched_skills': matched_skills,
+            'missing_skills': missing_skills,
+            'extra_skills': extra_skills,
             'skill_gaps': self._analyze_skill_gaps(missing_skills, job_analysis),
             'recommendations': self._generate_recommendations(missing_skills, resume_analysis, job_analysis),
             'comparison': comparison_data.get('comparison', []) # Add the new comparison view
         }
     
-    def _calculate_weighted_score(self, resume_analysis: Dict, job_analysis: Dict, intersection: Set[str]) -> float:
+    def _calculate_weighted_score(self, resume_analysis: ExtractionResult, job_analysis: ExtractionResult, common_bits: int) -> float:
         """Calculate weighted score based on skill confidence and importance"""
-        if not intersection:
+        if not common_bits:
             return 0.0
         
         total_weight = 0.0
         matched_weight = 0.0
         
-        for skill in job_analysis['skills']:
-            importance = job_analysis['skills'][skill]['confidence']
+        for match in job_analysis.skills.values():
+            importance = match.confidence
             total_weight += importance
             
-            if skill in intersection:
-                resume_confidence = resume_analysis['skills'][skill]['confidence']
+            if common_bits >> match.skill_id & 1:
+                resume_confidence = resume_analysis.skills[match.skill].confidence
                 matched_weight += importance * resume_confidence
         
         return matched_weight / total_weight if total_weight > 0 else 0.0
@@ -444,38 +2731,31 @@ class CustomJobMatcher:
         else:
             return resume_years / job_years
     
-    def _match_categories(self, resume_categories: Dict, job_categories: Dict) -> float:
-        """Match skill categories"""
-        if not job_categories:
+    def _match_categories(self, resume_category_bits: int, job_category_bits: int) -> float:
+        """Share of the job's skill categories (as category bitsets) the resume also covers"""
+        if not job_category_bits:
             return 1.0
         
-        matched_categories = 0
-        total_categories = len(job_categories)
-        
-        for category in job_categories:
-            if category in resume_categories:
-                matched_categories += 1
-        
-        return matched_categories / total_categories
+        return popcount(resume_category_bits & job_category_bits) / popcount(job_category_bits)
     
-    def _analyze_skill_gaps(self, missing_skills: Set[str], job_analysis: Dict) -> List[Dict[str, Any]]:
+    def _analyze_skill_gaps(self, missing_skills: Iterable[str], job_analysis: ExtractionResult) -> List[Dict[str, Any]]:
         """Analyze skill gaps with priorities"""
         gaps = []
         
         for skill in missing_skills:
-            if skill in job_analysis['skills']:
+            if skill in job_analysis.skills:
                 gap_info = {
                     'skill': skill,
-                    'importance': job_analysis['skills'][skill]['confidence'],
-                    'category': job_analysis['skills'][skill]['category'],
-                    'priority': 'high' if job_analysis['skills'][skill]['confidence'] > 0.8 else 'medium'
+                    'importance': job_analysis.skills[skill].confidence,
+                    'category': job_analysis.skills[skill].category,
+                    'priority': 'high' if job_analysis.skills[skill].confidence > 0.8 else 'medium'
                 }
                 gaps.append(gap_info)
         
         gaps.sort(key=lambda x: x['importance'], reverse=True)
         return gaps
     
-    def _generate_recommendations(self, missing_skills: Set[str], resume_analysis: Dict, job_analysis: Dict) -> List[Dict[str, str]]:
+    def _generate_recommendations(self, missing_skills: Iterable[str], resume_analysis: ExtractionResult, job_analysis: ExtractionResult) -> List[Dict[str, str]]:
         """Generate improvement recommendations as a list of objects."""
         recommendations = []
         
@@ -489,8 +2769,8 @@ class CustomJobMatcher:
             })
 
         # Add a general recommendation if experience is a major gap
-        resume_exp = resume_analysis['experience']['total_years']
-        job_exp = job_analysis['experience'].get('total_years', 0)
+        resume_exp = resume_analysis.experience['total_years']
+        job_exp = job_analysis.experience.get('total_years', 0)
         if job_exp > resume_exp and job_exp > 0:
              recommendations.append({
                 "skill": "Industry Experience",
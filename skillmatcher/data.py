@@ -1,17 +1,13 @@
 # data.py
-# This module contains a list of common skills for matching and suggestions.
+# This module exposes the common skills for matching and suggestions, as a view of the shared
+# skill registry (custom_ai.CompiledTaxonomy) so this app and the milestone_3 backend use one vocabulary.
+import os
+import sys
 
-COMMON_SKILLS = [
-    "Python", "Java", "C++", "JavaScript", "TypeScript", "SQL", "NoSQL", "HTML", "CSS", "React", "Angular", "Vue.js",
-    "Node.js", "Express.js", "Django", "Flask", "Spring Boot", "Ruby on Rails", "PHP", "Laravel", "Go", "Rust", "Kotlin", "Swift",
-    "Objective-C", "Scala", "Perl", "R", "MATLAB", "SAS", "SPSS", "TensorFlow", "PyTorch", "Keras", "Scikit-learn", "Pandas",
-    "NumPy", "Matplotlib", "Seaborn", "Tableau", "Power BI", "Excel", "AWS", "Azure", "Google Cloud", "Docker", "Kubernetes",
-    "CI/CD", "Jenkins", "Git", "GitHub", "Bitbucket", "Agile", "Scrum", "Kanban", "Project Management", "JIRA", "Confluence",
-    "Communication", "Teamwork", "Problem Solving", "Critical Thinking", "Leadership", "Time Management", "Adaptability",
-    "Creativity", "Attention to Detail", "Customer Service", "Sales", "Marketing", "SEO", "Content Writing", "Copywriting",
-    "Data Analysis", "Data Visualization", "Business Analysis", "Financial Analysis", "Machine Learning", "Deep Learning",
-    "Natural Language Processing", "Computer Vision", "Cloud Computing", "Cybersecurity", "Network Security", "Penetration Testing",
-    "DevOps", "Mobile Development", "iOS Development", "Android Development", "UI/UX Design", "Graphic Design", "Figma",
-    "Adobe Photoshop", "Adobe Illustrator", "AutoCAD", "SolidWorks", "SAP", "Oracle", "MongoDB", "PostgreSQL", "MySQL",
-    "Redis", "Elasticsearch", "Hadoop", "Spark", "Big Data", "ETL", "Data Engineering", "APIs", "REST", "GraphQL", "SOAP"
-]
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'milestone_3'))
+
+from custom_ai import CompiledTaxonomy
+
+skill_registry = CompiledTaxonomy.build()
+
+COMMON_SKILLS = skill_registry.view_list('common_skills')
@@ -1,13 +1,16 @@
 # suggestions.py
 # This module provides functions for suggesting skills for a job description.
+from data import COMMON_SKILLS, skill_registry
 
 def suggest_skills_for_jd(jd_text, common_skills=None, top_n=10):
     """
-    Dummy implementation: Suggests skills for a job description by matching keywords.
-    Replace with actual logic as needed.
+    Suggests skills for a job description by matching keywords.
+    The common skills are found with one pass of the skill registry over the text.
     """
     if common_skills is None:
         common_skills = ["Python", "Machine Learning", "Data Analysis", "Communication", "Teamwork"]
+    if common_skills is COMMON_SKILLS:
+        return skill_registry.matching_terms('common_skills', jd_text)[:top_n]
     jd_text_lower = jd_text.lower()
     suggestions = [skill for skill in common_skills if skill.lower() in jd_text_lower]
     return suggestions[:top_n]